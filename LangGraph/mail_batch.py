@@ -0,0 +1,289 @@
+"""Run the mail sorter graph over a batch of emails.
+
+Emails are read lazily from a JSONL file (one {"sender", "subject", "body"}
+object per line, with an optional "auth" holding the Authentication-Results
+header) or an mbox file and processed by ``--concurrency`` workers
+with ``compiled_graph.ainvoke``. Each result is written to the output as soon
+as its email finishes, and a summary with emails per second and per node
+latency percentiles is printed at the end.
+
+    python mail_batch.py emails.jsonl --output results.jsonl --concurrency 8
+    python mail_batch.py emails.jsonl --fake-llm
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import mailbox
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from mail_sorter import compiled_graph
+from tracing import tracer
+
+# Importable once mail_sorter has put the repository root on sys.path
+from llm_cache import llm_cache  # noqa: E402
+
+SPAM_WORDS = ("lottery", "winner", "prize", "bank details", "processing fee")
+
+
+class FakeMailModel(BaseChatModel):
+    """Local stand-in for ChatOllama that answers the mail sorter prompts.
+
+    Classification prompts are answered by keyword matching and draft prompts
+    with a fixed reply, after ``latency`` seconds, so the pipeline can be run
+    and timed without an Ollama server.
+    """
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-mail"
+
+    def _answer(self, prompt: str) -> str:
+        if "determine if it is spam" in prompt:
+            if any(word in prompt.lower() for word in SPAM_WORDS):
+                return "This email is spam. Reason: it asks for money or bank details."
+            return "This email is not spam. It is an inquiry."
+        return "Dear sender, thank you for your email. Mr. Hugg will get back to you shortly."
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        message = AIMessage(content=self._answer(messages[-1].content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        message = AIMessage(content=self._answer(messages[-1].content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class NodeLatencyHandler(BaseCallbackHandler):
+    """Collect the wall time of every graph node run."""
+
+    # Called in the event loop thread instead of an executor, timing stays exact
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = {}
+        self.latencies: Dict[str, List[float]] = {}
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs
+    ):
+        node = (metadata or {}).get("langgraph_node")
+        if not node or kwargs.get("name") != node:
+            return
+        with self._lock:
+            # Runnables inside a node carry the same name and metadata, only time the node itself
+            parent = self._started.get(parent_run_id)
+            if parent is None or parent[0] != node:
+                self._started[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started:
+                node, start = started
+                self.latencies.setdefault(node, []).append(time.perf_counter() - start)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._started.pop(run_id, None)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                node: {
+                    "count": len(ordered),
+                    "p50_seconds": round(ordered[len(ordered) // 2], 4),
+                    "p95_seconds": round(ordered[int(len(ordered) * 0.95)], 4),
+                }
+                for node, ordered in (
+                    (node, sorted(values)) for node, values in self.latencies.items()
+                )
+            }
+
+
+def _message_body(message) -> str:
+    if message.is_multipart():
+        for part in message.walk():
+            if part.get_content_type() == "text/plain":
+                payload = part.get_payload(decode=True) or b""
+                return payload.decode(part.get_content_charset() or "utf-8", "replace")
+        return ""
+    payload = message.get_payload(decode=True) or b""
+    return payload.decode(message.get_content_charset() or "utf-8", "replace")
+
+
+def read_emails(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the emails of a JSONL or mbox file one at a time."""
+    if path.endswith(".jsonl") or path == "-":
+        file = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with file:
+            for line in file:
+                if line.strip():
+                    email = json.loads(line)
+                    yield {
+                        "sender": email.get("sender", ""),
+                        "subject": email.get("subject", ""),
+                        "body": email.get("body", ""),
+                        "auth": email.get("auth", ""),
+                    }
+        return
+
+    for message in mailbox.mbox(path):
+        yield {
+            "sender": message.get("From", ""),
+            "subject": message.get("Subject", ""),
+            "body": _message_body(message),
+            "auth": message.get("Authentication-Results", ""),
+        }
+
+
+def _initial_state(email: Dict[str, Any]) -> dict:
+    return {
+        "email": email,
+        "is_spam": None,
+        "spam_reason": None,
+        "email_category": None,
+        "email_draft": None,
+        "classified_by": None,
+        "messages": [],
+    }
+
+
+async def run_batch(
+    emails,
+    sink,
+    concurrency: int = 4,
+    llm=None,
+    callbacks: Optional[list] = None,
+) -> dict:
+    """Process the emails with ``concurrency`` workers and stream the results.
+
+    Args:
+        emails: Iterable of {"sender", "subject", "body"} dicts, consumed lazily.
+        sink: Text file the JSON result lines are written to as emails finish.
+        concurrency (int): Number of emails processed at the same time.
+        llm: Chat model used instead of the default ChatOllama model.
+        callbacks (list): Extra callback handlers for every email.
+
+    Returns:
+        dict: Emails processed, failures, emails per second, node latencies and
+        tracing counts, including spans dropped by a full trace queue.
+    """
+    latency_handler = NodeLatencyHandler()
+    handlers = [latency_handler] + list(callbacks or [])
+    configurable = {"llm": llm} if llm is not None else {}
+
+    # A bounded queue keeps large mailboxes from being read into memory at once
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    email_seconds = []
+    failed = 0
+
+    async def produce():
+        for index, email in enumerate(emails):
+            await queue.put((index, email))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work():
+        nonlocal failed
+        while (item := await queue.get()) is not None:
+            index, email = item
+            start = time.perf_counter()
+            result = {
+                "index": index,
+                "sender": email["sender"],
+                "subject": email["subject"],
+            }
+            try:
+                state = await compiled_graph.ainvoke(
+                    _initial_state(email),
+                    # Tracing is sampled per email
+                    config={
+                        "callbacks": handlers + tracer.callbacks(),
+                        "configurable": configurable,
+                    },
+                )
+                result.update(
+                    is_spam=state.get("is_spam"),
+                    spam_reason=state.get("spam_reason"),
+                    email_category=state.get("email_category"),
+                    email_draft=state.get("email_draft"),
+                    classified_by=state.get("classified_by"),
+                )
+            except Exception as e:
+                failed += 1
+                result["error"] = str(e)
+            result["seconds"] = round(time.perf_counter() - start, 4)
+            email_seconds.append(result["seconds"])
+            sink.write(json.dumps(result) + "\n")
+            sink.flush()
+
+    start = time.perf_counter()
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    tracer.flush()
+
+    ordered = sorted(email_seconds)
+    return {
+        "emails": len(ordered),
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "emails_per_second": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "email_p50_seconds": round(ordered[len(ordered) // 2], 4) if ordered else None,
+        "email_p95_seconds": (
+            round(ordered[int(len(ordered) * 0.95)], 4) if ordered else None
+        ),
+        "nodes": latency_handler.summary(),
+        "tracing": tracer.stats(),
+        "llm_cache": llm_cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JSONL or mbox file with the emails, - for stdin")
+    parser.add_argument("--output", help="JSONL file for the results, default stdout")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--fake-llm",
+        action="store_true",
+        help="Use a local fake chat model instead of Ollama",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.05,
+        help="Seconds the fake chat model takes per call",
+    )
+    args = parser.parse_args()
+
+    llm = FakeMailModel(latency=args.fake_latency) if args.fake_llm else None
+    sink = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        # The graph nodes print their progress, keep it out of the JSONL results
+        with contextlib.redirect_stdout(sys.stderr):
+            summary = asyncio.run(
+                run_batch(read_emails(args.input), sink, args.concurrency, llm)
+            )
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
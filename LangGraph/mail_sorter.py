@@ -1,23 +1,19 @@
-import os
-from typing import TypedDict, List, Dict, Any, Optional
+import re
+import sys
+from pathlib import Path
+from typing import Annotated, TypedDict, List, Dict, Any, Optional
 from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_ollama import ChatOllama
-from dotenv import load_dotenv
-from langfuse import Langfuse
-from langfuse.langchain import CallbackHandler
 
+from message_log import bounded_log, fit_body
+from spam_filter import pre_classifier
+from tracing import tracer
 
-# Initialize Langfuse CallbackHandler for LangGraph/Langchain (tracing)
-load_dotenv()
-
-langfuse = Langfuse(
-    secret_key=os.environ["LANGFUSE_SECRET_KEY"],
-    public_key=os.environ["LANGFUSE_PUBLIC_KEY"],
-    host=os.environ["LANGFUSE_HOST"],
-)
-
-langfuse_handler = CallbackHandler()
+# The LLM response cache is shared with the agents in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from llm_cache import langchain_cache  # noqa: E402
 
 
 class EmailState(TypedDict):
@@ -26,10 +22,17 @@ class EmailState(TypedDict):
     spam_reason: Optional[str]
     is_spam: Optional[bool]
     email_draft: Optional[str]
-    messages: List[Dict[str, Any]]
+    classified_by: Optional[str]
+    # Nodes return only their new turns, the log caps and summarizes the history
+    messages: Annotated[List[Dict[str, Any]], bounded_log()]
+
 
+model = ChatOllama(model="qwen2:7b", cache=langchain_cache())
 
-model = ChatOllama(model="qwen2:7b")
+
+def _llm(config: RunnableConfig):
+    """The chat model for this run, overridable with config["configurable"]["llm"]."""
+    return (config or {}).get("configurable", {}).get("llm") or model
 
 
 def read_email(state: EmailState):
@@ -45,30 +48,37 @@ def read_email(state: EmailState):
     return {}
 
 
-def classify_email(state: EmailState):
-    """Alfred uses an LLM to determine if the email is spam or legitimate"""
-    email = state["email"]
-
-    # Prepare our prompt for the LLM
-    prompt = f"""
+def _classification_prompt(email: Dict[str, Any]) -> str:
+    return f"""
     As Alfred the butler, analyze this email and determine if it is spam or legitimate.
     
     Email:
     From: {email['sender']}
     Subject: {email['subject']}
-    Body: {email['body']}
+    Body: {fit_body(email['body'])}
     
+    Start your answer with SPAM or LEGITIMATE on its own line.
     First, determine if this email is spam. If it is spam, explain why.
     If it is legitimate, categorize it (inquiry, complaint, thank you, etc.).
     """
 
-    # Call the LLM
-    messages = [HumanMessage(content=prompt)]
-    response = model.invoke(messages)
 
-    # Simple logic to parse the response (in a real app, you'd want more robust parsing)
+_NOT_SPAM = re.compile(r"\b(?:not|isn't|is not|no)\s+(?:a\s+)?spam\b")
+
+
+def _parse_verdict(response_text: str) -> bool:
+    """Read the SPAM/LEGITIMATE verdict, falling back to the wording of the answer"""
+    first_line = response_text.strip().split("\n", 1)[0].strip(" *#:.")
+    if first_line.startswith("legitimate"):
+        return False
+    if first_line.startswith("spam"):
+        return True
+    return "spam" in response_text and not _NOT_SPAM.search(response_text)
+
+
+def _classification_update(prompt: str, response) -> Dict[str, Any]:
     response_text = response.content.lower()
-    is_spam = "spam" in response_text and "not spam" not in response_text
+    is_spam = _parse_verdict(response_text)
 
     # Extract a reason if it's spam
     spam_reason = None
@@ -85,7 +95,7 @@ def classify_email(state: EmailState):
                 break
 
     # Update messages for tracking
-    new_messages = state.get("messages", []) + [
+    new_messages = [
         {"role": "user", "content": prompt},
         {"role": "assistant", "content": response.content},
     ]
@@ -95,10 +105,42 @@ def classify_email(state: EmailState):
         "is_spam": is_spam,
         "spam_reason": spam_reason,
         "email_category": email_category,
+        "classified_by": "llm",
         "messages": new_messages,
     }
 
 
+def pre_classify(state: EmailState):
+    """Alfred sorts the obvious emails himself before asking the LLM"""
+    is_spam, reason = pre_classifier.classify(state["email"])
+    if is_spam is None:
+        return {}
+    return {
+        "is_spam": is_spam,
+        "spam_reason": reason if is_spam else None,
+        "classified_by": reason.split(":", 1)[0],
+    }
+
+
+def classify_email(state: EmailState, config: RunnableConfig = None):
+    """Alfred uses an LLM to determine if the email is spam or legitimate"""
+    # Prepare our prompt for the LLM
+    prompt = _classification_prompt(state["email"])
+
+    # Call the LLM
+    messages = [HumanMessage(content=prompt)]
+    response = _llm(config).invoke(messages)
+
+    return _classification_update(prompt, response)
+
+
+async def aclassify_email(state: EmailState, config: RunnableConfig = None):
+    """Async variant of classify_email used by ainvoke/abatch"""
+    prompt = _classification_prompt(state["email"])
+    response = await _llm(config).ainvoke([HumanMessage(content=prompt)])
+    return _classification_update(prompt, response)
+
+
 def handle_spam(state: EmailState):
     """Alfred discards spam email with a note"""
     print(f"Alfred has marked the email as spam. Reason: {state['spam_reason']}")
@@ -108,31 +150,27 @@ def handle_spam(state: EmailState):
     return {}
 
 
-def draft_response(state: EmailState):
-    """Alfred drafts a preliminary response for legitimate emails"""
+def _draft_prompt(state: EmailState) -> str:
     email = state["email"]
     category = state["email_category"] or "general"
 
-    # Prepare our prompt for the LLM
-    prompt = f"""
+    return f"""
     As Alfred the butler, draft a polite preliminary response to this email.
     
     Email:
     From: {email['sender']}
     Subject: {email['subject']}
-    Body: {email['body']}
+    Body: {fit_body(email['body'])}
     
     This email has been categorized as: {category}
     
     Draft a brief, professional response that Mr. Hugg can review and personalize before sending.
     """
 
-    # Call the LLM
-    messages = [HumanMessage(content=prompt)]
-    response = model.invoke(messages)
 
+def _draft_update(prompt: str, response) -> Dict[str, Any]:
     # Update messages for tracking
-    new_messages = state.get("messages", []) + [
+    new_messages = [
         {"role": "user", "content": prompt},
         {"role": "assistant", "content": response.content},
     ]
@@ -141,6 +179,25 @@ def draft_response(state: EmailState):
     return {"email_draft": response.content, "messages": new_messages}
 
 
+def draft_response(state: EmailState, config: RunnableConfig = None):
+    """Alfred drafts a preliminary response for legitimate emails"""
+    # Prepare our prompt for the LLM
+    prompt = _draft_prompt(state)
+
+    # Call the LLM
+    messages = [HumanMessage(content=prompt)]
+    response = _llm(config).invoke(messages)
+
+    return _draft_update(prompt, response)
+
+
+async def adraft_response(state: EmailState, config: RunnableConfig = None):
+    """Async variant of draft_response used by ainvoke/abatch"""
+    prompt = _draft_prompt(state)
+    response = await _llm(config).ainvoke([HumanMessage(content=prompt)])
+    return _draft_update(prompt, response)
+
+
 def notify_mr_hugg(state: EmailState):
     """Alfred notifies Mr. Hugg about the email and presents the draft response"""
     email = state["email"]
@@ -158,6 +215,13 @@ def notify_mr_hugg(state: EmailState):
     return {}
 
 
+def route_pre_classified(state: EmailState) -> str:
+    """Send emails the pre-classifier could not decide to the LLM"""
+    if state.get("is_spam") is None:
+        return "ambiguous"
+    return route_email(state)
+
+
 def route_email(state: EmailState) -> str:
     """Determine the next step based on spam classification"""
     if state["is_spam"]:
@@ -171,15 +235,32 @@ email_graph = StateGraph(EmailState)
 
 # Add nodes
 email_graph.add_node("read_email", read_email)
-email_graph.add_node("classify_email", classify_email)
+email_graph.add_node("pre_classify", pre_classify)
+# LLM nodes have async variants so ainvoke/abatch do not block on the model
+email_graph.add_node(
+    "classify_email", RunnableLambda(classify_email, afunc=aclassify_email)
+)
 email_graph.add_node("handle_spam", handle_spam)
-email_graph.add_node("draft_response", draft_response)
+email_graph.add_node(
+    "draft_response", RunnableLambda(draft_response, afunc=adraft_response)
+)
 email_graph.add_node("notify_mr_hugg", notify_mr_hugg)
 
 # Start the edges
 email_graph.add_edge(START, "read_email")
 # Add edges - defining the flow
-email_graph.add_edge("read_email", "classify_email")
+email_graph.add_edge("read_email", "pre_classify")
+
+# Only ambiguous emails reach the LLM classifier
+email_graph.add_conditional_edges(
+    "pre_classify",
+    route_pre_classified,
+    {
+        "ambiguous": "classify_email",
+        "spam": "handle_spam",
+        "legitimate": "draft_response",
+    },
+)
 
 # Add conditional branching from classify_email
 email_graph.add_conditional_edges(
@@ -209,34 +290,36 @@ spam_email = {
     "body": "CONGRATULATIONS! You have been selected as the winner of our international lottery! To claim your $5,000,000 prize, please send us your bank details and a processing fee of $100.",
 }
 
-# Process the legitimate email
-print("\nProcessing legitimate email...")
-
-legitimate_result = compiled_graph.invoke(
-    input={
-        "email": legitimate_email,
-        "is_spam": None,
-        "spam_reason": None,
-        "email_category": None,
-        "draft_response": None,
-        "messages": [],
-    },
-    config={"callbacks": [langfuse_handler]},
-)
-print(legitimate_result)
-
-
-# Process the spam email
-# print("\nProcessing spam email...")
-# spam_result = compiled_graph.invoke(
-#     {
-#         "email": spam_email,
-#         "is_spam": None,
-#         "spam_reason": None,
-#         "email_category": None,
-#         "email_draft": None,
-#         "messages": [],
-#     }
-# )
-
-# print(spam_result)
+if __name__ == "__main__":
+    # Process the legitimate email
+    print("\nProcessing legitimate email...")
+
+    legitimate_result = compiled_graph.invoke(
+        input={
+            "email": legitimate_email,
+            "is_spam": None,
+            "spam_reason": None,
+            "email_category": None,
+            "draft_response": None,
+            "messages": [],
+        },
+        # Langfuse or JSONL tracing when configured, see tracing.py
+        config={"callbacks": tracer.callbacks()},
+    )
+    print(legitimate_result)
+    tracer.flush()
+
+    # Process the spam email
+    # print("\nProcessing spam email...")
+    # spam_result = compiled_graph.invoke(
+    #     {
+    #         "email": spam_email,
+    #         "is_spam": None,
+    #         "spam_reason": None,
+    #         "email_category": None,
+    #         "email_draft": None,
+    #         "messages": [],
+    #     }
+    # )
+
+    # print(spam_result)
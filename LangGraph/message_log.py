@@ -0,0 +1,107 @@
+"""Bounded message history and prompt size limits for the mail sorter state.
+
+``bounded_log`` is a LangGraph reducer: nodes return only their new turns
+and the reducer appends them, clipping long texts and folding the oldest
+turns into a single summary entry once the cap is reached. ``fit_body``
+shortens email bodies to a token budget before they go into a prompt.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+MAX_MESSAGES = int(os.environ.get("MAIL_MAX_MESSAGES", 8))
+MAX_MESSAGE_CHARS = int(os.environ.get("MAIL_MAX_MESSAGE_CHARS", 2000))
+MAX_SUMMARY_CHARS = 1000
+BODY_TOKEN_BUDGET = int(os.environ.get("MAIL_BODY_TOKEN_BUDGET", 1000))
+# Rough average for English text, close enough for a budget without a tokenizer
+CHARS_PER_TOKEN = 4
+
+SUMMARY_ROLE = "summary"
+
+_QUOTE_HEADER = re.compile(
+    r"^(?:On .{0,200}wrote:|-{2,} ?Original Message ?-{2,}|From: .+)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _clip(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - 1] + "…"
+
+
+def _summarize(
+    summary: Optional[Dict[str, Any]], turns: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Fold turns into the summary entry as one short line each."""
+    lines = [summary["content"]] if summary else []
+    lines += [
+        f"{turn['role']}: {_clip(' '.join(turn['content'].split()), 120)}"
+        for turn in turns
+    ]
+    return {
+        "role": SUMMARY_ROLE,
+        # Keep the most recent lines when the summary itself gets too long
+        "content": "\n".join(lines)[-MAX_SUMMARY_CHARS:],
+        "count": (summary["count"] if summary else 0) + len(turns),
+    }
+
+
+def bounded_log(max_messages: int = MAX_MESSAGES, max_chars: int = MAX_MESSAGE_CHARS):
+    """Create a reducer that keeps at most ``max_messages`` entries.
+
+    Args:
+        max_messages (int): Entries kept, including the summary entry (at least 2).
+        max_chars (int): Longest message content stored, longer texts are clipped.
+    """
+    max_messages = max(max_messages, 2)
+
+    def add_messages(
+        log: Optional[List[Dict[str, Any]]], new: Optional[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        merged = list(log or []) + [
+            {**message, "content": _clip(message["content"], max_chars)}
+            for message in new or []
+        ]
+        if len(merged) <= max_messages:
+            return merged
+
+        summary = merged[0] if merged[0]["role"] == SUMMARY_ROLE else None
+        turns = merged[1:] if summary else merged
+        overflow = len(turns) - (max_messages - 1)
+        return [_summarize(summary, turns[:overflow])] + turns[overflow:]
+
+    return add_messages
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def strip_quoted(body: str) -> str:
+    """Drop the quoted earlier messages of a reply thread."""
+    match = _QUOTE_HEADER.search(body)
+    text = body[: match.start()] if match else body
+    text = "\n".join(line for line in text.splitlines() if not line.startswith(">"))
+    # A message that is nothing but a quote keeps its text
+    return text.strip() or body
+
+
+def fit_body(body: str, max_tokens: int = BODY_TOKEN_BUDGET) -> str:
+    """Shorten an email body to about ``max_tokens`` tokens for a prompt.
+
+    A body within the budget is returned unchanged. Otherwise quoted replies
+    are removed first, and if it is still too long its beginning and end are
+    kept, which hold the request and the sign-off.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(body) <= max_chars:
+        return body
+    body = strip_quoted(body)
+    if len(body) <= max_chars:
+        return body
+    head = max_chars * 4 // 5
+    tail = max_chars - head
+    omitted = len(body) - head - tail
+    return f"{body[:head]}\n[... {omitted} characters omitted ...]\n{body[-tail:]}"
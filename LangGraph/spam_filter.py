@@ -0,0 +1,271 @@
+"""Fast spam pre-classifier run ahead of the LLM in the mail sorter.
+
+Header and keyword rules catch the obvious cases, a hashed n-gram logistic
+regression scores the rest. Only emails the model is unsure about are sent
+to the LLM. The model is trained on labels produced by the LLM itself:
+
+    python mail_batch.py emails.jsonl --output results.jsonl
+    python spam_filter.py train emails.jsonl results.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+N_FEATURES = 2**18
+MODEL_PATH = Path(
+    os.environ.get("SPAM_MODEL_PATH", Path(__file__).with_name("spam_model.npz"))
+)
+
+_TOKEN = re.compile(r"[a-z0-9$€£']+")
+
+# Each phrase is one hit, two hits from a suspicious sender decide spam
+# without the model
+SPAM_PHRASES = (
+    "you have won",
+    "you have been selected",
+    "claim your",
+    "lottery",
+    "bank details",
+    "processing fee",
+    "wire transfer",
+    "act now",
+    "100% free",
+    "risk free",
+    "congratulations!",
+)
+SPAM_SENDER_WORDS = ("lottery", "winner", "prize", "casino", "jackpot")
+# SPF, DKIM or DMARC failures in the Authentication-Results header
+_AUTH_FAILURE = re.compile(r"\b(?:spf|dkim|dmarc)=(?:fail|softfail)\b", re.IGNORECASE)
+
+
+def _domain(sender: str) -> str:
+    return sender.rsplit("@", 1)[-1].strip("> ").lower() if "@" in sender else ""
+
+
+def features(email: Dict[str, Any]) -> np.ndarray:
+    """Hash the word uni/bigrams and header shape of an email into feature indices."""
+    subject = email.get("subject", "")
+    tokens = _TOKEN.findall(f"{subject} {email.get('body', '')}".lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    grams.append(f"from:{_domain(email.get('sender', ''))}")
+    if subject.isupper():
+        grams.append("subject:upper")
+    if "!!" in subject:
+        grams.append("subject:!!")
+    # crc32 instead of hash() so the indices are the same in every process
+    return np.unique(
+        np.fromiter(
+            (zlib.crc32(gram.encode()) & (N_FEATURES - 1) for gram in grams),
+            dtype=np.int64,
+            count=len(grams),
+        )
+    )
+
+
+def suspicious_sender(email: Dict[str, Any]) -> bool:
+    """Whether the sender has no real domain, a lottery style domain or failed authentication."""
+    domain = _domain(email.get("sender", ""))
+    if "." not in domain or any(word in domain for word in SPAM_SENDER_WORDS):
+        return True
+    return bool(_AUTH_FAILURE.search(email.get("auth", "")))
+
+
+def rule_verdict(
+    email: Dict[str, Any], trusted_domains: Iterable[str] = ()
+) -> Optional[bool]:
+    """True for obvious spam, False for trusted senders, None when the rules do not decide.
+
+    Spam phrases alone also occur in legitimate mail (security notices,
+    newsletters), so they only decide together with a suspicious sender.
+    """
+    domain = _domain(email.get("sender", ""))
+    if domain and domain in trusted_domains:
+        return False
+
+    subject = email.get("subject", "")
+    text = f"{subject} {email.get('body', '')}".lower()
+    hits = sum(phrase in text for phrase in SPAM_PHRASES)
+    hits += subject.isupper() and "!!" in subject
+    return True if hits >= 2 and suspicious_sender(email) else None
+
+
+class HashedNgramModel:
+    """Logistic regression over binary hashed n-gram features."""
+
+    def __init__(self, weights: Optional[np.ndarray] = None, bias: float = 0.0):
+        self.weights = (
+            weights if weights is not None else np.zeros(N_FEATURES, np.float32)
+        )
+        self.bias = float(bias)
+
+    def predict_proba(self, indices: np.ndarray) -> float:
+        """Spam probability of one email's feature indices."""
+        score = self.weights[indices].sum() + self.bias
+        return float(1 / (1 + np.exp(-score)))
+
+    def fit(
+        self,
+        feature_rows: List[np.ndarray],
+        labels: List[bool],
+        epochs: int = 50,
+        learning_rate: float = 0.5,
+    ) -> "HashedNgramModel":
+        """Train with full batch AdaGrad, which suits sparse features.
+
+        Args:
+            feature_rows (list[np.ndarray]): Feature indices per email, see features().
+            labels (list[bool]): True for spam.
+            epochs (int): Passes over the data.
+            learning_rate (float): AdaGrad step size.
+        """
+        indices = np.concatenate(feature_rows)
+        rows = np.repeat(np.arange(len(feature_rows)), [len(r) for r in feature_rows])
+        y = np.asarray(labels, dtype=np.float64)
+        weights = self.weights.astype(np.float64)
+        bias = self.bias
+        squared = np.full(N_FEATURES, 1e-8)
+        bias_squared = 1e-8
+
+        for _ in range(epochs):
+            scores = np.bincount(rows, weights=weights[indices], minlength=len(y))
+            errors = 1 / (1 + np.exp(-(scores + bias))) - y
+            gradient = np.bincount(indices, weights=errors[rows], minlength=N_FEATURES)
+            gradient /= len(y)
+            squared += gradient**2
+            weights -= learning_rate * gradient / np.sqrt(squared)
+            bias_gradient = errors.mean()
+            bias_squared += bias_gradient**2
+            bias -= learning_rate * bias_gradient / np.sqrt(bias_squared)
+
+        self.weights = weights.astype(np.float32)
+        self.bias = bias
+        return self
+
+    def save(self, path=MODEL_PATH):
+        np.savez_compressed(path, weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH) -> Optional["HashedNgramModel"]:
+        """Load a trained model, or None when no model file exists."""
+        if not Path(path).exists():
+            return None
+        data = np.load(path)
+        return cls(data["weights"], float(data["bias"]))
+
+
+class PreClassifier:
+    """Decide high-confidence emails locally and leave the rest to the LLM.
+
+    The rules run first. When they do not decide, the model's spam probability
+    must be at least ``spam_threshold`` or at most ``ham_threshold`` for a
+    verdict; anything in between is ambiguous and goes to the LLM.
+    """
+
+    def __init__(
+        self,
+        model: Optional[HashedNgramModel] = None,
+        spam_threshold: float = 0.98,
+        ham_threshold: float = 0.02,
+        trusted_domains: Iterable[str] = (),
+    ):
+        self.model = model
+        self.spam_threshold = spam_threshold
+        self.ham_threshold = ham_threshold
+        self.trusted_domains = {domain.lower() for domain in trusted_domains}
+        self._lock = threading.Lock()
+        self.counts = {"rules": 0, "model": 0, "llm": 0}
+
+    def classify(self, email: Dict[str, Any]) -> Tuple[Optional[bool], str]:
+        """Classify an email without the LLM.
+
+        Returns:
+            tuple: (is_spam, reason). is_spam is None when the email is ambiguous.
+        """
+        verdict = rule_verdict(email, self.trusted_domains)
+        if verdict is not None:
+            self._count("rules")
+            reason = "spam keywords and headers" if verdict else "trusted sender"
+            return verdict, f"rules: {reason}"
+
+        if self.model is not None:
+            probability = self.model.predict_proba(features(email))
+            if probability >= self.spam_threshold or probability <= self.ham_threshold:
+                self._count("model")
+                return (
+                    probability >= self.spam_threshold,
+                    f"model: spam probability {probability:.3f}",
+                )
+
+        self._count("llm")
+        return None, ""
+
+    def _count(self, source: str):
+        with self._lock:
+            self.counts[source] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                **self.counts,
+                "decided_locally": (
+                    round(1 - self.counts["llm"] / total, 4) if total else None
+                ),
+            }
+
+
+def labeled_emails(emails_path: str, results_path: str) -> List[Dict[str, Any]]:
+    """Join emails with the LLM labels written by mail_batch.py (matched by index).
+
+    Emails the rules or the model decided are left out, training on those
+    verdicts would only reinforce the classifier's own mistakes.
+    """
+    from mail_batch import read_emails
+
+    with open(results_path, encoding="utf-8") as file:
+        labels = {
+            result["index"]: result["is_spam"]
+            for result in map(json.loads, file)
+            if result.get("classified_by") == "llm"
+            and result.get("is_spam") is not None
+        }
+    return [
+        {**email, "is_spam": labels[index]}
+        for index, email in enumerate(read_emails(emails_path))
+        if index in labels
+    ]
+
+
+pre_classifier = PreClassifier(HashedNgramModel.load())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train = subparsers.add_parser("train", help="Train the model on LLM labels")
+    train.add_argument("emails", help="JSONL or mbox file with the emails")
+    train.add_argument("results", help="Results of mail_batch.py for the same file")
+    train.add_argument("--model", default=str(MODEL_PATH))
+    train.add_argument("--epochs", type=int, default=50)
+    args = parser.parse_args()
+
+    emails = labeled_emails(args.emails, args.results)
+    model = HashedNgramModel().fit(
+        [features(email) for email in emails],
+        [email["is_spam"] for email in emails],
+        epochs=args.epochs,
+    )
+    model.save(args.model)
+    print(f"Trained on {len(emails)} emails, saved to {args.model}")
+
+
+if __name__ == "__main__":
+    main()
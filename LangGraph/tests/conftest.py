@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The mail sorter modules import each other from the LangGraph directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,49 @@
+import json
+import sys
+
+import pytest
+
+pytest.importorskip("langchain_ollama")
+
+import mail_batch  # noqa: E402
+
+EMAILS = [
+    {
+        "sender": "john.smith@example.com",
+        "subject": "Question about your services",
+        "body": "Could we schedule a call next week to discuss a consultation?",
+    },
+    {
+        "sender": "winner@lottery-intl.com",
+        "subject": "YOU HAVE WON!!",
+        "body": "You have won the lottery. Send your bank details and the processing fee.",
+    },
+    {
+        "sender": "anna@example.org",
+        "subject": "Invoice",
+        "body": "Please find the invoice for March attached.",
+    },
+]
+
+
+def test_batch_writes_only_results_to_stdout(tmp_path, monkeypatch, capsys):
+    emails = tmp_path / "emails.jsonl"
+    emails.write_text("\n".join(json.dumps(email) for email in EMAILS) + "\n")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["mail_batch.py", str(emails), "--fake-llm", "--fake-latency", "0"],
+    )
+
+    mail_batch.main()
+
+    captured = capsys.readouterr()
+    results = [json.loads(line) for line in captured.out.splitlines()]
+    assert sorted(result["index"] for result in results) == [0, 1, 2]
+    assert all("error" not in result for result in results)
+    by_index = {result["index"]: result for result in results}
+    assert by_index[0]["is_spam"] is False
+    assert by_index[0]["email_draft"]
+    assert by_index[1]["is_spam"] is True
+    # Node progress and the summary go to stderr
+    assert json.loads(captured.err[captured.err.index("{\n") :])["emails"] == 3
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from spam_filter import labeled_emails
+
+
+def test_labeled_emails_keep_only_llm_labels(tmp_path):
+    pytest.importorskip("langchain_ollama")
+    emails = tmp_path / "emails.jsonl"
+    results = tmp_path / "results.jsonl"
+    emails.write_text(
+        "\n".join(
+            json.dumps({"sender": f"user{i}@example.com", "subject": "", "body": ""})
+            for i in range(4)
+        )
+        + "\n"
+    )
+    results.write_text(
+        "\n".join(
+            json.dumps(result)
+            for result in [
+                {"index": 0, "is_spam": True, "classified_by": "llm"},
+                {"index": 1, "is_spam": True, "classified_by": "rules"},
+                {"index": 2, "is_spam": False, "classified_by": "model"},
+                {"index": 3, "is_spam": None, "classified_by": "llm"},
+            ]
+        )
+        + "\n"
+    )
+
+    labeled = labeled_emails(str(emails), str(results))
+
+    assert [email["sender"] for email in labeled] == ["user0@example.com"]
+    assert labeled[0]["is_spam"] is True
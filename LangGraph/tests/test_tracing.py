@@ -0,0 +1,47 @@
+import json
+import uuid
+
+import pytest
+
+from tracing import JsonlExporter, SpanExporter
+
+
+def _start(timestamp, run_id, parent_id=None):
+    kwargs = {"run_id": run_id, "parent_run_id": parent_id, "name": "node"}
+    return (timestamp, "on_chain_start", ({}, {}), kwargs)
+
+
+def _end(timestamp, run_id):
+    return (timestamp, "on_chain_end", ({},), {"run_id": run_id})
+
+
+def test_spans_keep_the_captured_times(tmp_path):
+    exporter = JsonlExporter(str(tmp_path / "spans.jsonl"))
+    root, child = uuid.uuid4(), uuid.uuid4()
+
+    exporter.export([_start(10.0, root), _start(10.5, child, root), _end(11.0, child)])
+    exporter.export([_end(12.0, root)])
+    exporter.flush()
+
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").open()]
+    assert [span["seconds"] for span in spans] == [0.5, 2.0]
+    assert spans[0]["trace_id"] == spans[1]["run_id"] == str(root)
+
+
+def test_open_spans_without_an_end_are_evicted(tmp_path):
+    exporter = JsonlExporter(str(tmp_path / "spans.jsonl"))
+    exporter.max_open, exporter.max_age = 2, 60
+
+    # End events lost to a full queue leave these spans open
+    exporter.export([_start(0.0, uuid.uuid4()) for _ in range(3)])
+    assert len(exporter._open) == 2
+    assert exporter.evicted == 1
+
+    exporter.export([_start(100.0, uuid.uuid4())])
+    assert len(exporter._open) == 1
+    assert exporter.evicted == 3
+
+
+def test_exporters_must_implement_write():
+    with pytest.raises(TypeError):
+        SpanExporter()
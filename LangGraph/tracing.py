@@ -0,0 +1,385 @@
+"""Optional, sampled and non-blocking tracing for the mail sorter graph.
+
+Callback events are put on a bounded in-memory queue and exported by a
+background thread, so a slow or unreachable tracing backend never blocks an
+email. When the queue is full, events are dropped and counted instead.
+Exporters pair the events into spans timed when the events were captured.
+
+Configured through environment variables (a .env file is read as well):
+
+    MAIL_TRACE_EXPORTER     auto (default), langfuse, jsonl or none. auto uses
+                            Langfuse when the LANGFUSE_* variables are set.
+    MAIL_TRACE_JSONL        File the jsonl exporter appends spans to.
+    MAIL_TRACE_SAMPLE_RATE  Share of emails traced, from 0 to 1 (default 1).
+    MAIL_TRACE_QUEUE_SIZE   Events buffered before new ones are dropped.
+"""
+
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+
+_EVENTS = (
+    "on_chain_start",
+    "on_chain_end",
+    "on_chain_error",
+    "on_chat_model_start",
+    "on_llm_start",
+    "on_llm_end",
+    "on_llm_error",
+    "on_tool_start",
+    "on_tool_end",
+    "on_tool_error",
+)
+
+
+class SpanExporter(ABC):
+    """Pair the start and end events of each run into finished spans.
+
+    Spans carry the times the events were captured, not the time they are
+    exported, so queueing does not change the latencies. Subclasses write
+    the finished spans in ``write``.
+
+    The end event of an open span can be dropped by a full queue, so open
+    spans are kept for at most ``max_age`` seconds and ``max_open`` spans.
+    Spans evicted by these limits are counted in ``evicted``.
+    """
+
+    # Keep the JSON friendly inputs and outputs of each run in its span
+    payloads = False
+
+    def __init__(self, max_open: int = 10000, max_age: float = 3600.0):
+        self.max_open = max_open
+        self.max_age = max_age
+        self.evicted = 0
+        # Ordered by start time, so the oldest open span is the first one
+        self._open = OrderedDict()
+
+    def export(self, events):
+        spans = []
+        for timestamp, method, args, kwargs in events:
+            run_id = kwargs.get("run_id")
+            kind, _, phase = method[3:].rpartition("_")
+            if phase == "start":
+                parent_id = kwargs.get("parent_run_id")
+                parent = self._open.get(parent_id)
+                serialized = args[0] if args and isinstance(args[0], dict) else {}
+                self._open[run_id] = span = {
+                    "trace_id": str(parent["trace_id"] if parent else run_id),
+                    "run_id": str(run_id),
+                    "parent_run_id": str(parent_id) if parent_id else None,
+                    "kind": "llm" if kind == "chat_model" else kind,
+                    "name": kwargs.get("name") or serialized.get("name"),
+                    "node": (kwargs.get("metadata") or {}).get("langgraph_node"),
+                    "start": timestamp,
+                }
+                if self.payloads and len(args) > 1:
+                    span["input"] = _jsonable(args[1])
+                self._evict(timestamp)
+                continue
+
+            span = self._open.pop(run_id, None)
+            if span is None:
+                # The start event was dropped or not sampled
+                continue
+            span["end"] = timestamp
+            span["seconds"] = round(timestamp - span["start"], 6)
+            span["status"] = "error" if phase == "error" else "ok"
+            if phase == "error" and args:
+                span["error"] = repr(args[0])
+            elif self.payloads and args:
+                span["output"] = _jsonable(args[0])
+            spans.append(span)
+        if spans:
+            self.write(spans)
+
+    def _evict(self, now: float):
+        while self._open and (
+            len(self._open) > self.max_open
+            or now - next(iter(self._open.values()))["start"] > self.max_age
+        ):
+            self._open.popitem(last=False)
+            self.evicted += 1
+
+    @abstractmethod
+    def write(self, spans: list):
+        """Write finished spans, oldest end first."""
+
+    def flush(self):
+        pass
+
+
+def _jsonable(value):
+    """Copy callback arguments (messages, LLM results) into plain JSON values."""
+
+    def default(item):
+        return item.model_dump() if hasattr(item, "model_dump") else str(item)
+
+    return json.loads(json.dumps(value, default=default))
+
+
+def _datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class LangfuseExporter(SpanExporter):
+    """Send the finished spans to Langfuse with their captured start and end times."""
+
+    payloads = True
+
+    def __init__(self):
+        super().__init__()
+        from langfuse import Langfuse
+
+        self._client = Langfuse(
+            secret_key=os.environ["LANGFUSE_SECRET_KEY"],
+            public_key=os.environ["LANGFUSE_PUBLIC_KEY"],
+            host=os.environ["LANGFUSE_HOST"],
+        )
+
+    def write(self, spans: list):
+        from langfuse.api import (
+            CreateGenerationBody,
+            CreateSpanBody,
+            IngestionEvent_GenerationCreate,
+            IngestionEvent_SpanCreate,
+            IngestionEvent_TraceCreate,
+            TraceBody,
+        )
+
+        sent_at = _datetime(time.time()).isoformat()
+        batch = []
+        for span in spans:
+            name = span["name"] or span["kind"]
+            if span["parent_run_id"] is None:
+                trace = TraceBody(
+                    id=span["trace_id"],
+                    name=name,
+                    timestamp=_datetime(span["start"]),
+                    input=span.get("input"),
+                    output=span.get("output"),
+                )
+                batch.append(
+                    IngestionEvent_TraceCreate(
+                        id=str(uuid.uuid4()), timestamp=sent_at, body=trace
+                    )
+                )
+
+            fields = {
+                "id": span["run_id"],
+                "trace_id": span["trace_id"],
+                "parent_observation_id": span["parent_run_id"],
+                "name": name,
+                "start_time": _datetime(span["start"]),
+                "end_time": _datetime(span["end"]),
+                "metadata": {"langgraph_node": span["node"]},
+                "input": span.get("input"),
+                "output": span.get("output"),
+            }
+            if span["status"] == "error":
+                fields.update(level="ERROR", status_message=span.get("error"))
+            if span["kind"] == "llm":
+                event = IngestionEvent_GenerationCreate(
+                    id=str(uuid.uuid4()),
+                    timestamp=sent_at,
+                    body=CreateGenerationBody(**fields),
+                )
+            else:
+                event = IngestionEvent_SpanCreate(
+                    id=str(uuid.uuid4()),
+                    timestamp=sent_at,
+                    body=CreateSpanBody(**fields),
+                )
+            batch.append(event)
+        self._client.api.ingestion.batch(batch=batch)
+
+    def flush(self):
+        self._client.flush()
+
+
+class JsonlExporter(SpanExporter):
+    """Write one JSON line per finished span, works without network access."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, spans: list):
+        for span in spans:
+            self._file.write(json.dumps(span) + "\n")
+
+    def flush(self):
+        self._file.flush()
+
+
+def _enqueue(method: str):
+    def handler(self, *args, **kwargs):
+        self._tracer._put((time.time(), method, args, kwargs))
+
+    handler.__name__ = method
+    return handler
+
+
+class _QueuedHandler(BaseCallbackHandler):
+    """Callback handler that only queues the events for the export thread."""
+
+    run_inline = True
+
+    def __init__(self, tracer: "Tracer"):
+        self._tracer = tracer
+
+
+for _method in _EVENTS:
+    setattr(_QueuedHandler, _method, _enqueue(_method))
+
+
+class Tracer:
+    """Head sampled tracing with a bounded queue and a background exporter.
+
+    Sampling is decided once per run in ``callbacks()``: an unsampled email
+    gets no handler at all and costs nothing. Events of sampled runs are
+    exported in batches of ``batch_size`` by a daemon thread.
+    """
+
+    def __init__(
+        self,
+        exporter=None,
+        sample_rate: float = 1.0,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._handler = _QueuedHandler(self)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.counts = {
+            "sampled": 0,
+            "sampled_out": 0,
+            "exported": 0,
+            "dropped": 0,
+            "export_errors": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        load_dotenv()
+        name = os.environ.get("MAIL_TRACE_EXPORTER", "auto")
+        if name == "auto":
+            configured = all(
+                os.environ.get(key)
+                for key in (
+                    "LANGFUSE_SECRET_KEY",
+                    "LANGFUSE_PUBLIC_KEY",
+                    "LANGFUSE_HOST",
+                )
+            )
+            name = "langfuse" if configured else "none"
+
+        exporter = None
+        if name == "langfuse":
+            try:
+                exporter = LangfuseExporter()
+            except Exception as e:
+                print(f"Langfuse tracing disabled: {e}", file=sys.stderr)
+        elif name == "jsonl":
+            exporter = JsonlExporter(os.environ.get("MAIL_TRACE_JSONL", "traces.jsonl"))
+
+        return cls(
+            exporter,
+            sample_rate=float(os.environ.get("MAIL_TRACE_SAMPLE_RATE", 1.0)),
+            max_queue=int(os.environ.get("MAIL_TRACE_QUEUE_SIZE", 10000)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    def callbacks(self) -> list:
+        """Callback handlers for one graph run, empty when it is not traced."""
+        if not self.enabled:
+            return []
+        sampled = random.random() < self.sample_rate
+        with self._lock:
+            self.counts["sampled" if sampled else "sampled_out"] += 1
+        if not sampled:
+            return []
+        self._start()
+        return [self._handler]
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._export_loop, name="trace-export", daemon=True
+                )
+                self._thread.start()
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.counts["dropped"] += 1
+                if self.counts["dropped"] == 1:
+                    print(
+                        "Trace queue full, dropping spans (see the tracing stats)",
+                        file=sys.stderr,
+                    )
+
+    def _export_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.exporter.export(batch)
+                with self._lock:
+                    self.counts["exported"] += len(batch)
+            except Exception as e:
+                with self._lock:
+                    self.counts["export_errors"] += 1
+                print(f"Trace export failed: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self, timeout: float = 10.0):
+        """Wait up to ``timeout`` seconds for the queued events to be exported."""
+        if self.exporter is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.exporter.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "exporter": type(self.exporter).__name__ if self.exporter else None,
+                "sample_rate": self.sample_rate,
+                "queued": self._queue.qsize(),
+                **self.counts,
+                # Open spans whose end event was lost are dropped as well
+                "dropped": self.counts["dropped"]
+                + getattr(self.exporter, "evicted", 0),
+            }
+
+
+tracer = Tracer.from_env()
@@ -1,40 +1,26 @@
-import gradio as gr
-from pathlib import Path
-import yfinance as yf
+from startup_timing import startup_report, timed
+
+with timed("import gradio"):
+    import gradio as gr
 import os
+import threading
+import time
+from html import escape
 from dotenv import load_dotenv
-from smolagents import (
-    LiteLLMModel,
-    CodeAgent,
-    DuckDuckGoSearchTool,
-    VisitWebpageTool,
-    Tool,
-    tool,
-)
+from fast_path import parse_comparison, path_stats
+from llm_cache import CachedModel, llm_cache
 
 # Load environment variables
 load_dotenv()
 
-client = LiteLLMModel(
-    model="claude-sonnet-4-20250514",
-    api_base="https://api.anthropic.com",
-    api_key=os.getenv("ANTHROPIC_KEY"),
-)
-technical_analysis_tool = Tool.from_space(
-    "Agents-MCP-Hackathon/stock-lens",
-    name="stock_analyzer",
-    api_name="/get_technical_analysis",
-    description="Get technical analysis for the given symbol for the given period. Country and exchange details are required",
-)
-stock_comparison_tool = Tool.from_space(
-    "Agents-MCP-Hackathon/stock-lens",
-    name="compare_stocks_and_generate_report",
-    api_name="/get_comparison_report",
-    description="Compare the provided stocks and generate html report",
-)
-
-
-@tool
+# smolagents, yfinance and the remote Space tools are loaded by get_agent on
+# first use (or by warm_up) so the UI starts listening right away.
+_agent = None
+_tools = None
+_agent_lock = threading.Lock()
+_tools_lock = threading.Lock()
+
+
 def symbol_lookup(query: str, type: str) -> list[str]:
     """
     This tool can be used to find the exact symbols to be used in stock comparison tool.
@@ -44,71 +30,208 @@ def symbol_lookup(query: str, type: str) -> list[str]:
         query(str): Company/Index search term
         type(str): accepts "stock"/"index" as values
     """
+    from symbol_index import symbol_index
+
+    # Answer from the local index, only unknown names go to yfinance
+    symbols = symbol_index.lookup(query, type)
+    if symbols:
+        return symbols
+
+    import yfinance as yf
 
     if type == "index":
         results = yf.Lookup(query).get_index(count=10)
-        return results.index.tolist()
     else:
         results = yf.Lookup(query).get_stock(count=10)
-        return results.index.tolist()
-
-
-agent = CodeAgent(
-    tools=[
-        DuckDuckGoSearchTool(),
-        VisitWebpageTool(),
-        technical_analysis_tool,
-        stock_comparison_tool,
-        symbol_lookup,
-    ],
-    model=client,
-    additional_authorized_imports=[
-        "yfinance",
-        "pandas",
-        "numpy",
-        "requests",
-        "pandas_ta",
-        "matplotlib",
-        "os",
-    ],
-)
+    symbols = results.index.tolist()
+    symbol_index.remember(query, type, symbols)
+    return symbols
+
+
+def get_tools() -> dict:
+    """Create the stock-lens tools on first use, in process or through the Space."""
+    global _tools
+    with _tools_lock:
+        if _tools is not None:
+            return _tools
+
+        with timed("load_tools"):
+            from tool_backend import load_tools
+
+            _tools = load_tools()
+        return _tools
+
+
+def get_agent():
+    """Create the CodeAgent and its tools on first use."""
+    global _agent
+    tools = get_tools()
+    with _agent_lock:
+        if _agent is not None:
+            return _agent
+
+        with timed("import smolagents"):
+            from smolagents import (
+                LiteLLMModel,
+                CodeAgent,
+                DuckDuckGoSearchTool,
+                VisitWebpageTool,
+                tool,
+            )
+
+        # Repeated prompts, such as re-asked comparisons, are answered from the cache
+        client = CachedModel(
+            LiteLLMModel(
+                model="claude-sonnet-4-20250514",
+                api_base="https://api.anthropic.com",
+                api_key=os.getenv("ANTHROPIC_KEY"),
+            )
+        )
+
+        _agent = CodeAgent(
+            tools=[
+                DuckDuckGoSearchTool(),
+                VisitWebpageTool(),
+                tools["technical_analysis"],
+                tools["comparison"],
+                tool(symbol_lookup),
+            ],
+            model=client,
+            additional_authorized_imports=[
+                "yfinance",
+                "pandas",
+                "numpy",
+                "requests",
+                "pandas_ta",
+                "matplotlib",
+                "os",
+            ],
+        )
+        return _agent
+
+
+def _format_response(response) -> str:
+    """Extract the HTML content from the final answer of the agent."""
+    # If response is a tuple, extract just the HTML content
+    if isinstance(response, tuple) and len(response) == 2:
+        html_content, _ = response
+        return html_content
+
+    # If response is HTML string
+    elif isinstance(response, str):
+        if "<!DOCTYPE html>" in response or "<html>" in response:
+            return response
+        else:
+            return f"<p style='color: red'>Unexpected response format: {response}</p>"
+
+    else:
+        return "<p style='color: red'>Invalid response format</p>"
+
+
+def _step_html(step) -> str:
+    """Describe a finished agent step, including what its tools returned."""
+    calls = [
+        call.name
+        for call in getattr(step, "tool_calls", None) or []
+        if call.name != "final_answer"
+    ]
+    line = f"Step {step.step_number}"
+    if calls:
+        line += f": {', '.join(calls)}"
+    if getattr(step, "observations", None):
+        observations = step.observations.strip()
+        # Reports are shown once complete, only preview shorter tool outputs
+        if len(observations) > 300:
+            observations = observations[:300] + "..."
+        line += f"<br><code>{escape(observations)}</code>"
+    return f"<li>{line}</li>"
+
+
+def _fast_comparison(prompt):
+    """Answer plain "Compare X and Y" prompts without the LLM.
+
+    Yields progress HTML and the report last. Returns without yielding when
+    the prompt is not a plain comparison or a name has no exact match in the
+    local symbol index, so the caller can fall back to the agent.
+    """
+    from symbol_index import symbol_index
+
+    parsed = parse_comparison(prompt)
+    if parsed is None:
+        return
+
+    symbols = []
+    for name, type in parsed:
+        symbol = symbol_index.resolve(name, type)
+        if symbol is None and type == "stock":
+            symbol = symbol_index.resolve(name, "index")
+        if symbol is None:
+            path_stats.record_miss()
+            return
+        symbols.append(symbol)
+
+    resolved = ", ".join(f"{name} &rarr; {symbol}" for (name, _), symbol in zip(parsed, symbols))
+    yield f"<div><p><em>Resolved {resolved}. Generating the comparison...</em></p></div>"
+    response = get_tools()["comparison"](symbols[0], symbols[1])
+    yield _format_response(response)
+
+
+def _agent_infer(prompt):
+    """Run the CodeAgent on the prompt, yielding every finished step and the report last."""
+    progress = []
+
+    def status(message):
+        steps = f"<ol>{''.join(progress)}</ol>" if progress else ""
+        return f"<div><p><em>{message}</em></p>{steps}</div>"
+
+    yield status("Planning the analysis...")
+    agent = get_agent()
+    from smolagents.memory import ActionStep, FinalAnswerStep
+
+    response = None
+    for step in agent.run(
+        prompt,
+        stream=True,
+        additional_args={
+            "steps": """Follow these steps:
+            1. Use symbol_lookup tool to get correct symbols
+            2. Use stock_comparison_tool with the symbols
+            3. Return the HTML content from stock_comparison_tool
+            4. Do not modify or summarize the response"""
+        },
+    ):
+        if isinstance(step, FinalAnswerStep):
+            response = step.output
+        elif isinstance(step, ActionStep):
+            progress.append(_step_html(step))
+            yield status("Working...")
+
+    yield _format_response(response)
 
 
 def infer(prompt):
     """
     Process the user prompt and return HTML content from stock comparison tool
+
+    Plain comparisons such as "Compare Apple and Microsoft stocks" are resolved
+    and compared directly; other prompts go to the LLM agent. Yields progress
+    as it becomes available and the report last.
     """
+    start = time.perf_counter()
     try:
-        response = agent.run(
-            prompt,
-            additional_args={
-                "steps": """Follow these steps:
-                1. Use symbol_lookup tool to get correct symbols
-                2. Use stock_comparison_tool with the symbols
-                3. Return the HTML content from stock_comparison_tool
-                4. Do not modify or summarize the response"""
-            },
-        )
-
-        # If response is a tuple, extract just the HTML content
-        if isinstance(response, tuple) and len(response) == 2:
-            html_content, _ = response
-            return html_content
+        answered = False
+        for output in _fast_comparison(prompt):
+            answered = True
+            yield output
+        if answered:
+            path_stats.record("fast", time.perf_counter() - start)
+            return
 
-        # If response is HTML string
-        elif isinstance(response, str):
-            if "<!DOCTYPE html>" in response or "<html>" in response:
-                return response
-            else:
-                return (
-                    f"<p style='color: red'>Unexpected response format: {response}</p>"
-                )
-
-        else:
-            return "<p style='color: red'>Invalid response format</p>"
+        yield from _agent_infer(prompt)
+        path_stats.record("llm", time.perf_counter() - start)
 
     except Exception as e:
-        return f"<p style='color: red'>Error processing request: {str(e)}</p>"
+        yield f"<p style='color: red'>Error processing request: {str(e)}</p>"
 
 
 # Update the Gradio interface
@@ -162,4 +285,30 @@ with gr.Blocks() as demo:
             outputs=html,
         )
 
-demo.launch()
+        with gr.Accordion("Routing stats", open=False):
+            stats_button = gr.Button("Refresh")
+            stats_output = gr.JSON(label="Fast path vs LLM agent, LLM response cache")
+            stats_button.click(
+                fn=lambda: {
+                    "routing": path_stats.summary(),
+                    "llm_cache": llm_cache.stats(),
+                },
+                outputs=stats_output,
+            )
+
+
+def warm_up():
+    """Build the agent in the background once the UI is listening."""
+    try:
+        with timed("get_agent"):
+            get_agent()
+    except Exception as e:
+        print(f"Agent warm-up failed, it will be retried on first request: {e}")
+    print(startup_report())
+
+
+if __name__ == "__main__":
+    with timed("demo.launch"):
+        demo.launch(prevent_thread_lock=True)
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    demo.block_thread()
@@ -0,0 +1,293 @@
+"""Measure the StockLens hot paths offline across symbol counts and history lengths.
+
+yfinance and TradingView are replaced by the recorded or synthetic responses
+in fixtures.py and the mail sorter uses a stub LLM, so runs are repeatable
+without network access. For every case the cold call (empty caches), the
+median warm call, the peak RSS and the peak traced allocations are reported.
+Results are saved as JSON so a baseline can be diffed or compared:
+
+Usage:
+    python benchmarks/bench_hot_paths.py --symbols 1,10 --days 252,2520
+    python benchmarks/bench_hot_paths.py --compare benchmarks/baselines/hot_paths.json
+
+The committed baseline was recorded with the default arguments, which the
+first command also uses. After a change that is meant to move the numbers,
+rerun it and commit the new baseline; timings are only comparable between
+runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import atexit
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Caches are written to a scratch directory, never to the real cache
+CACHE_DIR = Path(tempfile.mkdtemp(prefix="stocklens-bench-"))
+atexit.register(shutil.rmtree, CACHE_DIR, ignore_errors=True)
+os.environ["STOCKLENS_CACHE_DIR"] = str(CACHE_DIR)
+os.environ["STOCKLENS_LLM_CACHE_DB"] = str(CACHE_DIR / "llm_cache.sqlite")
+os.environ.setdefault("MAIL_TRACE_EXPORTER", "none")
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "LangGraph"))
+
+from fixtures import Fixtures, offline  # noqa: E402
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "baselines" / "hot_paths.json"
+QUERIES = ["apple", "microsoft", "google", "dow jones", "nasdaq", "tesla", "amazon"]
+REGRESSION = 0.2
+
+
+def _reset_peak_rss():
+    # Linux only: resets VmHWM so the next reading is the peak of one call
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(run, reset, repeats: int) -> dict:
+    """Time a cold and ``repeats`` warm calls, then trace the memory of a cold call."""
+    reset()
+    start = time.perf_counter()
+    run()
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        warm.append(time.perf_counter() - start)
+
+    reset()
+    _reset_peak_rss()
+    tracemalloc.start()
+    run()
+    _, allocated_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cold_seconds": round(cold, 6),
+        "warm_seconds": round(statistics.median(warm), 6),
+        "peak_rss_mb": round(_peak_rss() / 2**20, 2),
+        "alloc_peak_mb": round(allocated_peak / 2**20, 3),
+    }
+
+
+def reset_caches():
+    """Give every cache a clean start, as after a restart with an empty cache dir."""
+    import report_cache
+    import returns_store
+    import ta_cache
+    from config import TA_CACHE_SIZE
+
+    fresh = returns_store.ReturnsStore(Path(tempfile.mkdtemp(dir=CACHE_DIR)))
+    returns_store.store = report_cache.store = fresh
+    report_cache.report_cache = report_cache.ReportCache()
+    ta_cache.ta_cache = ta_cache.TTLCache(TA_CACHE_SIZE)
+    if "server" in sys.modules:
+        sys.modules["server"].ta_cache = ta_cache.ta_cache
+
+
+def symbols_for(count: int) -> list[str]:
+    return [f"SYM{i}" for i in range(count)]
+
+
+def server_cases(symbol_counts, day_counts):
+    import server
+    from config import SCREENER
+
+    america = list(SCREENER).index("america")
+
+    for count in symbol_counts:
+        symbols = symbols_for(count)
+
+        def technical_analysis(symbols=symbols):
+            for symbol in symbols:
+                server.get_technical_analysis(symbol, "NASDAQ", america, "1d")
+
+        yield "get_technical_analysis", {"symbols": count}, technical_analysis, None
+
+        for days in day_counts:
+
+            def comparison(symbols=symbols):
+                for symbol in symbols:
+                    for _ in server.get_comparison_report(symbol, "BENCH"):
+                        pass
+
+            def snapshot(symbols=symbols):
+                for symbol in symbols:
+                    server.get_performance_snapshot(symbol)
+
+            def chart(symbols=symbols):
+                for symbol in symbols:
+                    server.get_performance_chart(symbol)
+
+            params = {"symbols": count, "days": days}
+            yield "get_comparison_report", params, comparison, days
+            yield "get_performance_snapshot", params, snapshot, days
+            yield "get_performance_chart", params, chart, days
+
+
+def symbol_lookup_cases(symbol_counts):
+    from agent import symbol_lookup
+
+    for count in symbol_counts:
+        queries = [QUERIES[i % len(QUERIES)] for i in range(count)]
+
+        def lookup(queries=queries):
+            for query in queries:
+                symbol_lookup(
+                    query, "index" if query in ("dow jones", "nasdaq") else "stock"
+                )
+
+        yield "symbol_lookup", {"queries": count}, lookup, None
+
+
+def mail_sorter_cases(email_counts):
+    from mail_batch import FakeMailModel, run_batch
+
+    llm = FakeMailModel()
+    for count in email_counts:
+        emails = [
+            {
+                "sender": f"sender{i}@example.com",
+                "subject": "Question about your services",
+                "body": "Could we schedule a call next week? " * (1 + i % 20),
+            }
+            for i in range(count)
+        ]
+
+        def sort_mail(emails=emails):
+            asyncio.run(run_batch(emails, io.StringIO(), concurrency=8, llm=llm))
+
+        yield "mail_sorter_graph", {"emails": count}, sort_mail, None
+
+
+def _cases(name, factory, *args):
+    """Yield the cases of a group, or one skipped entry when its imports fail."""
+    try:
+        yield from factory(*args)
+    except ImportError as e:
+        yield name, {}, None, str(e)
+
+
+def compare(results: list[dict], baseline_path: Path) -> bool:
+    """Print the change against a saved baseline, True when nothing regressed."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {
+        (r["function"], json.dumps(r["params"], sort_keys=True)): r
+        for r in baseline["results"]
+    }
+    ok = True
+    for result in results:
+        old = previous.get(
+            (result["function"], json.dumps(result["params"], sort_keys=True))
+        )
+        if not old or "skipped" in result or "skipped" in old:
+            continue
+        changes = []
+        for metric in ("cold_seconds", "warm_seconds", "alloc_peak_mb"):
+            if old[metric]:
+                change = result[metric] / old[metric] - 1
+                flag = " REGRESSION" if change > REGRESSION else ""
+                ok &= not flag
+                changes.append(f"{metric} {change:+.0%}{flag}")
+        print(f"{result['function']} {result['params']}: {', '.join(changes)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", default="1,10", help="Symbol counts")
+    parser.add_argument("--days", default="252,2520", help="History lengths in days")
+    parser.add_argument("--emails", default="10,100", help="Mail sorter batch sizes")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Simulated seconds per request"
+    )
+    parser.add_argument(
+        "--functions", help="Comma separated function names to run, default all"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help=f"Where to save the results, default {DEFAULT_OUTPUT} unless comparing",
+    )
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare with")
+    args = parser.parse_args()
+
+    symbol_counts = [int(n) for n in args.symbols.split(",")]
+    day_counts = [int(n) for n in args.days.split(",")]
+    email_counts = [int(n) for n in args.emails.split(",")]
+    selected = set(args.functions.split(",")) if args.functions else None
+
+    fixtures = Fixtures(max(day_counts), args.latency)
+    fixtures.write_symbol_directory(CACHE_DIR)
+
+    results = []
+    with offline(fixtures):
+        cases = [
+            *_cases("server", server_cases, symbol_counts, day_counts),
+            *_cases("symbol_lookup", symbol_lookup_cases, symbol_counts),
+            *_cases("mail_sorter_graph", mail_sorter_cases, email_counts),
+        ]
+        for name, params, run, detail in cases:
+            if selected and name not in selected:
+                continue
+            if run is None:
+                print(f"{name:<26} skipped: {detail}")
+                results.append({"function": name, "params": params, "skipped": detail})
+                continue
+            if detail:
+                fixtures.days = detail
+            result = {"function": name, "params": params}
+            result.update(measure(run, reset_caches, args.repeats))
+            results.append(result)
+            print(
+                f"{name:<26} {json.dumps(params):<32} cold {result['cold_seconds']:9.4f}s"
+                f"  warm {result['warm_seconds']:9.4f}s  rss {result['peak_rss_mb']:8.1f} MB"
+                f"  alloc {result['alloc_peak_mb']:8.2f} MB"
+            )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": args.repeats,
+        "latency": args.latency,
+        "results": results,
+    }
+    ok = compare(results, args.compare) if args.compare else True
+    # Comparing leaves the baseline in place unless --output asks otherwise
+    output = args.output or (None if args.compare else DEFAULT_OUTPUT)
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved to {output}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
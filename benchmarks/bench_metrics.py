@@ -0,0 +1,82 @@
+"""Compare the NumPy metrics engine against quantstats for accuracy and speed.
+
+Usage:
+    python benchmarks/bench_metrics.py --symbols 50 --days 2520
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import quantstats as qs
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metrics import METRICS, compute_metrics  # noqa: E402
+
+TOLERANCE = 1e-6
+
+
+def synthetic_returns(symbols: int, days: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2024-12-31", periods=days)
+    benchmark = pd.Series(rng.normal(0.0003, 0.01, days), index=index, name="BENCH")
+    betas = rng.uniform(0.5, 1.5, symbols)
+    noise = rng.normal(0.0002, 0.015, (days, symbols))
+    returns = pd.DataFrame(
+        benchmark.to_numpy()[:, None] * betas + noise,
+        index=index,
+        columns=[f"SYM{i}" for i in range(symbols)],
+    )
+    return returns, benchmark
+
+
+def quantstats_metrics(returns: pd.DataFrame, benchmark: pd.Series):
+    results = {name: [] for name in METRICS}
+    for column in returns.columns:
+        series = returns[column]
+        greeks = qs.stats.greeks(series, benchmark)
+        results["CAGR"].append(qs.stats.cagr(series))
+        results["Sharpe"].append(qs.stats.sharpe(series))
+        results["Sortino"].append(qs.stats.sortino(series))
+        results["Max Drawdown"].append(qs.stats.max_drawdown(series))
+        results["Volatility"].append(qs.stats.volatility(series))
+        results["Beta"].append(greeks["beta"])
+        results["Alpha"].append(greeks["alpha"])
+    return {name: np.asarray(values, dtype=float) for name, values in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--days", type=int, default=2520)
+    args = parser.parse_args()
+
+    returns, benchmark = synthetic_returns(args.symbols, args.days)
+
+    start = time.perf_counter()
+    expected = quantstats_metrics(returns, benchmark)
+    qs_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = compute_metrics(returns.to_numpy(), benchmark.to_numpy())
+    np_time = time.perf_counter() - start
+
+    print(f"{args.symbols} symbols x {args.days} days")
+    print(f"quantstats: {qs_time * 1000:10.2f} ms")
+    print(f"numpy:      {np_time * 1000:10.2f} ms  ({qs_time / np_time:.0f}x faster)")
+
+    failed = False
+    for name in METRICS:
+        error = np.nanmax(np.abs(actual[name] - expected[name]))
+        status = "ok" if error <= TOLERANCE else "MISMATCH"
+        failed |= status != "ok"
+        print(f"{name:<14} max abs diff {error:.2e}  {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
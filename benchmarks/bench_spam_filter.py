@@ -0,0 +1,127 @@
+"""Measure the spam pre-classifier's throughput, coverage and agreement with LLM labels.
+
+The model is trained on part of the labeled emails and evaluated on the rest.
+Labels come from mail_batch.py results; without them a synthetic corpus with
+known labels is used, whose agreement only shows that the pipeline runs.
+
+Usage:
+    python benchmarks/bench_spam_filter.py --emails emails.jsonl --labels results.jsonl
+    python benchmarks/bench_spam_filter.py --synthetic 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "LangGraph"))
+
+from spam_filter import (  # noqa: E402
+    HashedNgramModel,
+    PreClassifier,
+    features,
+    labeled_emails,
+)
+
+SPAM_TEMPLATES = [
+    "CONGRATULATIONS! You have been selected as the winner of our {thing}. Send a processing fee to claim your prize.",
+    "Limited offer on {thing}, act now and get it 100% free for the first month.",
+    "Dear friend, I need your help to move {amount} out of the country, please reply with your bank details.",
+    "Cheap {thing} without prescription, risk free delivery worldwide.",
+    "Your account has been suspended, verify your password for {thing} here.",
+    "Hi, following up on the {thing} invoice of {amount}, please pay through the link below today.",
+    "Could we schedule a call about the {thing}? Reply with your bank details to reserve a slot.",
+]
+HAM_TEMPLATES = [
+    "Dear Mr. Hugg, could we schedule a call next week about the {thing}? Best regards",
+    "Thank you for the quick reply regarding the {thing}, the invoice of {amount} is attached.",
+    "Hi, I have a complaint about the {thing} delivered yesterday, it arrived damaged.",
+    "Could you send me more information about your consulting services for {thing}?",
+    "Reminder: the meeting about the {thing} budget of {amount} moved to Thursday.",
+    "Please confirm the bank details for the {thing} refund of {amount}, finance pays on Friday.",
+    "Act now: the early registration for the {thing} workshop closes tomorrow, it is free for staff.",
+]
+# Both classes send from the same domains, so the sender alone does not give
+# the label away
+DOMAINS = ["example.com", "acme.org", "gmail.com", "mail.ru", "offers.biz"]
+THINGS = ["project", "lottery", "watch", "subscription", "consulting", "car", "loan"]
+
+
+def synthetic_emails(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    emails = []
+    for i in range(count):
+        is_spam = rng.random() < 0.4
+        template = rng.choice(SPAM_TEMPLATES if is_spam else HAM_TEMPLATES)
+        body = template.format(
+            thing=rng.choice(THINGS), amount=f"${rng.randint(100, 99999):,}"
+        )
+        domain = rng.choice(DOMAINS)
+        emails.append(
+            {
+                "sender": f"user{i}@{domain}",
+                "subject": body.split(",")[0][:40],
+                "body": body,
+                "is_spam": is_spam,
+            }
+        )
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", help="JSONL or mbox file with the emails")
+    parser.add_argument("--labels", help="mail_batch.py results for the emails")
+    parser.add_argument("--synthetic", type=int, default=5000)
+    parser.add_argument("--train-fraction", type=float, default=0.8)
+    args = parser.parse_args()
+
+    if args.emails and args.labels:
+        emails = labeled_emails(args.emails, args.labels)
+    else:
+        emails = synthetic_emails(args.synthetic)
+    random.Random(1).shuffle(emails)
+    split = int(len(emails) * args.train_fraction)
+    train, test = emails[:split], emails[split:]
+
+    start = time.perf_counter()
+    model = HashedNgramModel().fit(
+        [features(email) for email in train], [email["is_spam"] for email in train]
+    )
+    train_time = time.perf_counter() - start
+
+    classifier = PreClassifier(model)
+    start = time.perf_counter()
+    verdicts = [classifier.classify(email)[0] for email in test]
+    elapsed = time.perf_counter() - start
+
+    decided = [
+        (verdict, email["is_spam"])
+        for verdict, email in zip(verdicts, test)
+        if verdict is not None
+    ]
+    agreement = sum(v == label for v, label in decided) / len(decided) if decided else 0
+    stats = classifier.stats()
+
+    print(f"{len(train)} training emails, {len(test)} test emails")
+    print(f"training:      {train_time * 1000:10.1f} ms")
+    print(
+        f"classify:      {elapsed / len(test) * 1e6:10.1f} us per email"
+        f"  ({len(test) / elapsed:,.0f} emails/s)"
+    )
+    print(
+        f"decided:       {len(decided) / len(test):10.1%}"
+        f"  (rules {stats['rules']}, model {stats['model']}, LLM {stats['llm']})"
+    )
+    if args.emails and args.labels:
+        print(
+            f"agreement:     {agreement:10.2%}  with the LLM labels on decided emails"
+        )
+    else:
+        # Templated emails say nothing about agreement with a real LLM
+        print(f"agreement:     {agreement:10.2%}  synthetic labels, a smoke test only")
+
+
+if __name__ == "__main__":
+    main()
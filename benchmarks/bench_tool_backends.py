@@ -0,0 +1,60 @@
+"""Compare per-call latency of the local and remote (Space) stock-lens tool backends.
+
+Usage:
+    python benchmarks/bench_tool_backends.py --calls 10 --symbol AAPL --benchmark ^DJI
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tool_backend import local_tools, remote_tools  # noqa: E402
+
+
+def time_calls(tool, calls: int, *args) -> list[float]:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        tool(*args)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--symbol", default="AAPL")
+    parser.add_argument("--exchange", default="NASDAQ")
+    parser.add_argument("--country", default="United States")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--benchmark", default="^DJI")
+    parser.add_argument("--backends", nargs="+", default=["local", "remote"])
+    args = parser.parse_args()
+
+    loaders = {"local": local_tools, "remote": remote_tools}
+    calls = {
+        "technical_analysis": (args.symbol, args.exchange, args.country, args.interval),
+        "comparison": (args.symbol, args.benchmark),
+    }
+
+    print(f"{'backend':<8} {'tool':<20} {'first':>9} {'p50':>9} {'mean':>9}")
+    for backend in args.backends:
+        start = time.perf_counter()
+        tools = loaders[backend]()
+        print(f"{backend:<8} {'(load tools)':<20} {time.perf_counter() - start:>9.3f}")
+        for name, tool_args in calls.items():
+            # The first call pays for downloads and rendering, later ones hit the caches
+            latencies = time_calls(tools[name], args.calls + 1, *tool_args)
+            first, rest = latencies[0], latencies[1:]
+            print(
+                f"{backend:<8} {name:<20} {first:>9.3f} "
+                f"{statistics.median(rest):>9.3f} {statistics.mean(rest):>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Offline yfinance and TradingView responses for the benchmarks.
+
+Recorded responses are read from ``benchmarks/fixtures/`` when present and
+generated deterministically per symbol otherwise, so benchmark runs never
+touch the network and give the same data on every machine. Record real
+responses once with:
+
+    python benchmarks/fixtures.py --symbols AAPL,MSFT,^DJI
+"""
+
+import argparse
+import json
+import sys
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+_RECOMMENDATIONS = ["STRONG_SELL", "SELL", "NEUTRAL", "BUY", "STRONG_BUY"]
+
+
+def _analysis_key(exchange: str, symbol: str, interval: str) -> str:
+    # Intervals are case sensitive ("1m" is one minute, "1M" one month)
+    return f"{exchange}:{symbol}".upper() + f":{interval}"
+
+
+def _rng(*parts) -> np.random.Generator:
+    return np.random.default_rng(zlib.crc32(":".join(map(str, parts)).encode()))
+
+
+def synthetic_bars(symbol: str, days: int) -> pd.DataFrame:
+    """Daily OHLCV bars with the columns of ``yf.download(auto_adjust=True)``."""
+    rng = _rng("bars", symbol)
+    index = pd.bdate_range(end="2024-12-31", periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, days)))
+    spread = np.abs(rng.normal(0, 0.01, days)) * close
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.005, days)),
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(10**5, 10**7, days).astype("float64"),
+        },
+        index=pd.DatetimeIndex(index, name="Date"),
+    )
+
+
+def synthetic_intraday_bars(symbol: str, interval: str, period: str) -> pd.DataFrame:
+    """Regular session bars in New York time like ``yf.download(interval=...)``."""
+    minutes = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60}[interval]
+    days = pd.bdate_range(end="2024-12-31", periods=int(period[:-1]) * 5 // 7)
+    offsets = pd.timedelta_range("9h30min", "15h59min", freq=f"{minutes}min")
+    index = (days.values[:, None] + offsets.values[None, :]).ravel()
+    index = pd.DatetimeIndex(index, name="Datetime").tz_localize("America/New_York")
+    count = len(index)
+    rng = _rng("intraday", symbol, interval)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001 * minutes**0.5, count)))
+    spread = np.abs(rng.normal(0, 0.0005, count)) * close
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.0005, count)),
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(10**3, 10**5, count).astype("float64"),
+        },
+        index=index,
+    )
+
+
+def synthetic_analysis(exchange: str, symbol: str, screener: str, interval: str):
+    """A tradingview_ta Analysis with plausible recommendation counts and indicators."""
+    from tradingview_ta import Analysis
+
+    rng = _rng("analysis", exchange, symbol, interval)
+    analysis = Analysis()
+    analysis.exchange, analysis.symbol = exchange, symbol
+    analysis.screener, analysis.interval = screener, interval
+    analysis.time = datetime(2024, 12, 31, 16, 0)
+
+    def recommendation(count):
+        buy, sell = rng.integers(0, count, 2)
+        neutral = max(count - buy - sell, 0)
+        return {
+            "RECOMMENDATION": _RECOMMENDATIONS[int(rng.integers(0, 5))],
+            "BUY": int(buy),
+            "SELL": int(sell),
+            "NEUTRAL": int(neutral),
+        }
+
+    analysis.summary = recommendation(26)
+    analysis.oscillators = recommendation(11)
+    analysis.moving_averages = recommendation(15)
+    close = float(rng.uniform(20, 500))
+    analysis.indicators = {
+        "close": close,
+        "RSI": float(rng.uniform(20, 80)),
+        "MACD.macd": float(rng.normal(0, 2)),
+        "MACD.signal": float(rng.normal(0, 2)),
+        "EMA20": close * float(rng.uniform(0.95, 1.05)),
+        "SMA50": close * float(rng.uniform(0.9, 1.1)),
+        "ADX": float(rng.uniform(10, 50)),
+        "BB.upper": close * 1.05,
+        "BB.lower": close * 0.95,
+    }
+    return analysis
+
+
+class Fixtures:
+    """Serve recorded responses, or synthetic ones for symbols never recorded."""
+
+    def __init__(
+        self, days: int = 2520, latency: float = 0.0, root: Path = FIXTURES_DIR
+    ):
+        self.days = days
+        self.latency = latency
+        self.root = root
+        path = root / "tradingview.json"
+        self._analyses = (
+            json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        )
+        self.calls = {"yfinance": 0, "tradingview": 0}
+
+    def bars(self, symbol: str) -> pd.DataFrame:
+        path = self.root / "yfinance" / f"{symbol}.parquet"
+        if path.exists():
+            return pd.read_parquet(path).iloc[-self.days :]
+        return synthetic_bars(symbol, self.days)
+
+    def download(
+        self,
+        tickers,
+        start=None,
+        period=None,
+        interval="1d",
+        group_by="column",
+        **kwargs,
+    ):
+        """Replacement for ``yf.download`` returning a grouped frame like yfinance."""
+        self.calls["yfinance"] += 1
+        time.sleep(self.latency)
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {}
+        for symbol in symbols:
+            if interval == "1d":
+                frame = self.bars(symbol)
+            else:
+                frame = synthetic_intraday_bars(symbol, interval, period)
+            frames[symbol] = frame[frame.index >= start] if start else frame
+        if group_by == "ticker" or len(symbols) > 1:
+            return pd.concat(frames, axis=1)
+        return frames[symbols[0]]
+
+    def lookup(self, query: str):
+        """Replacement for ``yf.Lookup`` used when the local symbol index misses."""
+        fixtures = self
+
+        class Lookup:
+            def _results(self, count):
+                fixtures.calls["yfinance"] += 1
+                time.sleep(fixtures.latency)
+                symbol = "".join(c for c in query.upper() if c.isalnum())[:4]
+                return pd.DataFrame(index=[symbol][:count])
+
+            get_stock = get_index = _results
+
+        return Lookup()
+
+    def write_symbol_directory(self, cache_dir: Path, count: int = 8000):
+        """Write the symbol index CSV, the recorded one or synthetic company names."""
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        recorded = self.root / "symbols.csv"
+        if recorded.exists():
+            (cache_dir / "symbols.csv").write_bytes(recorded.read_bytes())
+            return
+        rng = _rng("symbols")
+        words = [
+            "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz"), 6))
+            for _ in range(count)
+        ]
+        lines = ["symbol,name,type,exchange"] + [
+            f"{word[:4].upper()}{i},{word.title()} Holdings Inc. - Common Stock,stock,Q"
+            for i, word in enumerate(words)
+        ]
+        (cache_dir / "symbols.csv").write_text(
+            "\n".join(lines) + "\n", encoding="utf-8"
+        )
+
+    def analysis(self, exchange: str, symbol: str, screener: str, interval: str):
+        from tradingview_ta import Analysis
+
+        recorded = self._analyses.get(_analysis_key(exchange, symbol, interval))
+        if recorded is None:
+            return synthetic_analysis(exchange, symbol, screener, interval)
+        analysis = Analysis()
+        for name, value in recorded.items():
+            setattr(analysis, name, value)
+        analysis.time = datetime.fromisoformat(recorded["time"])
+        return analysis
+
+    def get_analysis(self, handler):
+        """Replacement for ``TA_Handler.get_analysis``."""
+        self.calls["tradingview"] += 1
+        time.sleep(self.latency)
+        return self.analysis(
+            handler.exchange, handler.symbol, handler.screener, handler.interval
+        )
+
+    def get_multiple_analysis(self, screener, interval, symbols, **kwargs):
+        """Replacement for ``tradingview_ta.get_multiple_analysis``."""
+        self.calls["tradingview"] += 1
+        time.sleep(self.latency)
+        return {
+            key: self.analysis(*key.split(":"), screener, interval) for key in symbols
+        }
+
+
+@contextmanager
+def offline(fixtures: Fixtures):
+    """Route yfinance downloads and TradingView requests to the fixtures."""
+    import tradingview_ta
+    import yfinance
+
+    def get_analysis(handler):
+        return fixtures.get_analysis(handler)
+
+    patches = [
+        mock.patch.object(yfinance, "download", fixtures.download),
+        mock.patch.object(yfinance, "Lookup", fixtures.lookup),
+        mock.patch.object(tradingview_ta.TA_Handler, "get_analysis", get_analysis),
+        mock.patch.object(
+            tradingview_ta, "get_multiple_analysis", fixtures.get_multiple_analysis
+        ),
+    ]
+    # server.py imports get_multiple_analysis by name
+    if "server" in sys.modules:
+        patches.append(
+            mock.patch.object(
+                sys.modules["server"],
+                "get_multiple_analysis",
+                fixtures.get_multiple_analysis,
+            )
+        )
+    for patch in patches:
+        patch.start()
+    try:
+        yield fixtures
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+
+
+def record(symbols: list[str], exchange: str, screener: str, intervals: list[str]):
+    """Save real yfinance and TradingView responses as fixtures."""
+    import yfinance as yf
+    from tradingview_ta import TA_Handler
+
+    (FIXTURES_DIR / "yfinance").mkdir(parents=True, exist_ok=True)
+    data = yf.download(
+        symbols, period="max", auto_adjust=True, group_by="ticker", progress=False
+    )
+    for symbol in symbols:
+        frame = data[symbol].dropna(subset=["Close"])
+        frame.to_parquet(FIXTURES_DIR / "yfinance" / f"{symbol}.parquet")
+
+    path = FIXTURES_DIR / "tradingview.json"
+    analyses = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    for symbol in symbols:
+        if symbol.startswith("^"):
+            continue
+        for interval in intervals:
+            analysis = TA_Handler(
+                symbol=symbol, exchange=exchange, screener=screener, interval=interval
+            ).get_analysis()
+            analyses[_analysis_key(exchange, symbol, interval)] = {
+                "exchange": analysis.exchange,
+                "symbol": analysis.symbol,
+                "screener": analysis.screener,
+                "interval": analysis.interval,
+                "time": analysis.time.isoformat(),
+                "summary": analysis.summary,
+                "oscillators": analysis.oscillators,
+                "moving_averages": analysis.moving_averages,
+                "indicators": analysis.indicators,
+            }
+    path.write_text(json.dumps(analyses, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record benchmark fixtures")
+    parser.add_argument("--symbols", required=True, help="Comma separated symbols")
+    parser.add_argument("--exchange", default="NASDAQ")
+    parser.add_argument("--screener", default="america")
+    parser.add_argument("--intervals", default="1d,1h")
+    args = parser.parse_args()
+    record(
+        args.symbols.split(","),
+        args.exchange,
+        args.screener,
+        args.intervals.split(","),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from config import SNAPSHOT_MAX_POINTS
+
+
+def snapshot_series(returns: np.ndarray) -> dict[str, np.ndarray]:
+    """Cumulative return, drawdown and daily return series of the quantstats snapshot.
+
+    Drawdowns are measured from a starting equity of 1, as in quantstats.
+    """
+    r = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+    equity = np.cumprod(1 + r)
+    peak = np.maximum(np.maximum.accumulate(equity), 1.0)
+    return {
+        "cumulative": equity - 1,
+        "drawdown": equity / peak - 1,
+        "daily": r,
+    }
+
+
+def downsample_minmax(x: np.ndarray, y: np.ndarray, max_points: int):
+    """Keep the minimum and maximum of each bucket, in time order.
+
+    Unlike taking every n-th point, the extremes (drawdown troughs, return
+    spikes) survive, so the chart keeps its shape with far fewer points.
+    """
+    if len(y) <= max_points:
+        return x, y
+    size = -(-len(y) // max(max_points // 2, 1))
+    # Every bucket holds at least one point, only the last one is padded
+    buckets = -(-len(y) // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[: len(y)] = y
+    rows = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picks = np.sort(
+        np.column_stack(
+            [np.nanargmin(rows, axis=1) + offsets, np.nanargmax(rows, axis=1) + offsets]
+        ),
+        axis=1,
+    ).ravel()
+    picks = picks[np.r_[True, picks[1:] != picks[:-1]]]
+    return x[picks], y[picks]
+
+
+def render_snapshot_figure(
+    returns, title: str = "Performance", max_points: int = SNAPSHOT_MAX_POINTS
+) -> go.Figure:
+    """Build the performance snapshot as a Plotly figure rendered by the client.
+
+    Args:
+        returns(pd.Series): Daily returns indexed by date.
+        title(str): Chart title.
+        max_points(int): Points kept per series, longer histories are downsampled.
+    """
+    series = snapshot_series(returns.to_numpy())
+    # Epoch milliseconds serialize as a compact typed array, date strings do not
+    x = returns.index.to_numpy().astype("datetime64[ms]").astype(np.float64)
+
+    figure = go.Figure()
+    panels = [
+        ("cumulative", "Cumulative Return", "y", "scatter"),
+        ("drawdown", "Drawdown", "y2", "scatter"),
+        ("daily", "Daily Return", "y3", "bar"),
+    ]
+    for name, label, axis, kind in panels:
+        px, py = downsample_minmax(x, series[name], max_points)
+        trace = go.Bar if kind == "bar" else go.Scatter
+        options = {} if kind == "bar" else {"mode": "lines"}
+        if name == "drawdown":
+            options["fill"] = "tozeroy"
+        figure.add_trace(
+            trace(x=px, y=py.astype(np.float32), name=label, yaxis=axis, **options)
+        )
+
+    figure.update_layout(
+        # The default template alone adds kilobytes of styling to every payload
+        template="none",
+        title=title,
+        showlegend=False,
+        height=600,
+        margin={"l": 50, "r": 20, "t": 50, "b": 30},
+        xaxis={"type": "date", "anchor": "y3"},
+        yaxis={"domain": [0.45, 1.0], "title": "Cumulative", "tickformat": ".0%"},
+        yaxis2={"domain": [0.25, 0.42], "title": "Drawdown", "tickformat": ".0%"},
+        yaxis3={"domain": [0.0, 0.22], "title": "Daily", "tickformat": ".1%"},
+    )
+    return figure
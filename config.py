@@ -1,5 +1,103 @@
+import os
+from pathlib import Path
 from tradingview_ta import Interval
 
+# Local cache directory for downloaded market data (override with STOCKLENS_CACHE_DIR)
+CACHE_DIR = Path(os.getenv("STOCKLENS_CACHE_DIR", ".cache"))
+
+# Seconds a cached price history is served before checking yfinance for new bars
+RETURNS_MAX_AGE = int(os.getenv("STOCKLENS_RETURNS_MAX_AGE", 15 * 60))
+
+# Concurrent TradingView scan requests used by the bulk analysis endpoint
+TA_BULK_WORKERS = int(os.getenv("STOCKLENS_TA_BULK_WORKERS", 8))
+
+# Symbols sent to TradingView in a single multi-symbol scan request
+TA_BULK_CHUNK_SIZE = int(os.getenv("STOCKLENS_TA_BULK_CHUNK_SIZE", 100))
+
+# Technical analysis results kept in the in-process LRU cache
+TA_CACHE_SIZE = int(os.getenv("STOCKLENS_TA_CACHE_SIZE", 4096))
+
+# Optional SQLite file shared by all workers for cached technical analysis
+TA_CACHE_DB = os.getenv("STOCKLENS_TA_CACHE_DB")
+
+# Downloadable report files kept in the temp directory, and their lifetime in seconds
+REPORT_FILES_MAX = int(os.getenv("STOCKLENS_REPORT_FILES_MAX", 64))
+REPORT_FILES_MAX_AGE = int(os.getenv("STOCKLENS_REPORT_FILES_MAX_AGE", 60 * 60))
+
+# Compressed bytes of rendered reports and snapshots kept in memory
+REPORT_CACHE_MAX_BYTES = int(
+    os.getenv("STOCKLENS_REPORT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+)
+
+# Points kept per series of the interactive performance chart (min/max downsampled)
+SNAPSHOT_MAX_POINTS = int(os.getenv("STOCKLENS_SNAPSHOT_MAX_POINTS", 500))
+
+# Worker processes rendering reports, seconds a caller waits for a render,
+# and renders allowed to wait for a free worker before new ones are rejected
+RENDER_POOL_SIZE = int(
+    os.getenv("STOCKLENS_RENDER_POOL_SIZE", max(1, (os.cpu_count() or 2) // 2))
+)
+RENDER_TIMEOUT = float(os.getenv("STOCKLENS_RENDER_TIMEOUT", 120))
+RENDER_QUEUE_DEPTH = int(os.getenv("STOCKLENS_RENDER_QUEUE_DEPTH", 8))
+
+# Where the agent's stock-lens tools run: "local" (server.py in process),
+# "remote" (the Hugging Face Space) or "auto" (local when importable)
+TOOL_BACKEND = os.getenv("STOCKLENS_TOOL_BACKEND", "auto")
+
+# Seconds before the local symbol index downloads a fresh ticker list
+SYMBOL_INDEX_MAX_AGE = int(os.getenv("STOCKLENS_SYMBOL_INDEX_MAX_AGE", 24 * 60 * 60))
+
+# Intraday price histories kept in memory for multi-timeframe analysis
+INTRADAY_CACHE_SIZE = int(os.getenv("STOCKLENS_INTRADAY_CACHE_SIZE", 256))
+
+# Symbols per tile of the correlation matrix in the universe analysis, and the
+# share of trading days a symbol needs to be kept in the returns panel
+PANEL_BLOCK_SIZE = int(os.getenv("STOCKLENS_PANEL_BLOCK_SIZE", 512))
+PANEL_MIN_COVERAGE = float(os.getenv("STOCKLENS_PANEL_MIN_COVERAGE", 0.9))
+
+
+# Ticker lists used to build the local symbol index (pipe delimited NASDAQ Trader files)
+SYMBOL_DIRECTORY_URLS = [
+    "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+]
+
+# Common names which do not match the listed company or index name
+STOCK_ALIASES = {
+    "google": ["GOOGL", "GOOG"],
+    "alphabet": ["GOOGL", "GOOG"],
+    "facebook": ["META"],
+    "berkshire": ["BRK-B", "BRK-A"],
+    "berkshire hathaway": ["BRK-B", "BRK-A"],
+    "jp morgan": ["JPM"],
+    "coca cola": ["KO"],
+    "walmart": ["WMT"],
+    "disney": ["DIS"],
+    "tata consultancy services": ["TCS.NS"],
+    "tcs": ["TCS.NS"],
+    "reliance": ["RELIANCE.NS"],
+    "infosys": ["INFY.NS", "INFY"],
+}
+
+INDEX_ALIASES = {
+    "^DJI": ["dow", "dow jones", "dow jones industrial average"],
+    "^GSPC": ["s&p 500", "s&p", "sp500", "sp 500", "standard and poors 500"],
+    "^IXIC": ["nasdaq", "nasdaq composite"],
+    "^NDX": ["nasdaq 100"],
+    "^RUT": ["russell 2000"],
+    "^VIX": ["vix", "volatility index"],
+    "^NSEI": ["nifty", "nifty 50"],
+    "^BSESN": ["sensex", "bse sensex"],
+    "^FTSE": ["ftse", "ftse 100"],
+    "^GDAXI": ["dax"],
+    "^FCHI": ["cac 40", "cac"],
+    "^STOXX50E": ["euro stoxx 50", "stoxx 50"],
+    "^N225": ["nikkei", "nikkei 225"],
+    "^HSI": ["hang seng"],
+    "^GSPTSE": ["tsx", "s&p tsx composite"],
+    "^AXJO": ["asx 200", "s&p asx 200"],
+}
+
 SCREENER = {
     "None": "Select an option",
     "america": "United States",
@@ -28,6 +126,36 @@ SCREENER = {
     "canada": "Canada",
 }
 
+# Regular session of the main exchange of each screener: timezone, open and
+# close in local time. Intraday bars outside the session (pre and post market)
+# are dropped before resampling; lunch breaks are not modelled.
+SESSIONS = {
+    "america": ("America/New_York", "09:30", "16:00"),
+    "indonesia": ("Asia/Jakarta", "09:00", "16:00"),
+    "india": ("Asia/Kolkata", "09:15", "15:30"),
+    "italy": ("Europe/Rome", "09:00", "17:30"),
+    "uk": ("Europe/London", "08:00", "16:30"),
+    "brazil": ("America/Sao_Paulo", "10:00", "17:00"),
+    "vietnam": ("Asia/Ho_Chi_Minh", "09:00", "15:00"),
+    "rsa": ("Africa/Johannesburg", "09:00", "17:00"),
+    "ksa": ("Asia/Riyadh", "10:00", "15:00"),
+    "australia": ("Australia/Sydney", "10:00", "16:00"),
+    "russia": ("Europe/Moscow", "10:00", "18:50"),
+    "thailand": ("Asia/Bangkok", "10:00", "16:30"),
+    "philippines": ("Asia/Manila", "09:30", "15:00"),
+    "taiwan": ("Asia/Taipei", "09:00", "13:30"),
+    "sweden": ("Europe/Stockholm", "09:00", "17:30"),
+    "france": ("Europe/Paris", "09:00", "17:30"),
+    "turkey": ("Europe/Istanbul", "10:00", "18:00"),
+    "euronext": ("Europe/Paris", "09:00", "17:30"),
+    "germany": ("Europe/Berlin", "09:00", "17:30"),
+    "spain": ("Europe/Madrid", "09:00", "17:30"),
+    "hongkong": ("Asia/Hong_Kong", "09:30", "16:00"),
+    "korea": ("Asia/Seoul", "09:00", "15:30"),
+    "malaysia": ("Asia/Kuala_Lumpur", "09:00", "17:00"),
+    "canada": ("America/Toronto", "09:30", "16:00"),
+}
+
 interval_options = [
     Interval.INTERVAL_1_DAY,
     Interval.INTERVAL_1_MONTH,
@@ -39,3 +167,16 @@ interval_options = [
     Interval.INTERVAL_4_HOURS,
     Interval.INTERVAL_1_WEEK,
 ]
+
+# Seconds a technical analysis result is cached for each interval
+interval_ttl = {
+    Interval.INTERVAL_1_MINUTE: 30,
+    Interval.INTERVAL_5_MINUTES: 2 * 60,
+    Interval.INTERVAL_15_MINUTES: 5 * 60,
+    Interval.INTERVAL_30_MINUTES: 10 * 60,
+    Interval.INTERVAL_1_HOUR: 15 * 60,
+    Interval.INTERVAL_4_HOURS: 30 * 60,
+    Interval.INTERVAL_1_DAY: 60 * 60,
+    Interval.INTERVAL_1_WEEK: 3 * 60 * 60,
+    Interval.INTERVAL_1_MONTH: 6 * 60 * 60,
+}
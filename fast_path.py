@@ -0,0 +1,99 @@
+import re
+import threading
+
+from config import INDEX_ALIASES
+
+# "Compare Apple and Microsoft stocks", "Analyze Google stock against ^DJI index"
+_COMPARISON = re.compile(
+    r"^\s*(?:please\s+)?(?:compare|analy[sz]e|benchmark)\s+(?P<first>.+?)\s+"
+    r"(?:and|vs\.?|versus|against|with|to)\s+(?P<second>.+?)\s*[.!?]*\s*$",
+    re.IGNORECASE,
+)
+_KIND_SUFFIX = re.compile(
+    r"(?:'s)?\s+(?P<kind>stocks?|shares?|index|indices|performance|returns?)$",
+    re.IGNORECASE,
+)
+# Lists, nested comparisons and questions about a property ("the volatility
+# of Apple") are left to the LLM
+_NOT_A_NAME = re.compile(
+    r"[,;]|\b(?:and|vs|versus|against|with|to|of|the)\b", re.IGNORECASE
+)
+_INDEX_NAMES = {name for names in INDEX_ALIASES.values() for name in names}
+
+
+def _entity(text: str) -> tuple[str, str]:
+    """Split "Google stock" into the name and its lookup type ("stock" or "index")."""
+    text = text.strip().strip("\"'")
+    kind = None
+    match = _KIND_SUFFIX.search(text)
+    while match:
+        kind = kind or match.group("kind").lower()
+        text = text[: match.start()].strip()
+        match = _KIND_SUFFIX.search(text)
+
+    is_index = kind in ("index", "indices") or text.startswith("^")
+    return text, "index" if is_index or text.lower() in _INDEX_NAMES else "stock"
+
+
+def parse_comparison(prompt: str):
+    """Recognize a simple two-party comparison request.
+
+    Returns:
+        list[tuple[str, str]] | None: (name, lookup type) of the symbol and the
+        benchmark, or None when the prompt is not a plain comparison.
+    """
+    match = _COMPARISON.match(prompt)
+    if not match:
+        return None
+
+    if any(_NOT_A_NAME.search(match.group(name)) for name in ("first", "second")):
+        return None
+    first, second = _entity(match.group("first")), _entity(match.group("second"))
+    # Anything longer is a question for the LLM, not a name
+    if not all(0 < len(name.split()) <= 4 for name, _ in (first, second)):
+        return None
+    return [first, second]
+
+
+class PathStats:
+    """Hit rate and latency of the fast path and the LLM agent path."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {"fast": [], "llm": []}
+        self.fast_misses = 0
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            self._latencies[path].append(seconds)
+
+    def record_miss(self):
+        """A prompt parsed as a comparison but fell back to the LLM."""
+        with self._lock:
+            self.fast_misses += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            total = sum(len(latencies) for latencies in self._latencies.values())
+            summary = {
+                "requests": total,
+                "fast_path_hit_rate": (
+                    round(len(self._latencies["fast"]) / total, 4) if total else None
+                ),
+                "fast_path_fallbacks": self.fast_misses,
+            }
+            for path, latencies in self._latencies.items():
+                ordered = sorted(latencies)
+                summary[path] = {
+                    "count": len(ordered),
+                    "p50_seconds": (
+                        round(ordered[len(ordered) // 2], 3) if ordered else None
+                    ),
+                    "p95_seconds": (
+                        round(ordered[int(len(ordered) * 0.95)], 3) if ordered else None
+                    ),
+                }
+            return summary
+
+
+path_stats = PathStats()
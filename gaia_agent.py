@@ -1,4 +1,9 @@
 import os
+import json
+import hashlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import gradio as gr
 import requests
 import pandas as pd
@@ -13,6 +18,8 @@ from smolagents import (
 )
 from langchain_community.document_loaders import ArxivLoader
 
+from llm_cache import CachedModel, llm_cache
+
 load_dotenv()
 
 token = os.environ["HF_KEY"]
@@ -38,13 +45,66 @@ def arxiv_search(query: str) -> str:
 # (Keep Constants as is)
 # --- Constants ---
 DEFAULT_API_URL = "https://agents-course-unit4-scoring.hf.space"
+# Questions answered in parallel, each worker has its own agent
+MAX_WORKERS = int(os.getenv("GAIA_MAX_WORKERS", 4))
+# Seconds after which an agent is interrupted at its next step
+TASK_TIMEOUT = int(os.getenv("GAIA_TASK_TIMEOUT", 600))
+# Answers already produced, reused by later runs
+ANSWER_CACHE_PATH = os.getenv("GAIA_ANSWER_CACHE", "gaia_answers.jsonl")
+
+
+class AnswerCache:
+    """Append-only JSONL file of answers keyed by task id and question hash.
+
+    Every answer is written and flushed as soon as it is produced, so a crash
+    mid-run keeps the completed work and a rerun skips those questions.
+    """
+
+    def __init__(self, path: str = ANSWER_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._answers = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                line = "\n"
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash
+                        continue
+                    self._answers[entry["key"]] = entry["answer"]
+            if not line.endswith("\n"):
+                # End the cut short line so the next answer starts on its own
+                with open(path, "a", encoding="utf-8") as file:
+                    file.write("\n")
+
+    @staticmethod
+    def key(task_id: str, question: str) -> str:
+        digest = hashlib.sha256(question.encode("utf-8")).hexdigest()[:16]
+        return f"{task_id}:{digest}"
+
+    def get(self, task_id: str, question: str):
+        return self._answers.get(self.key(task_id, question))
+
+    def put(self, task_id: str, question: str, answer):
+        key = self.key(task_id, question)
+        with self._lock:
+            self._answers[key] = answer
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps({"key": key, "answer": answer}, default=str) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
 
 
 # --- Basic Agent Definition ---
 # ----- THIS IS WERE YOU CAN BUILD WHAT YOU WANT ------
 class BasicAgent:
     def __init__(self):
-        model = InferenceClientModel(model_id=model_id, provider="nebius", token=token)
+        # Re-run evaluation questions reuse the cached model responses
+        model = CachedModel(
+            InferenceClientModel(model_id=model_id, provider="nebius", token=token)
+        )
         self.agent = CodeAgent(
             tools=[
                 VisitWebpageTool(),
@@ -78,15 +138,27 @@ class BasicAgent:
         )
         print("Agent initialized.")
 
-    def __call__(self, question: str) -> str:
+    def __call__(self, question: str, timeout: float | None = None) -> str:
         print(f"Agent received question (first 50 chars): {question[:50]}...")
 
-        answer = self.agent.run(
+        # The agent checks for an interrupt before each step
+        timer = threading.Timer(timeout, self.agent.interrupt) if timeout else None
+        if timer:
+            timer.daemon = True
+            timer.start()
+        try:
+            answer = self._run(question)
+        finally:
+            if timer:
+                timer.cancel()
+        print(f"Agent returning answer: {answer}")
+        return answer
+
+    def _run(self, question: str) -> str:
+        return self.agent.run(
             f"""You are a general AI assistant.You can use the provided tools and websearch for finding answers.Some questions may include attached files like excel or python codes, include them while evaluating for answer. I will ask you a question. Report your thoughts, and finish your answer. YOUR FINAL ANSWER should be a number OR as few words as possible OR a comma separated list of numbers and/or strings. If you are asked for a number, don't use comma to write your number neither use units such as $ or percent sign unless specified otherwise. If you are asked for a string, don't use articles, neither abbreviations (e.g. for cities), and write the digits in plain text unless specified otherwise. If you are asked for a comma separated list, apply the above rules depending of whether the element to be put in the list is a number or a string.
             {question}""",
         )
-        print(f"Agent returning answer: {answer}")
-        return answer
 
 
 def run_and_submit_all(profile: gr.OAuthProfile | None):
@@ -108,9 +180,11 @@ def run_and_submit_all(profile: gr.OAuthProfile | None):
     questions_url = f"{api_url}/questions"
     submit_url = f"{api_url}/submit"
 
-    # 1. Instantiate Agent ( modify this part to create your agent)
+    # 1. Instantiate Agents ( modify this part to create your agent)
     try:
-        agent = BasicAgent()
+        agents = queue.Queue()
+        for _ in range(MAX_WORKERS):
+            agents.put(BasicAgent())
     except Exception as e:
         print(f"Error instantiating agent: {e}")
         return f"Error initializing agent: {e}", None
@@ -140,36 +214,70 @@ def run_and_submit_all(profile: gr.OAuthProfile | None):
         return f"An unexpected error occurred fetching questions: {e}", None
 
     # 3. Run your Agent
-    results_log = []
-    answers_payload = []
-    print(f"Running agent on {len(questions_data)} questions...")
-    for item in questions_data:
+    cache = AnswerCache()
+    results = {}
+    tasks = []
+    for index, item in enumerate(questions_data):
         task_id = item.get("task_id")
         question_text = item.get("question")
         if not task_id or question_text is None:
             print(f"Skipping item with missing task_id or question: {item}")
             continue
+        cached_answer = cache.get(task_id, question_text)
+        if cached_answer is not None:
+            print(f"Using cached answer for task {task_id}")
+            results[index] = (task_id, question_text, cached_answer, None)
+        else:
+            tasks.append((index, task_id, question_text))
+
+    def answer(task_id, question_text):
+        agent = agents.get()
         try:
-            submitted_answer = agent(question_text)
-            answers_payload.append(
-                {"task_id": task_id, "submitted_answer": submitted_answer}
-            )
-            results_log.append(
-                {
-                    "Task ID": task_id,
-                    "Question": question_text,
-                    "Submitted Answer": submitted_answer,
-                }
-            )
-        except Exception as e:
-            print(f"Error running agent on task {task_id}: {e}")
+            submitted_answer = agent(question_text, timeout=TASK_TIMEOUT)
+        finally:
+            agents.put(agent)
+        cache.put(task_id, question_text, submitted_answer)
+        return submitted_answer
+
+    print(
+        f"Running agent on {len(tasks)} questions with {MAX_WORKERS} workers "
+        f"({len(results)} answers cached)..."
+    )
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(answer, task_id, question_text): (index, task_id, question_text)
+            for index, task_id, question_text in tasks
+        }
+        for future in as_completed(futures):
+            index, task_id, question_text = futures[future]
+            try:
+                results[index] = (task_id, question_text, future.result(), None)
+            except Exception as e:
+                print(f"Error running agent on task {task_id}: {e}")
+                results[index] = (task_id, question_text, None, e)
+    print(f"LLM response cache: {llm_cache.stats()}")
+
+    results_log = []
+    answers_payload = []
+    for index in sorted(results):
+        task_id, question_text, submitted_answer, error = results[index]
+        if error is not None:
             results_log.append(
                 {
                     "Task ID": task_id,
                     "Question": question_text,
-                    "Submitted Answer": f"AGENT ERROR: {e}",
+                    "Submitted Answer": f"AGENT ERROR: {error}",
                 }
             )
+            continue
+        answers_payload.append({"task_id": task_id, "submitted_answer": submitted_answer})
+        results_log.append(
+            {
+                "Task ID": task_id,
+                "Question": question_text,
+                "Submitted Answer": submitted_answer,
+            }
+        )
 
     if not answers_payload:
         print("Agent did not produce any answers to submit.")
@@ -0,0 +1,369 @@
+import threading
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from tradingview_ta.technicals import Compute, Recommendation
+
+from returns_store import store
+
+MA_PERIODS = [10, 20, 30, 50, 100, 200]
+# Bars replayed when a symbol is seen for the first time. EMA200 keeps a
+# weight below 1e-4 for bars older than this, so older history is skipped.
+WARMUP_BARS = 1000
+# Bars the window based indicators (SMA200, Stoch, CCI, AO, ...) look back
+TAIL_BARS = max(MA_PERIODS) + 1
+
+# Recursive state carried from one update to the next, one float per symbol
+STATE_FIELDS = (
+    ["close", "high", "low", "rsi_gain", "rsi_loss", "rsi_prev"]
+    + ["atr", "pdm", "ndm", "adx", "pdi_prev", "ndi_prev"]
+    + ["macd_fast", "macd_slow", "macd_signal"]
+    + [f"ema{period}" for period in MA_PERIODS]
+)
+
+
+def _ema(old, value, alpha):
+    """One exponential smoothing step, seeded with the first value (``adjust=False``)."""
+    return np.where(np.isnan(old), value, old + alpha * (value - old))
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator == 0, np.nan, numerator / denominator)
+
+
+def _rsi(gain, loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+
+
+def _directional(state):
+    """+DI and -DI from the smoothed directional movement and true range."""
+    return 100 * _ratio(state["pdm"], state["atr"]), 100 * _ratio(
+        state["ndm"], state["atr"]
+    )
+
+
+def _step(state: dict, high, low, close):
+    """Advance the recursive indicators of all symbols by one bar.
+
+    Inputs are arrays with one value per symbol. NaN marks a symbol without
+    a bar at this step, its state is left unchanged.
+    """
+    valid = ~np.isnan(close)
+    first = np.isnan(state["close"])
+    prev_close = np.where(first, close, state["close"])
+    new = {}
+
+    # RSI and DI of the previous bar, for the [1] values of the signals
+    new["rsi_prev"] = _rsi(state["rsi_gain"], state["rsi_loss"])
+    new["pdi_prev"], new["ndi_prev"] = _directional(state)
+
+    change = close - prev_close
+    new["rsi_gain"] = np.where(
+        first, np.nan, _ema(state["rsi_gain"], np.maximum(change, 0), 1 / 14)
+    )
+    new["rsi_loss"] = np.where(
+        first, np.nan, _ema(state["rsi_loss"], np.maximum(-change, 0), 1 / 14)
+    )
+
+    true_range = np.maximum(
+        high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    up = np.where(first, 0.0, high - state["high"])
+    down = np.where(first, 0.0, state["low"] - low)
+    new["atr"] = _ema(state["atr"], true_range, 1 / 14)
+    new["pdm"] = _ema(state["pdm"], np.where((up > down) & (up > 0), up, 0.0), 1 / 14)
+    new["ndm"] = _ema(
+        state["ndm"], np.where((down > up) & (down > 0), down, 0.0), 1 / 14
+    )
+    pdi, ndi = _directional(new)
+    dx = 100 * _ratio(np.abs(pdi - ndi), pdi + ndi)
+    new["adx"] = np.where(np.isnan(dx), state["adx"], _ema(state["adx"], dx, 1 / 14))
+
+    new["macd_fast"] = _ema(state["macd_fast"], close, 2 / 13)
+    new["macd_slow"] = _ema(state["macd_slow"], close, 2 / 27)
+    new["macd_signal"] = _ema(
+        state["macd_signal"], new["macd_fast"] - new["macd_slow"], 2 / 10
+    )
+    for period in MA_PERIODS:
+        name = f"ema{period}"
+        new[name] = _ema(state[name], close, 2 / (period + 1))
+    new["close"], new["high"], new["low"] = close, high, low
+
+    for name, value in new.items():
+        state[name] = np.where(valid, value, state[name])
+
+
+def _padded(columns: list, rows: int) -> np.ndarray:
+    """Stack 1-d arrays as columns, aligned on their last value and NaN padded on top."""
+    matrix = np.full((rows, len(columns)), np.nan)
+    for i, column in enumerate(columns):
+        if len(column):
+            matrix[-len(column) :, i] = column[-rows:]
+    return matrix
+
+
+def _window_indicators(high, low, close) -> dict:
+    """Indicators which only depend on the last bars, for (bars, symbols) matrices."""
+
+    def windows(values, length, count):
+        # The last ``count`` windows of ``length`` bars, newest last
+        return sliding_window_view(values[-(length + count - 1) :], length, axis=0)
+
+    values = {}
+    for period in MA_PERIODS:
+        values[f"SMA{period}"] = close[-period:].mean(axis=0)
+
+    deviation = close[-20:].std(axis=0)
+    values["BB.upper"] = values["SMA20"] + 2 * deviation
+    values["BB.lower"] = values["SMA20"] - 2 * deviation
+
+    # Stochastic %K(14) smoothed over 3 bars and %D over 3 more, for two bars
+    highest = windows(high, 14, 6).max(axis=-1)
+    lowest = windows(low, 14, 6).min(axis=-1)
+    raw_k = 100 * _ratio(close[-6:] - lowest, highest - lowest)
+    k = windows(raw_k, 3, 4).mean(axis=-1)
+    d = windows(k, 3, 2).mean(axis=-1)
+    values["Stoch.K"], values["Stoch.K[1]"] = k[-1], k[-2]
+    values["Stoch.D"], values["Stoch.D[1]"] = d[-1], d[-2]
+
+    williams = -100 * _ratio(highest[-2:] - close[-2:], highest[-2:] - lowest[-2:])
+    values["W.R"], values["W.R[1]"] = williams[-1], williams[-2]
+
+    typical = (high + low + close) / 3
+    typical_windows = windows(typical, 20, 2)
+    mean = typical_windows.mean(axis=-1)
+    mean_deviation = np.abs(typical_windows - mean[..., None]).mean(axis=-1)
+    cci = _ratio(typical[-2:] - mean, 0.015 * mean_deviation)
+    values["CCI20"], values["CCI20[1]"] = cci[-1], cci[-2]
+
+    median = (high + low) / 2
+    ao = windows(median, 5, 3).mean(axis=-1) - windows(median, 34, 3).mean(axis=-1)
+    values["AO"], values["AO[1]"], values["AO[2]"] = ao[-1], ao[-2], ao[-3]
+
+    values["Mom"] = close[-1] - close[-11]
+    values["Mom[1]"] = close[-2] - close[-12]
+    values["change"] = 100 * _ratio(close[-1] - close[-2], close[-2])
+    return values
+
+
+def _williams_signal(value, previous):
+    if value < -80 and value > previous:
+        return Recommendation.buy
+    if value > -20 and value < previous:
+        return Recommendation.sell
+    return Recommendation.neutral
+
+
+def _rating(signals: dict) -> dict:
+    """Count the signals and rate them like TradingView's recommendation."""
+    counts = {
+        rating: sum(signal == rating for signal in signals.values())
+        for rating in (Recommendation.buy, Recommendation.sell, Recommendation.neutral)
+    }
+    total = sum(counts.values())
+    score = (counts["BUY"] - counts["SELL"]) / total if total else 0.0
+    return {
+        "RECOMMENDATION": Compute.Recommend(score),
+        **counts,
+        "COMPUTE": signals,
+        "score": score,
+    }
+
+
+def _analysis(symbol: str, interval: str, last_bar, indicators: dict) -> dict:
+    """Format the indicator values of one symbol like the TradingView analysis dict."""
+    i = indicators
+    oscillators = {
+        "RSI": Compute.RSI(i["RSI"], i["RSI[1]"]),
+        "STOCH.K": Compute.Stoch(
+            i["Stoch.K"], i["Stoch.D"], i["Stoch.K[1]"], i["Stoch.D[1]"]
+        ),
+        "CCI": Compute.CCI20(i["CCI20"], i["CCI20[1]"]),
+        "ADX": Compute.ADX(
+            i["ADX"], i["ADX+DI"], i["ADX-DI"], i["ADX+DI[1]"], i["ADX-DI[1]"]
+        ),
+        "AO": Compute.AO(i["AO"], i["AO[1]"], i["AO[2]"]),
+        "Mom": Compute.Mom(i["Mom"], i["Mom[1]"]),
+        "MACD": Compute.MACD(i["MACD.macd"], i["MACD.signal"]),
+        "W%R": _williams_signal(i["W.R"], i["W.R[1]"]),
+    }
+    moving_averages = {}
+    for period in MA_PERIODS:
+        moving_averages[f"EMA{period}"] = Compute.MA(i[f"EMA{period}"], i["close"])
+        moving_averages[f"SMA{period}"] = Compute.MA(i[f"SMA{period}"], i["close"])
+
+    oscillator_rating = _rating(oscillators)
+    ma_rating = _rating(moving_averages)
+    summary_score = (oscillator_rating.pop("score") + ma_rating.pop("score")) / 2
+    summary = {
+        "RECOMMENDATION": Compute.Recommend(summary_score),
+        **{
+            rating: oscillator_rating[rating] + ma_rating[rating]
+            for rating in ("BUY", "SELL", "NEUTRAL")
+        },
+    }
+    return {
+        "Symbol": symbol,
+        "Source": "local",
+        "Interval": interval,
+        "Time": last_bar.strftime("%Y-%m-%d %H:%M:%S"),
+        "Summary": summary,
+        "Oscillators": oscillator_rating,
+        "Moving Averages": ma_rating,
+        "Indicators": {
+            name: None if np.isnan(value) else round(value, 6)
+            for name, value in indicators.items()
+        },
+    }
+
+
+def _prices(frame) -> np.ndarray:
+    """High, Low and Close as the columns of one array.
+
+    Selecting the columns by position on the array is several times faster
+    than pandas column indexing, which adds up over thousands of symbols.
+    """
+    columns = list(frame.columns)
+    return frame.to_numpy(float)[
+        :, [columns.index(c) for c in ("High", "Low", "Close")]
+    ]
+
+
+class IndicatorEngine:
+    """Technical indicators computed locally from OHLC bars.
+
+    Recursive indicators (EMAs, MACD, RSI, ATR and ADX) keep their state per
+    symbol and interval and only advance over the bars added since the last
+    call, while window indicators (SMAs, Bollinger bands, Stochastic, CCI,
+    ...) are read from the last ``TAIL_BARS`` bars. All symbols of a call are
+    updated together as NumPy arrays, one step per bar.
+
+    The last bar may still be forming, so the kept state stops one bar short
+    and the last bar is applied to a copy on every call.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+        self.full_updates = 0
+        self.incremental_updates = 0
+        self.bars_processed = 0
+
+    def _start(self, key: tuple, index, close) -> tuple[dict, int]:
+        """The state of a symbol and the position of its first unseen bar.
+
+        The state is reset when its last bar is gone or its close changed: a
+        split or dividend rescales the cached prices.
+        """
+        state = self._states.get(key)
+        if state is not None:
+            position = index.searchsorted(state["last_bar"])
+            if (
+                position < len(index)
+                and index[position] == state["last_bar"]
+                and abs(close[position] / state["close"] - 1) < 1e-9
+            ):
+                self.incremental_updates += 1
+                return state, position + 1
+
+        self.full_updates += 1
+        state = {name: np.nan for name in STATE_FIELDS}
+        return state, max(len(index) - WARMUP_BARS, 0)
+
+    def analyze(self, symbols: list[str]) -> dict:
+        """Compute the daily indicators of several symbols from the returns store.
+
+        Returns:
+            dict: "Results" with the analysis of each symbol in the TradingView
+            dict shape and "Errors" for symbols without price data.
+        """
+        errors = {}
+        frames = store.bars_many(symbols, errors)
+        return {"Results": self.analyze_bars(frames, "1d"), "Errors": errors}
+
+    def analyze_bars(self, frames: dict, interval: str) -> dict:
+        """Compute the indicators of OHLC frames of one interval, keyed by symbol.
+
+        Returns:
+            dict: The analysis of each symbol with at least one bar.
+        """
+        frames = {symbol: frame for symbol, frame in frames.items() if len(frame)}
+        if not frames:
+            return {}
+        names = list(frames)
+        prices = [_prices(frames[symbol]) for symbol in names]
+
+        with self._lock:
+            states, starts = zip(
+                *(
+                    self._start((symbol, interval), frames[symbol].index, values[:, 2])
+                    for symbol, values in zip(names, prices)
+                )
+            )
+
+            state = {
+                name: np.array([s[name] for s in states], dtype=float)
+                for name in STATE_FIELDS
+            }
+            new_bars = [values[start:-1] for values, start in zip(prices, starts)]
+            steps = max(len(bars) for bars in new_bars)
+            matrices = [
+                _padded([bars[:, column] for bars in new_bars], steps)
+                for column in range(3)
+            ]
+            for high, low, close in zip(*matrices):
+                _step(state, high, low, close)
+            self.bars_processed += sum(len(bars) for bars in new_bars)
+
+            for i, symbol in enumerate(names):
+                if len(prices[i]) > 1:
+                    self._states[symbol, interval] = {
+                        "last_bar": frames[symbol].index[-2],
+                        **{name: float(state[name][i]) for name in STATE_FIELDS},
+                    }
+
+        last = np.array([values[-1] for values in prices])
+        _step(state, last[:, 0], last[:, 1], last[:, 2])
+
+        tails = [
+            _padded([values[:, column] for values in prices], TAIL_BARS)
+            for column in range(3)
+        ]
+        values = _window_indicators(*tails)
+        values["close"] = tails[2][-1]
+        values["high"], values["low"] = tails[0][-1], tails[1][-1]
+        values["RSI"] = _rsi(state["rsi_gain"], state["rsi_loss"])
+        values["RSI[1]"] = state["rsi_prev"]
+        values["ADX"] = state["adx"]
+        values["ADX+DI"], values["ADX-DI"] = _directional(state)
+        values["ADX+DI[1]"], values["ADX-DI[1]"] = state["pdi_prev"], state["ndi_prev"]
+        values["ATR"] = state["atr"]
+        values["MACD.macd"] = state["macd_fast"] - state["macd_slow"]
+        values["MACD.signal"] = state["macd_signal"]
+        for period in MA_PERIODS:
+            values[f"EMA{period}"] = state[f"ema{period}"]
+        values = {name: value.tolist() for name, value in values.items()}
+
+        return {
+            symbol: _analysis(
+                symbol,
+                interval,
+                frames[symbol].index[-1],
+                {name: value[i] for name, value in values.items()},
+            )
+            for i, symbol in enumerate(names)
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "states": len(self._states),
+                "full_updates": self.full_updates,
+                "incremental_updates": self.incremental_updates,
+                "bars_processed": self.bars_processed,
+            }
+
+
+indicator_engine = IndicatorEngine()
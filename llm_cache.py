@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# SQLite file with cached LLM responses shared by the agents and the mail sorter,
+# and the size it is trimmed to (least recently used responses are dropped first).
+# Read here rather than from config, so the mail sorter does not import the
+# StockLens settings and their TradingView dependency.
+LLM_CACHE_DB = os.getenv(
+    "STOCKLENS_LLM_CACHE_DB",
+    str(Path(os.getenv("STOCKLENS_CACHE_DIR", ".cache")) / "llm_cache.sqlite"),
+)
+LLM_CACHE_MAX_BYTES = int(os.getenv("STOCKLENS_LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+_bypass = ContextVar("llm_cache_bypass", default=False)
+# Runs of whitespace, also inside JSON encoded strings ("\n", "\t")
+_WHITESPACE = re.compile(r"(?:\s|\\[nrt])+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so prompts differing only in layout share an entry."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@contextmanager
+def bypass_cache():
+    """Send the LLM calls made inside the block to the model, without the cache.
+
+    The responses are not stored either. Works for threads and asyncio tasks.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class LLMCache:
+    """SQLite cache of LLM responses shared by all models and processes.
+
+    Entries are keyed by the model id, the call parameters and a hash of the
+    normalized prompt. Each entry stores the tokens and seconds the original
+    call took, so hits report what they saved. Once the file grows past
+    ``max_bytes``, the least recently used responses are deleted.
+    """
+
+    def __init__(self, path=LLM_CACHE_DB, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.counts = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "saved_input_tokens": 0,
+            "saved_output_tokens": 0,
+            "saved_seconds": 0.0,
+        }
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, size INTEGER NOT NULL, input_tokens INTEGER, "
+                "output_tokens INTEGER, seconds REAL, last_used REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    @staticmethod
+    def key(model_id: str, params: dict, prompt: str) -> str:
+        """Cache key of a call, the prompt is normalized before hashing."""
+        prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode()).hexdigest()
+        params = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(
+            f"{model_id}\0{params}\0{prompt_hash}".encode()
+        ).hexdigest()
+
+    @property
+    def bypassed(self) -> bool:
+        return _bypass.get()
+
+    def get(self, key: str):
+        """Get the cached response text for the key, or None."""
+        if self.bypassed:
+            with self._lock:
+                self.counts["bypassed"] += 1
+            return None
+
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT value, input_tokens, output_tokens, seconds FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+
+        with self._lock:
+            if row is None:
+                self.counts["misses"] += 1
+                return None
+            self.counts["hits"] += 1
+            self.counts["saved_input_tokens"] += row[1] or 0
+            self.counts["saved_output_tokens"] += row[2] or 0
+            self.counts["saved_seconds"] += row[3] or 0.0
+        return row[0]
+
+    def set(
+        self,
+        key: str,
+        value: str,
+        input_tokens: int = None,
+        output_tokens: int = None,
+        seconds: float = None,
+    ):
+        """Store a response with the tokens and seconds its call took."""
+        if self.bypassed:
+            return
+        size = len(key) + len(value.encode())
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, value, size, input_tokens, output_tokens, seconds, time.time()),
+            )
+            self._evict(db)
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so eviction does not run again on the next insert
+        excess = total - self.max_bytes * 0.9
+        evicted = []
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY last_used"
+        ):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        with self._lock:
+            self.counts["evictions"] += len(evicted)
+
+    def clear(self):
+        with self._connect() as db:
+            db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._connect() as db:
+            entries, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        with self._lock:
+            lookups = self.counts["hits"] + self.counts["misses"]
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                **self.counts,
+                "saved_seconds": round(self.counts["saved_seconds"], 3),
+                "hit_rate": (
+                    round(self.counts["hits"] / lookups, 4) if lookups else None
+                ),
+            }
+
+
+def langchain_cache(cache: LLMCache = None):
+    """Create a LangChain cache backed by the LLM cache, e.g. ``ChatOllama(cache=...)``."""
+    from langchain_core.caches import BaseCache
+    from langchain_core.messages import message_to_dict, messages_from_dict
+    from langchain_core.outputs import ChatGeneration, Generation
+
+    cache = cache or llm_cache
+
+    def dump(generations) -> str:
+        return json.dumps(
+            [
+                (
+                    {"message": message_to_dict(generation.message)}
+                    if isinstance(generation, ChatGeneration)
+                    else {"text": generation.text}
+                )
+                | {"generation_info": generation.generation_info}
+                for generation in generations
+            ],
+            default=str,
+        )
+
+    def load(value: str) -> list:
+        return [
+            (
+                ChatGeneration(
+                    message=messages_from_dict([item["message"]])[0],
+                    generation_info=item["generation_info"],
+                )
+                if "message" in item
+                else Generation(
+                    text=item["text"], generation_info=item["generation_info"]
+                )
+            )
+            for item in json.loads(value)
+        ]
+
+    class LangChainLLMCache(BaseCache):
+        def __init__(self):
+            self._started = {}
+            self._lock = threading.Lock()
+
+        def _key(self, prompt: str, llm_string: str) -> str:
+            # llm_string holds the model name and all invocation parameters
+            return cache.key(llm_string, {}, prompt)
+
+        def lookup(self, prompt: str, llm_string: str):
+            key = self._key(prompt, llm_string)
+            value = cache.get(key)
+            if value is not None:
+                return load(value)
+            with self._lock:
+                # A miss is followed by update(), which records the call's latency
+                if len(self._started) > 1000:
+                    self._started.clear()
+                self._started[key] = time.perf_counter()
+            return None
+
+        def update(self, prompt: str, llm_string: str, return_val):
+            key = self._key(prompt, llm_string)
+            with self._lock:
+                started = self._started.pop(key, None)
+            input_tokens = output_tokens = 0
+            for generation in return_val:
+                usage = getattr(
+                    getattr(generation, "message", None), "usage_metadata", None
+                )
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+            cache.set(
+                key,
+                dump(return_val),
+                input_tokens,
+                output_tokens,
+                time.perf_counter() - started if started else None,
+            )
+
+        def clear(self, **kwargs):
+            cache.clear()
+
+    return LangChainLLMCache()
+
+
+class CachedModel:
+    """Wrap a smolagents model (LiteLLMModel, InferenceClientModel, ...) with the LLM cache.
+
+    Only ``generate`` is cached, streaming calls go to the model unchanged.
+    Cached responses report zero token usage, since no tokens were spent.
+    """
+
+    def __init__(self, model, cache: LLMCache = None):
+        self._model = model
+        self._cache = cache or llm_cache
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def generate(
+        self,
+        messages,
+        stop_sequences=None,
+        response_format=None,
+        tools_to_call_from=None,
+        **kwargs,
+    ):
+        from smolagents.models import ChatMessage
+        from smolagents.monitoring import TokenUsage
+
+        model = self._model
+        params = {
+            "class": type(model).__name__,
+            "stop_sequences": stop_sequences,
+            "response_format": response_format,
+            "tools": [tool.name for tool in tools_to_call_from or []],
+            **getattr(model, "kwargs", {}),
+            **kwargs,
+        }
+        prompt = json.dumps(
+            [m.dict() if hasattr(m, "dict") else m for m in messages], default=str
+        )
+        key = self._cache.key(getattr(model, "model_id", ""), params, prompt)
+
+        value = self._cache.get(key)
+        if value is not None:
+            message = ChatMessage.from_dict(json.loads(value))
+            message.token_usage = TokenUsage(input_tokens=0, output_tokens=0)
+            return message
+
+        start = time.perf_counter()
+        message = model.generate(
+            messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            **kwargs,
+        )
+        usage = message.token_usage
+        self._cache.set(
+            key,
+            json.dumps(message.dict(), default=str),
+            usage.input_tokens if usage else None,
+            usage.output_tokens if usage else None,
+            time.perf_counter() - start,
+        )
+        return message
+
+    def __call__(self, *args, **kwargs):
+        return self.generate(*args, **kwargs)
+
+
+llm_cache = LLMCache(LLM_CACHE_DB, LLM_CACHE_MAX_BYTES)
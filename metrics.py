@@ -0,0 +1,84 @@
+import numpy as np
+
+METRICS = [
+    "CAGR",
+    "Sharpe",
+    "Sortino",
+    "Max Drawdown",
+    "Volatility",
+    "Beta",
+    "Alpha",
+]
+
+
+def compute_metrics(returns, benchmark, periods: int = 252) -> dict[str, np.ndarray]:
+    """Compute performance metrics for many return series against one benchmark in a single pass.
+
+    The definitions follow quantstats (``qs.stats.cagr``, ``sharpe``, ``sortino``,
+    ``max_drawdown``, ``volatility`` and ``greeks``) with a zero risk-free rate,
+    so the values match ``qs.reports.metrics`` for the same aligned returns.
+
+    Args:
+        returns (np.ndarray): (days, symbols) array of aligned daily returns.
+        benchmark (np.ndarray): (days,) array of benchmark daily returns on the same days.
+        periods (int): Trading periods per year used for annualization.
+
+    Returns:
+        dict: Metric name to an array with one value per symbol.
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    if r.ndim == 1:
+        r = r[:, None]
+    b = np.asarray(benchmark, dtype=np.float64)
+    days = r.shape[0]
+    annualize = np.sqrt(periods)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = r.mean(axis=0)
+        std = r.std(axis=0, ddof=1)
+
+        wealth = np.prod(1 + r, axis=0)
+        cagr = np.where(wealth < 0, np.nan, np.abs(wealth) ** (periods / days) - 1)
+
+        downside = np.sqrt((np.minimum(r, 0) ** 2).sum(axis=0) / days)
+        sortino = mean / np.where(downside == 0, np.nan, downside) * annualize
+
+        # Drawdowns are measured from a starting equity of 1, as in quantstats
+        equity = np.cumprod(1 + r, axis=0)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=0), 1.0)
+        max_drawdown = np.minimum((equity / peak).min(axis=0), 1.0) - 1
+
+        centered = b - b.mean()
+        benchmark_var = centered @ centered / (days - 1)
+        covariance = (r - mean).T @ centered / (days - 1)
+        beta = covariance / benchmark_var if benchmark_var else np.zeros_like(mean)
+        alpha = (mean - beta * b.mean()) * periods
+
+        return {
+            "CAGR": cagr,
+            "Sharpe": mean / std * annualize,
+            "Sortino": sortino,
+            "Max Drawdown": max_drawdown,
+            "Volatility": std * annualize,
+            "Beta": beta,
+            "Alpha": alpha,
+        }
+
+
+def metrics_table(returns, benchmark, periods: int = 252) -> dict[str, dict]:
+    """Compute the metrics of a returns DataFrame and benchmark Series as a JSON friendly dict.
+
+    Returns:
+        dict: Symbol to {metric name: value}, including a row for the benchmark itself.
+    """
+    columns = list(returns.columns) + [benchmark.name]
+    values = np.column_stack([returns.to_numpy(), benchmark.to_numpy()])
+    metrics = compute_metrics(values, benchmark.to_numpy(), periods)
+
+    return {
+        column: {
+            name: None if np.isnan(metrics[name][i]) else round(float(metrics[name][i]), 6)
+            for name in METRICS
+        }
+        for i, column in enumerate(columns)
+    }
@@ -0,0 +1,106 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from config import RENDER_POOL_SIZE, RENDER_QUEUE_DEPTH, RENDER_TIMEOUT
+
+
+class RenderPoolBusy(Exception):
+    """Raised when the render queue is full and a job is rejected."""
+
+
+def _warm_worker():
+    """Import the plotting stack once per worker so jobs do not pay for it."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    import matplotlib.pyplot  # noqa: F401
+    import quantstats as qs
+
+    import reports  # noqa: F401
+
+    qs.extend_pandas()
+
+
+def _ping():
+    return True
+
+
+class RenderPool:
+    """Process pool for the CPU bound quantstats report and snapshot rendering.
+
+    Rendering holds the GIL for seconds, so it runs in warm worker processes
+    instead of the Gradio worker threads. At most ``size + max_queue`` jobs are
+    accepted at once; further jobs are rejected with RenderPoolBusy instead of
+    piling up, and callers give up on a job after ``timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        size: int = RENDER_POOL_SIZE,
+        timeout: float = RENDER_TIMEOUT,
+        max_queue: int = RENDER_QUEUE_DEPTH,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(size + max_queue)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.timed_out = 0
+
+    def start(self):
+        """Start the worker processes and wait until each one is warm."""
+        with self._lock:
+            if self._executor is not None:
+                return
+            # Workers are forked from a single-threaded fork server which has the
+            # plotting stack preloaded, instead of from the threaded Gradio process
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["reports"])
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=context,
+                initializer=_warm_worker,
+            )
+        for future in [self._executor.submit(_ping) for _ in range(self.size)]:
+            future.result()
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` in a worker process and return its result.
+
+        Raises:
+            RenderPoolBusy: The queue already holds ``size + max_queue`` jobs.
+            TimeoutError: The job did not finish within the timeout.
+        """
+        self.start()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise RenderPoolBusy("The report renderer is busy, please try again shortly.")
+
+        future = self._executor.submit(fn, *args)
+        # The slot is held until the job really finishes, even after a timeout
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise TimeoutError(f"Rendering did not finish within {self.timeout} seconds.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+render_pool = RenderPool(RENDER_POOL_SIZE, RENDER_TIMEOUT, RENDER_QUEUE_DEPTH)
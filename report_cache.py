@@ -0,0 +1,146 @@
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from config import REPORT_CACHE_MAX_BYTES
+from returns_store import normalize_symbol, store
+
+
+class ReportCache:
+    """Size bounded LRU cache of rendered reports.
+
+    Entries are zlib compressed and keyed by the report kind, the input
+    symbols and the last bar date of every input series, so a report is
+    reused until a new bar arrives. When the price history of the inputs is
+    due for a refresh, the most recent report for the same inputs is served
+    while a new one is rendered in the background.
+    """
+
+    def __init__(self, max_bytes: int = REPORT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._latest = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="report-refresh"
+        )
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(self, kind: str, symbols: list[str], render) -> bytes:
+        """Get the cached report for the symbols or render it with ``render()``.
+
+        Args:
+            kind(str): Report type, e.g. "comparison" or "snapshot".
+            symbols(list[str]): Input symbols of the report, in order.
+            render(callable): Returns the rendered report as bytes.
+        """
+        symbols = [normalize_symbol(symbol) for symbol in symbols]
+        value = self.cached(kind, symbols, render)
+        if value is not None:
+            return value
+
+        with self._lock:
+            self.misses += 1
+        return self._render((kind, *symbols), render)
+
+    def cached(self, kind: str, symbols: list[str], render):
+        """Get the cached report for the symbols without rendering, or None.
+
+        A stale report is returned as well, and ``render()`` is scheduled in the
+        background to replace it. That includes a report older than the last
+        bar, when another request refreshed the price history first.
+        """
+        inputs = (kind, *(normalize_symbol(symbol) for symbol in symbols))
+        if all(store.is_fresh(symbol) for symbol in symbols):
+            value = self._get(self._key(inputs))
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            key = self._latest.get(inputs)
+        value = self._get(key) if key else None
+        if value is not None:
+            with self._lock:
+                self.stale_hits += 1
+            self._refresh(inputs, render)
+        return value
+
+    def _key(self, inputs: tuple) -> tuple:
+        return inputs + tuple(store.last_bar(symbol) for symbol in inputs[1:])
+
+    def _render(self, inputs: tuple, render) -> bytes:
+        value = render()
+        # Rendering fetched the inputs, so their last bar dates are current
+        self._put(self._key(inputs), inputs, value)
+        return value
+
+    def _refresh(self, inputs: tuple, render):
+        with self._lock:
+            if inputs in self._refreshing:
+                return
+            self._refreshing.add(inputs)
+
+        def run():
+            try:
+                self._render(inputs, render)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(inputs)
+
+        self._refresh_pool.submit(run)
+
+    def _get(self, key: tuple):
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is None:
+                return None
+            self._entries.move_to_end(key)
+        return zlib.decompress(compressed)
+
+    def _put(self, key: tuple, inputs: tuple, value: bytes):
+        compressed = zlib.compress(value, 6)
+        if len(compressed) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = compressed
+            self._latest[inputs] = key
+            self.size += len(compressed)
+
+            while self.size > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self.size -= len(old_value)
+                self.evictions += 1
+                # Keys are the inputs followed by one last bar date per symbol
+                old_inputs = old_key[: (len(old_key) + 1) // 2]
+                if self._latest.get(old_inputs) == old_key:
+                    del self._latest[old_inputs]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (
+                    round((self.hits + self.stale_hits) / lookups, 4) if lookups else None
+                ),
+            }
+
+
+report_cache = ReportCache(REPORT_CACHE_MAX_BYTES)
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+import quantstats as qs
+
+from config import REPORT_FILES_MAX, REPORT_FILES_MAX_AGE
+
+REPORT_DIR = Path(tempfile.gettempdir()) / "stocklens-reports"
+
+
+def _memory_file():
+    """Anonymous file for quantstats to write into, memory backed where supported."""
+    if hasattr(os, "memfd_create"):
+        return os.fdopen(os.memfd_create("stocklens-report"), "w+b")
+    return tempfile.TemporaryFile()
+
+
+def render_comparison_html(returns, benchmark, strategy_title, benchmark_title) -> str:
+    """Render the quantstats HTML report in memory and return its content.
+
+    ``qs.reports.html`` only writes to a file, so it is handed a duplicate
+    descriptor of an anonymous file and the content is read back from memory.
+    Nothing is written to a shared path, so concurrent renders cannot collide.
+    """
+    with _memory_file() as buf:
+        qs.reports.html(
+            returns,
+            benchmark=benchmark,
+            benchmark_title=benchmark_title,
+            output=os.dup(buf.fileno()),
+            strategy_title=strategy_title,
+            title="Detailed Comparison",
+        )
+        buf.seek(0)
+        return buf.read().decode("utf-8")
+
+
+def render_snapshot_png(returns) -> bytes:
+    """Render the quantstats performance snapshot and return it as PNG bytes."""
+    snapshot_buf = BytesIO()
+    qs.plots.snapshot(returns, title="Performance", savefig=snapshot_buf)
+    return snapshot_buf.getvalue()
+
+
+def report_file(content: str) -> str:
+    """Get a download path for the report content.
+
+    Files are named by the hash of their content, so identical reports share
+    one file and no request can overwrite another's report.
+    """
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:24]
+    path = REPORT_DIR / f"report-{digest}.html"
+
+    if path.exists():
+        path.touch()
+    else:
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        tmp_path.replace(path)
+
+    _evict_report_files(keep=path)
+    return str(path)
+
+
+def _evict_report_files(keep: Path):
+    """Remove report files older than the max age and the least recently used beyond the max count."""
+    files = []
+    for path in REPORT_DIR.glob("report-*.html"):
+        try:
+            files.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    files.sort(reverse=True)
+
+    cutoff = time.time() - REPORT_FILES_MAX_AGE
+    for index, (mtime, path) in enumerate(files):
+        if path != keep and (index >= REPORT_FILES_MAX or mtime < cutoff):
+            path.unlink(missing_ok=True)
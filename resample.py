@@ -0,0 +1,208 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from config import INTRADAY_CACHE_SIZE, SESSIONS, interval_ttl
+from returns_store import PRICE_COLUMNS, normalize_symbol, store
+from singleflight import singleflight
+from ta_cache import TTLCache
+
+OHLCV_COLUMNS = PRICE_COLUMNS + ["Volume"]
+
+# Minutes per bar of the intraday intervals, daily and longer bars are
+# derived from the cached daily history instead
+INTRADAY_MINUTES = {
+    "1m": 1,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "2h": 120,
+    "4h": 240,
+}
+DAILY_INTERVALS = ["1d", "1W", "1M"]
+
+# yfinance intervals intraday bars are derived from, with the longest period
+# yfinance serves for each of them
+BASE_INTERVALS = {1: ("1m", "7d"), 5: ("5m", "60d"), 15: ("15m", "60d")}
+BASE_INTERVALS.update({30: ("30m", "60d"), 60: ("1h", "730d")})
+
+
+def base_minutes(intervals: list[str]):
+    """The coarsest yfinance interval all requested intraday intervals can be built from.
+
+    Coarser base bars reach further back, e.g. 1h and 4h are both built from
+    two years of 1h bars. None when no intraday interval is requested.
+    """
+    minutes = [INTRADAY_MINUTES[i] for i in intervals if i in INTRADAY_MINUTES]
+    if not minutes:
+        return None
+    return max(base for base in BASE_INTERVALS if all(m % base == 0 for m in minutes))
+
+
+def _minutes(clock: str) -> int:
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def aggregate(frame: pd.DataFrame, keys: np.ndarray, labels) -> pd.DataFrame:
+    """Aggregate consecutive bars with the same key into one OHLCV bar.
+
+    Args:
+        frame(pd.DataFrame): Time sorted OHLCV bars.
+        keys(np.ndarray): Bin of every bar, equal keys must be consecutive.
+        labels: Timestamp of every bar's bin, the first of each bin labels the result.
+    """
+    if not len(frame):
+        return frame[OHLCV_COLUMNS].iloc[0:0]
+    values = frame[OHLCV_COLUMNS].to_numpy(float)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    return pd.DataFrame(
+        {
+            "Open": values[starts, 0],
+            "High": np.maximum.reduceat(values[:, 1], starts),
+            "Low": np.minimum.reduceat(values[:, 2], starts),
+            "Close": values[ends, 3],
+            "Volume": np.add.reduceat(np.nan_to_num(values[:, 4]), starts),
+        },
+        index=labels[starts],
+    )
+
+
+def resample_intraday(bars: pd.DataFrame, interval: str, screener: str):
+    """Build intraday bars of ``interval`` from finer bars, within the exchange session.
+
+    Bins start at the session open, so for a 9:30 open the 1h bars start at
+    9:30, 10:30, ... and the last bin of the day is cut at the close. Bars
+    outside the session are dropped.
+    """
+    timezone, open_clock, close_clock = SESSIONS[screener]
+    width = INTRADAY_MINUTES[interval]
+    session_open, session_close = _minutes(open_clock), _minutes(close_clock)
+
+    index = bars.index if bars.index.tz else bars.index.tz_localize("UTC")
+    wall = index.tz_convert(timezone).tz_localize(None).to_numpy()
+    days = wall.astype("datetime64[D]")
+    minutes = (wall - days).astype("timedelta64[m]").astype(np.int64)
+    inside = (minutes >= session_open) & (minutes < session_close)
+    bars, days, minutes = bars[inside], days[inside], minutes[inside]
+
+    bins = (minutes - session_open) // width
+    keys = days.astype(np.int64) * 10000 + bins
+    labels = days + (session_open + bins * width).astype("timedelta64[m]")
+    labels = pd.DatetimeIndex(labels).tz_localize(timezone)
+    return aggregate(bars, keys, labels)
+
+
+def resample_daily(bars: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Build weekly (weeks starting Monday) or monthly bars from daily bars."""
+    dates = bars.index.to_numpy().astype("datetime64[D]")
+    if interval == "1d":
+        return bars[OHLCV_COLUMNS]
+    if interval == "1W":
+        # 1970-01-01 was a Thursday, shift by 3 days so weeks start on Monday
+        keys = (dates.astype(np.int64) + 3) // 7
+        labels = (keys * 7 - 3).astype("datetime64[D]")
+    elif interval == "1M":
+        keys = dates.astype("datetime64[M]").astype(np.int64)
+        labels = keys.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        raise ValueError(f"Unsupported interval {interval}")
+    return aggregate(bars, keys, pd.DatetimeIndex(labels))
+
+
+class Resampler:
+    """Bars of several intervals for a symbol from at most two price histories.
+
+    Intraday intervals are built from a single yfinance download of the
+    coarsest base interval that divides all of them, cached in memory for
+    the TTL of that interval. Daily, weekly and monthly bars are built from
+    the daily history of the returns store.
+    """
+
+    def __init__(self, cache_size: int = INTRADAY_CACHE_SIZE):
+        self._cache = TTLCache(cache_size)
+        self._lock = threading.Lock()
+        self.counts = {"fetches": 0, "derived": 0}
+
+    def intraday(self, symbol: str, minutes: int) -> pd.DataFrame:
+        """Intraday bars of the symbol at a base interval, in exchange time."""
+        interval, period = BASE_INTERVALS[minutes]
+        symbol = normalize_symbol(symbol)
+        key = f"intraday:{symbol}:{interval}"
+        bars = self._cache.get(key)
+        if bars is not None:
+            return bars
+        return singleflight.do(
+            ("yfinance", symbol, interval, period),
+            self._fetch,
+            key,
+            symbol,
+            interval,
+            period,
+        )
+
+    def _fetch(self, key: str, symbol: str, interval: str, period: str):
+        data = yf.download(
+            symbol,
+            period=period,
+            interval=interval,
+            auto_adjust=True,
+            group_by="ticker",
+            progress=False,
+        )
+        frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+        if frame.empty:
+            raise ValueError(f"No {interval} price data returned for {symbol}")
+        bars = frame[OHLCV_COLUMNS].dropna(subset=["Close"]).astype("float64")
+        with self._lock:
+            self.counts["fetches"] += 1
+        self._cache.set(key, bars, interval_ttl.get(interval, 60))
+        return bars
+
+    def bars(
+        self, symbol: str, intervals: list[str], screener: str = "america"
+    ) -> dict[str, pd.DataFrame]:
+        """Get the OHLCV bars of a symbol for each interval.
+
+        Args:
+            symbol(str): Ticker symbol in yfinance format (e.g., "AAPL", "TCS.NS").
+            intervals(list[str]): Intervals, any of ``INTRADAY_MINUTES`` and ``DAILY_INTERVALS``.
+            screener(str): Screener whose exchange session the intraday bins follow.
+        """
+        unknown = [
+            i
+            for i in intervals
+            if i not in INTRADAY_MINUTES and i not in DAILY_INTERVALS
+        ]
+        if unknown:
+            raise ValueError(f"Unsupported intervals: {', '.join(unknown)}")
+        if screener not in SESSIONS:
+            raise ValueError(f"No session hours configured for screener {screener}")
+
+        result = {}
+        minutes = base_minutes(intervals)
+        if minutes:
+            base = self.intraday(symbol, minutes)
+            for interval in intervals:
+                if interval in INTRADAY_MINUTES:
+                    result[interval] = resample_intraday(base, interval, screener)
+        if any(interval in DAILY_INTERVALS for interval in intervals):
+            daily = store.bars(symbol)
+            for interval in intervals:
+                if interval in DAILY_INTERVALS:
+                    result[interval] = resample_daily(daily, interval)
+
+        with self._lock:
+            self.counts["derived"] += len(result)
+        return {interval: result[interval] for interval in intervals}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counts, "intraday_cache": self._cache.stats()}
+
+
+resampler = Resampler()
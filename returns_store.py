@@ -0,0 +1,248 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import yfinance as yf
+
+from config import CACHE_DIR, RETURNS_MAX_AGE
+from singleflight import singleflight
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Yahoo symbols are upper case, and ``yf.download`` returns its columns that way."""
+    return symbol.strip().upper()
+
+
+class ReturnsStore:
+    """Parquet backed cache of daily OHLCV bars with per-symbol freshness metadata.
+
+    Each symbol is kept as ``<root>/<symbol>.parquet`` next to a ``<symbol>.json``
+    file recording when it was last fetched and the last bar it holds. Once the
+    metadata is older than ``max_age`` seconds only the bars since the last
+    cached date are downloaded and appended.
+    """
+
+    def __init__(self, root: Path, max_age: int = RETURNS_MAX_AGE):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._meta: dict[str, dict] = {}
+        self._locks = defaultdict(threading.Lock)
+
+    def _path(self, symbol: str, suffix: str) -> Path:
+        return self.root / f"{quote(symbol, safe='')}{suffix}"
+
+    def _load(self, symbol: str):
+        """Load the cached bars and metadata for the symbol into memory, if any."""
+        if symbol in self._frames:
+            return self._frames[symbol], self._meta[symbol]
+
+        data_path, meta_path = self._path(symbol, ".parquet"), self._path(symbol, ".json")
+        if not data_path.exists() or not meta_path.exists():
+            return None, None
+
+        frame = pd.read_parquet(data_path)
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        self._frames[symbol], self._meta[symbol] = frame, meta
+        return frame, meta
+
+    def _save(self, symbol: str, frame: pd.DataFrame):
+        meta = {
+            "symbol": symbol,
+            "fetched_at": time.time(),
+            "first_bar": frame.index[0].strftime("%Y-%m-%d"),
+            "last_bar": frame.index[-1].strftime("%Y-%m-%d"),
+            "rows": len(frame),
+        }
+        data_path, meta_path = self._path(symbol, ".parquet"), self._path(symbol, ".json")
+
+        # Write to temporary files first so readers never see a half written cache
+        frame.to_parquet(data_path.with_suffix(".tmp"))
+        data_path.with_suffix(".tmp").replace(data_path)
+        meta_path.with_suffix(".jtmp").write_text(json.dumps(meta), encoding="utf-8")
+        meta_path.with_suffix(".jtmp").replace(meta_path)
+
+        self._frames[symbol], self._meta[symbol] = frame, meta
+
+    def is_fresh(self, symbol: str) -> bool:
+        """Whether the cached bars for the symbol can be served without a download."""
+        _, meta = self._load(normalize_symbol(symbol))
+        return meta is not None and time.time() - meta["fetched_at"] < self.max_age
+
+    def last_bar(self, symbol: str):
+        """Date of the latest cached bar for the symbol, or None if nothing is cached."""
+        _, meta = self._load(normalize_symbol(symbol))
+        return meta["last_bar"] if meta else None
+
+    def bars(self, symbol: str) -> pd.DataFrame:
+        """Get the daily OHLCV bars for the symbol, fetching only missing bars."""
+        return self.bars_many([symbol])[symbol]
+
+    def returns(self, symbol: str) -> pd.Series:
+        """Get the daily returns for the symbol in the format of ``qs.utils.download_returns``."""
+        return self.returns_many([symbol])[symbol]
+
+    def returns_many(
+        self, symbols: list[str], errors: dict = None
+    ) -> dict[str, pd.Series]:
+        """Get the daily returns for several symbols with at most two grouped downloads.
+
+        Args:
+            symbols(list[str]): Ticker symbols.
+            errors(dict): See ``bars_many``.
+        """
+        return {
+            symbol: frame["Close"].pct_change(fill_method=None).fillna(0).rename(symbol)
+            for symbol, frame in self.bars_many(symbols, errors).items()
+        }
+
+    def aligned_returns(self, symbols: list[str]) -> pd.DataFrame:
+        """Get the daily returns of several symbols on the union of their trading days.
+
+        Exchanges trade on different calendars. Closes are forward filled over
+        the days a market is closed, so that day is a zero return and the next
+        trading day's return covers the whole gap. The dates start at the
+        latest first bar, so every symbol has a price from the first day.
+        """
+        closes = pd.concat(
+            {
+                symbol: frame["Close"]
+                for symbol, frame in self.bars_many(symbols).items()
+            },
+            axis=1,
+            sort=True,
+        )
+        start = max(closes[symbol].first_valid_index() for symbol in closes)
+        closes = closes[closes.index >= start].ffill()
+        return closes.pct_change(fill_method=None).fillna(0)
+
+    def bars_many(
+        self, symbols: list[str], errors: dict = None
+    ) -> dict[str, pd.DataFrame]:
+        """Get the daily OHLCV bars for several symbols.
+
+        Stale symbols are refreshed together: symbols never seen before in one
+        ``yf.download(period="max")`` call and cached ones in one call starting at
+        the oldest last cached bar. Concurrent requests for the same symbols
+        share one refresh. Symbols are matched case insensitively, the result
+        is keyed by the symbols as given.
+
+        Args:
+            symbols(list[str]): Ticker symbols.
+            errors(dict): If given, symbols without price data are left out of
+                the result and their error is added here. Otherwise the first
+                of them raises a ValueError.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        names = sorted({normalize_symbol(symbol) for symbol in symbols})
+        # The root keeps separate stores (e.g. in the benchmarks) apart
+        key = ("yfinance", tuple(names), "1d", str(self.root))
+        frames, failures = singleflight.do(key, self._refresh, names)
+
+        result = {}
+        for symbol in symbols:
+            name = normalize_symbol(symbol)
+            if name in frames:
+                result[symbol] = frames[name]
+            elif errors is None:
+                raise ValueError(failures[name])
+            else:
+                errors[symbol] = failures[name]
+        return result
+
+    def _refresh(self, symbols: list[str]) -> tuple[dict, dict]:
+        """Refresh the stale symbols, returning their frames and the errors of the failed ones."""
+        locks = [self._locks[symbol] for symbol in sorted(symbols)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            stale = [symbol for symbol in symbols if not self.is_fresh(symbol)]
+            missing = [symbol for symbol in stale if self.last_bar(symbol) is None]
+            cached = [symbol for symbol in stale if symbol not in missing]
+            errors = {}
+
+            if missing:
+                data = _download(missing, period="max")
+                for symbol in missing:
+                    try:
+                        self._save(symbol, _extract(data, symbol))
+                    except ValueError as e:
+                        errors[symbol] = str(e)
+            if cached:
+                start = min(self.last_bar(symbol) for symbol in cached)
+                data = _download(cached, start=start)
+                for symbol in cached:
+                    frame, _ = self._load(symbol)
+                    self._save(symbol, _splice(frame, _extract(data, symbol, frame)))
+
+            frames = {
+                symbol: self._frames[symbol]
+                for symbol in symbols
+                if symbol not in errors
+            }
+            return frames, errors
+        finally:
+            for lock in locks:
+                lock.release()
+
+
+def _download(symbols: list[str], **params) -> pd.DataFrame:
+    return yf.download(
+        symbols,
+        auto_adjust=True,
+        group_by="ticker",
+        progress=False,
+        threads=True,
+        **params,
+    )
+
+
+def _extract(data: pd.DataFrame, symbol: str, fallback: pd.DataFrame = None):
+    """Pull the bars of one symbol out of a grouped download."""
+    try:
+        frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+        frame = frame[PRICE_COLUMNS + ["Volume"]].dropna(subset=["Close"])
+    except KeyError:
+        frame = pd.DataFrame()
+
+    if frame.empty:
+        # Nothing new since the last cached bar (e.g. over a weekend)
+        if fallback is not None:
+            return fallback.iloc[0:0]
+        raise ValueError(f"No price data returned for {symbol}")
+
+    if frame.index.tz is not None:
+        frame = frame.tz_localize(None)
+    return frame.astype("float64")
+
+
+def _splice(cached: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Append newly downloaded bars to the cached history.
+
+    The download overlaps the last cached bar. Adjusted prices are rescaled
+    retroactively after splits and dividends, so when the overlapping close
+    differs the cached prices are scaled by the same factor to keep returns
+    continuous.
+    """
+    if new.empty:
+        return cached
+
+    overlap = new.index[0]
+    if overlap in cached.index and cached.at[overlap, "Close"]:
+        factor = new.at[overlap, "Close"] / cached.at[overlap, "Close"]
+        if abs(factor - 1) > 1e-9:
+            cached = cached.copy()
+            cached[PRICE_COLUMNS] *= factor
+
+    cached = cached[cached.index < overlap]
+    return pd.concat([cached, new])
+
+
+store = ReturnsStore(CACHE_DIR / "returns")
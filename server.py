@@ -1,11 +1,48 @@
-import gradio as gr
-from tradingview_ta import TA_Handler
-from config import SCREENER, interval_options
-import quantstats as qs
+from startup_timing import startup_report, timed
+
+with timed("import gradio"):
+    import gradio as gr
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+with timed("import tradingview_ta"):
+    from tradingview_ta import TA_Handler, get_multiple_analysis
+from config import (
+    SCREENER,
+    TA_BULK_CHUNK_SIZE,
+    TA_BULK_WORKERS,
+    interval_options,
+    interval_ttl,
+)
 from io import BytesIO
 from PIL import Image
+from render_pool import RenderPoolBusy, render_pool
+from singleflight import singleflight
+from ta_cache import ta_cache
+
+# pandas, yfinance and quantstats are imported on first use (or by warm_up)
+# so the app starts listening before the heavy scientific stack is loaded.
+
+# Shared pool so concurrent bulk requests stay within the TradingView request budget
+ta_pool = ThreadPoolExecutor(max_workers=TA_BULK_WORKERS, thread_name_prefix="ta-bulk")
+
+
+def _analysis_to_dict(analysis) -> dict:
+    return {
+        "Symbol": analysis.symbol,
+        "Exchange": analysis.exchange,
+        "Screener": analysis.screener,
+        "Interval": analysis.interval,
+        "Time": analysis.time.strftime("%Y-%m-%d %H:%M:%S"),
+        "Summary": analysis.summary,
+        "Oscillators": analysis.oscillators,
+        "Moving Averages": analysis.moving_averages,
+        "Indicators": analysis.indicators,
+    }
+
 
-qs.extend_pandas()
+def _ta_cache_key(screener: str, exchange: str, symbol: str, interval: str) -> str:
+    # Intervals are case sensitive ("1m" is one minute, "1M" one month)
+    return f"tradingview:{screener}:{exchange}:{symbol}".upper() + f":{interval}"
 
 
 def get_technical_analysis(
@@ -29,28 +66,236 @@ def get_technical_analysis(
         if country == None or country == "None":
             raise ValueError("Country is required!")
 
-        handler = TA_Handler(
-            symbol=symbol,
-            screener=country,
-            exchange=exchange,
+        key = _ta_cache_key(country, exchange, symbol, interval)
+        analysis_dict = ta_cache.get(key)
+        if analysis_dict is not None:
+            return analysis_dict
+
+        def fetch():
+            handler = TA_Handler(
+                symbol=symbol,
+                screener=country,
+                exchange=exchange,
+                interval=interval,
+            )
+            analysis = handler.get_analysis()
+            analysis_dict = _analysis_to_dict(analysis)
+            ta_cache.set(key, analysis_dict, interval_ttl.get(interval, 60))
+            return analysis_dict
+
+        # Concurrent requests for the same analysis share one TradingView call,
+        # keyed like the cache so requests differing only in case are merged
+        return singleflight.do(("tradingview", key), fetch)
+    except Exception as e:
+        return {"Error": str(e)}
+
+
+def _parse_watchlist(watchlist) -> tuple[dict, dict]:
+    """Group watchlist rows by screener as TradingView "EXCHANGE:SYMBOL" keys.
+
+    Rows can be (symbol, exchange, screener) tuples or lines of "symbol,exchange,screener"
+    text. The screener can be a config.SCREENER key ("america") or its label ("United States").
+    Returns the grouped symbols and the errors of rows which could not be parsed.
+    """
+    if isinstance(watchlist, str):
+        watchlist = [line.split(",") for line in watchlist.splitlines() if line.strip()]
+
+    labels = {label.lower(): key for key, label in SCREENER.items()}
+    grouped, errors = {}, {}
+    for row in watchlist or []:
+        row = [str(value).strip() for value in row]
+        if len(row) != 3 or not all(row):
+            errors[",".join(row)] = "Expected symbol, exchange and screener"
+            continue
+        symbol, exchange, screener = row
+        screener = labels.get(screener.lower(), screener.lower())
+        if screener not in SCREENER or screener == "None":
+            errors[f"{exchange}:{symbol}".upper()] = f"Unknown screener {screener}"
+            continue
+        key = f"{exchange}:{symbol.split('.')[0]}".upper()
+        grouped.setdefault(screener, [])
+        if key not in grouped[screener]:
+            grouped[screener].append(key)
+    return grouped, errors
+
+
+def _scan(screener: str, interval: str, symbols: list[str]) -> dict:
+    results = {}
+    for symbol in symbols:
+        exchange, ticker = symbol.split(":")
+        cached = ta_cache.get(_ta_cache_key(screener, exchange, ticker, interval))
+        if cached is not None:
+            results[symbol] = cached
+
+    missing = [symbol for symbol in symbols if symbol not in results]
+    if not missing:
+        return results
+
+    try:
+        analyses = singleflight.do(
+            ("tradingview", screener, interval, tuple(missing)),
+            get_multiple_analysis,
+            screener=screener,
             interval=interval,
+            symbols=missing,
+        )
+    except Exception as e:
+        results.update({symbol: {"Error": str(e)} for symbol in missing})
+        return results
+
+    for symbol, analysis in analyses.items():
+        if analysis is None:
+            results[symbol] = {"Error": "No analysis returned for symbol"}
+            continue
+        results[symbol] = _analysis_to_dict(analysis)
+        exchange, ticker = symbol.split(":")
+        ta_cache.set(
+            _ta_cache_key(screener, exchange, ticker, interval),
+            results[symbol],
+            interval_ttl.get(interval, 60),
         )
-        analysis = handler.get_analysis()
-        analysis_dict = {
-            "Symbol": analysis.symbol,
-            "Exchange": analysis.exchange,
-            "Screener": analysis.screener,
-            "Interval": analysis.interval,
-            "Time": analysis.time.strftime("%Y-%m-%d %H:%M:%S"),
-            "Summary": analysis.summary,
-            "Oscillators": analysis.oscillators,
-            "Moving Averages": analysis.moving_averages,
-            "Indicators": analysis.indicators,
+    return results
+
+
+def get_technical_analysis_bulk(watchlist: list[tuple[str, str, str]], intervals: list[str]):
+    """Get the technical analysis for a watchlist of symbols across several intervals.
+
+    Symbols are grouped per screener into TradingView multi-symbol scans and the
+    scans for each interval run concurrently. The results of each scan are
+    yielded as it completes, followed by all results once every scan is done.
+
+    Args:
+        watchlist(list[tuple[str, str, str]]):Required: (symbol, exchange, screener) rows, e.g. [("AAPL", "NASDAQ", "america"), ("TCS", "NSE", "india")]. One "symbol,exchange,screener" row per line is also accepted.
+        intervals(list[str]):Required: Time intervals for the analysis (e.g., ["1d", "1h"]).The possible values are listed in the config.py file
+
+    Returns:
+       dict: Progress, "Results" keyed by "EXCHANGE:SYMBOL" and interval, and "Errors" for symbols which failed. The last dict has "Complete" set and holds the results of all scans.
+    """
+    grouped, invalid = _parse_watchlist(watchlist)
+    intervals = [intervals] if isinstance(intervals, str) else list(intervals or [])
+    results = {}
+    errors = {
+        symbol: {interval: error for interval in intervals}
+        for symbol, error in invalid.items()
+    }
+
+    futures = {
+        ta_pool.submit(_scan, screener, interval, symbols[i : i + TA_BULK_CHUNK_SIZE]): interval
+        for screener, symbols in grouped.items()
+        for interval in intervals
+        for i in range(0, len(symbols), TA_BULK_CHUNK_SIZE)
+    }
+    for done, future in enumerate(as_completed(futures), start=1):
+        interval = futures[future]
+        scan_results, scan_errors = {}, {}
+        for symbol, analysis in future.result().items():
+            if "Error" in analysis:
+                scan_errors[symbol] = {interval: analysis["Error"]}
+                errors.setdefault(symbol, {})[interval] = analysis["Error"]
+            else:
+                scan_results[symbol] = {interval: analysis}
+                results.setdefault(symbol, {})[interval] = analysis
+
+        # Only the new results of this scan, the totals come once at the end
+        yield {
+            "Progress": f"{done}/{len(futures)} scans completed",
+            "Results": scan_results,
+            "Errors": scan_errors,
         }
-        return analysis_dict
+
+    yield {
+        "Progress": f"{len(futures)}/{len(futures)} scans completed",
+        "Complete": True,
+        "Results": results,
+        "Errors": errors,
+    }
+
+
+def get_local_technical_analysis(symbols: list[str]) -> dict:
+    """Compute daily technical indicators locally from cached price history, without TradingView.
+
+    RSI, MACD, EMAs, SMAs, Bollinger bands, ADX, Stochastic, CCI and similar indicators are
+    updated incrementally as new daily bars arrive, so screening many symbols stays fast.
+
+    Args:
+        symbols (list[str]): Ticker symbols in Yahoo Finance format (e.g., ["AAPL", "TCS.NS"]). A comma separated string (e.g., "AAPL,MSFT") is also accepted.
+
+    Returns:
+       dict: "Results" with the "Summary", "Oscillators", "Moving Averages" and "Indicators" of each symbol, and "Errors" for symbols without price data.
+    """
+    from indicators import indicator_engine
+
+    symbols = _parse_symbols(symbols)
+    if not symbols:
+        return {"Error": "At least one symbol is required!"}
+    return indicator_engine.analyze(symbols)
+
+
+def get_multi_timeframe_analysis(
+    symbol: str, screener: str, intervals: list[str]
+) -> dict:
+    """Compute technical indicators of one symbol over several intervals from a single price fetch.
+
+    Intraday bars are downloaded once at the finest needed interval and aggregated locally into the
+    coarser intervals along the exchange session, daily/weekly/monthly bars come from the cached daily history.
+
+    Args:
+        symbol (str): Ticker symbol in Yahoo Finance format (e.g., "AAPL", "TCS.NS").
+        screener (str): The exchange's country (e.g., "america", "india", "uk"). The possible values are listed in the config.py file
+        intervals (list[str]): Time intervals for the analysis (e.g., ["15m", "1h", "1d"]). The possible values are listed in the config.py file
+
+    Returns:
+       dict: "Results" with the "Summary", "Oscillators", "Moving Averages" and "Indicators" for each interval, and "Errors" for intervals without bars.
+    """
+    from indicators import indicator_engine
+    from resample import resampler
+
+    intervals = [intervals] if isinstance(intervals, str) else list(intervals or [])
+    if not symbol or not intervals:
+        return {"Error": "A symbol and at least one interval are required!"}
+
+    try:
+        frames = resampler.bars(symbol.strip(), intervals, screener or "america")
     except Exception as e:
         return {"Error": str(e)}
 
+    results, errors = {}, {}
+    for interval, frame in frames.items():
+        analysis = indicator_engine.analyze_bars({symbol: frame}, interval)
+        if symbol in analysis:
+            results[interval] = analysis[symbol]
+        else:
+            errors[interval] = f"No {interval} bars for {symbol}"
+    return {"Symbol": symbol, "Results": results, "Errors": errors}
+
+
+def get_cache_stats() -> dict:
+    """Get the hit/miss counters of the server caches.
+
+    Returns:
+       dict: Counters for each cache, keyed by cache name.
+    """
+    from indicators import indicator_engine
+    from report_cache import report_cache
+    from resample import resampler
+
+    return {
+        "technical_analysis": ta_cache.stats(),
+        "local_indicators": indicator_engine.stats(),
+        "resampling": resampler.stats(),
+        "reports": report_cache.stats(),
+        "render_pool": render_pool.stats(),
+        "singleflight": singleflight.stats(),
+    }
+
+
+def _render(fn, *args):
+    """Run a report renderer on the render pool and surface failures to the UI."""
+    try:
+        return render_pool.run(fn, *args)
+    except (RenderPoolBusy, TimeoutError) as e:
+        raise gr.Error(str(e))
+
 
 def get_performance_snapshot(symbol) -> Image:
     """Get the symbol performance snapshot and returns plot image.
@@ -61,37 +306,209 @@ def get_performance_snapshot(symbol) -> Image:
     Returns:
     Image of the performance snapshot is returned
     """
-    _data = qs.utils.download_returns(symbol)
+    from report_cache import report_cache
+    from reports import render_snapshot_png
+    from returns_store import store
+
+    def render():
+        return _render(render_snapshot_png, store.returns(symbol))
+
+    snapshot = report_cache.get_or_render("snapshot", [symbol], render)
+    return Image.open(BytesIO(snapshot))
+
+
+def get_performance_chart(symbol: str):
+    """Get the symbol performance snapshot as an interactive chart of cumulative return, drawdown and daily returns.
+
+    Lighter alternative to get_performance_snapshot: the series are computed with NumPy, long histories
+    are downsampled and the chart is drawn by the client instead of rendered to an image.
+
+    Args:
+    symbol (str): Ticker symbol to be analyzed (e.g., "AAPL", "TCS.NS").
+
+    Returns:
+    Plotly figure of the performance snapshot
+    """
+    from charts import render_snapshot_figure
+    from returns_store import store
+
+    try:
+        returns = store.returns(symbol)
+    except Exception as e:
+        raise gr.Error(str(e))
+    return render_snapshot_figure(returns, title=f"{symbol} Performance")
+
+
+def _status_html(message: str) -> str:
+    return f"<p><em>{message}</em></p>"
 
-    snapshot_buf = BytesIO()
-    qs.plots.snapshot(_data, title="Performance", savefig=snapshot_buf)
-    snapshot_buf.seek(0)
-    return Image.open(snapshot_buf)
+
+def _summary_html(returns: dict) -> str:
+    """Date range and total return of each fetched series as an HTML table."""
+    rows = "".join(
+        f"<tr><td>{symbol}</td><td>{series.index[0]:%Y-%m-%d}</td>"
+        f"<td>{series.index[-1]:%Y-%m-%d}</td><td>{len(series)}</td>"
+        f"<td>{(1 + series).prod() - 1:.2%}</td></tr>"
+        for symbol, series in returns.items()
+    )
+    return (
+        "<h3>Data</h3><table><tr><th>Symbol</th><th>First Bar</th><th>Last Bar</th>"
+        f"<th>Days</th><th>Total Return</th></tr>{rows}</table>"
+    )
+
+
+def _metrics_html(metrics: dict) -> str:
+    """Metrics returned by metrics_table as an HTML table with one column per symbol."""
+    symbols = list(metrics)
+    header = "".join(f"<th>{symbol}</th>" for symbol in symbols)
+    rows = "".join(
+        f"<tr><td>{name}</td>"
+        + "".join(
+            f"<td>{'-' if metrics[symbol][name] is None else round(metrics[symbol][name], 4)}</td>"
+            for symbol in symbols
+        )
+        + "</tr>"
+        for name in next(iter(metrics.values()))
+    )
+    return f"<h3>Key Metrics</h3><table><tr><th>Metric</th>{header}</tr>{rows}</table>"
 
 
 def get_comparison_report(symbol: str, benchmark: str):
     """Get the symbol performance against provided benchmark and return plots and HTML report content.
 
+    Progress, a data summary and the key metrics are streamed while the full report renders.
+
     Args:
     symbol (str): Ticker symbol to be analyzed (e.g., "AAPL", "TSLA").
     benchmark (str): Benchmark symbol (e.g., "^DJI", "SPY").
     """
+    from metrics import metrics_table
+    from report_cache import report_cache
+    from reports import render_comparison_html, report_file
+    from returns_store import store
 
-    data = qs.utils.download_returns(symbol)
+    def render():
+        # The same aligned series as the streamed metrics, so the numbers agree
+        returns = store.aligned_returns([symbol, benchmark])
+        data, benchmark_data = returns[symbol], returns[benchmark]
+        # Render the HTML report in memory, the download file is content-addressed
+        html = _render(render_comparison_html, data, benchmark_data, symbol, benchmark)
+        return html.encode("utf-8")
 
-    # Generate and read HTML report
-    report_path = "performance_report.html"
-    qs.reports.html(
-        data,
-        benchmark=benchmark,
-        output=report_path,
-        strategy_title=symbol,
-        title="Detailed Comparison",
+    report = report_cache.cached("comparison", [symbol, benchmark], render)
+    if report is None:
+        yield _status_html(f"Fetching price history for {symbol} and {benchmark}..."), None
+        returns = store.returns_many([symbol, benchmark])
+        summary = _summary_html(returns)
+        yield summary + _status_html("Computing key metrics..."), None
+
+        aligned = store.aligned_returns([symbol, benchmark])
+        metrics = metrics_table(aligned[[symbol]], aligned[benchmark])
+        partial = summary + _metrics_html(metrics)
+        yield partial + _status_html("Rendering the detailed report..."), None
+
+        report = report_cache.get_or_render("comparison", [symbol, benchmark], render)
+
+    report_content = report.decode("utf-8")
+
+    yield report_content, report_file(report_content)
+
+
+def _parse_symbols(symbols) -> list[str]:
+    """Accept a list of symbols or a comma separated string of symbols."""
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    return list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+
+
+def get_comparison_report_batch(symbols: list[str], benchmark: str):
+    """Get the performance of several symbols against one benchmark as a single combined HTML report.
+
+    Args:
+    symbols (list[str]): Ticker symbols to be analyzed (e.g., ["AAPL", "MSFT", "GOOGL"]). A comma separated string (e.g., "AAPL,MSFT,GOOGL") is also accepted.
+    benchmark (str): Benchmark symbol (e.g., "^DJI", "SPY").
+    """
+
+    from reports import render_comparison_html, report_file
+    from returns_store import store
+
+    symbols = _parse_symbols(symbols)
+    if not symbols:
+        raise gr.Error("At least one symbol is required!")
+
+    # One grouped download for every symbol and the benchmark, aligned on
+    # the trading days of all of them
+    returns = store.aligned_returns(symbols + [benchmark])
+    data, benchmark_data = returns[symbols], returns[benchmark]
+
+    report_content = _render(
+        render_comparison_html, data, benchmark_data, symbols, benchmark
     )
-    with open(report_path, "r", encoding="utf-8") as file:
-        report_content = file.read()
 
-    return report_content, report_path
+    return report_content, report_file(report_content)
+
+
+def get_comparison_metrics(symbols: list[str], benchmark: str) -> dict:
+    """Get key performance metrics of several symbols against one benchmark as compact JSON.
+
+    Computes CAGR, Sharpe, Sortino, max drawdown, volatility, beta and alpha for every symbol
+    without rendering a report. Prefer this over get_comparison_report when only the numbers are needed.
+
+    Args:
+    symbols (list[str]): Ticker symbols to be analyzed (e.g., ["AAPL", "MSFT"]). A comma separated string (e.g., "AAPL,MSFT") is also accepted.
+    benchmark (str): Benchmark symbol (e.g., "^DJI", "SPY").
+
+    Returns:
+       dict: The aligned date range and the metrics of each symbol and the benchmark.
+    """
+    from metrics import metrics_table
+    from returns_store import store
+
+    symbols = _parse_symbols(symbols)
+    if not symbols:
+        return {"Error": "At least one symbol is required!"}
+
+    try:
+        returns = store.aligned_returns(symbols + [benchmark])
+    except Exception as e:
+        return {"Error": str(e)}
+
+    data, benchmark_data = returns[symbols], returns[benchmark]
+
+    return {
+        "Benchmark": benchmark,
+        "Start": data.index[0].strftime("%Y-%m-%d"),
+        "End": data.index[-1].strftime("%Y-%m-%d"),
+        "Days": len(data),
+        "Metrics": metrics_table(data, benchmark_data),
+    }
+
+
+def get_universe_analysis(
+    symbols: list[str], benchmark: str, days: int = 252, top_k: int = 10
+) -> dict:
+    """Get correlations, rolling betas and relative strength rankings across many symbols, e.g. an index's constituents.
+
+    Returns the most and least correlated pairs and one ranked row per symbol instead of a report per pair.
+    Prefer this over get_comparison_metrics for more than a handful of symbols.
+
+    Args:
+    symbols (list[str]): Ticker symbols to be analyzed (e.g., ["AAPL", "MSFT", "NVDA"]). A comma separated string (e.g., "AAPL,MSFT,NVDA") is also accepted.
+    benchmark (str): Benchmark symbol the betas and relative strength are measured against (e.g., "^GSPC", "SPY").
+    days (int): Trading days of history to use (e.g., 252 for one year).
+    top_k (int): Number of most and least correlated pairs to return.
+
+    Returns:
+       dict: The aligned date range, "Most Correlated" and "Least Correlated" pairs, and the "Relative Strength" ranking with each symbol's beta, correlation and volatility.
+    """
+    from universe import analyze_universe
+
+    symbols = _parse_symbols(symbols)
+    if len(symbols) < 2 or not benchmark:
+        return {"Error": "At least two symbols and a benchmark are required!"}
+    return analyze_universe(
+        symbols, benchmark.strip(), days=int(days or 252), top_k=int(top_k or 10)
+    )
 
 
 with gr.Blocks() as demo:
@@ -126,6 +543,64 @@ with gr.Blocks() as demo:
             outputs=output_json,
         )
 
+    with gr.Tab("Bulk Technical Analysis"):
+        gr.Markdown("# Watchlist Screening")
+        gr.Markdown(
+            "Enter one symbol,exchange,country row per line to analyze a whole watchlist over several intervals."
+        )
+        watchlist_input = gr.Textbox(
+            label="Watchlist* (e.g., AAPL,NASDAQ,america)",
+            lines=6,
+        )
+        intervals_input = gr.Dropdown(
+            interval_options, label="Select Intervals:", multiselect=True
+        )
+        bulk_button = gr.Button("Generate Analysis", variant="primary")
+        bulk_output = gr.JSON(label="Output")
+
+        bulk_button.click(
+            fn=get_technical_analysis_bulk,
+            inputs=[watchlist_input, intervals_input],
+            outputs=bulk_output,
+        )
+
+    with gr.Tab("Local Indicators"):
+        gr.Markdown("# Local Technical Indicators")
+        gr.Markdown(
+            "Enter comma separated symbols to compute daily indicators from cached prices, without TradingView."
+        )
+        local_symbols_input = gr.Textbox(
+            label="Stock Symbols* (e.g., AAPL,MSFT,TCS.NS)",
+            placeholder="Enter comma separated stock symbols",
+        )
+        local_button = gr.Button("Compute Indicators", variant="primary")
+        local_output = gr.JSON(label="Output")
+
+        local_button.click(
+            fn=get_local_technical_analysis,
+            inputs=local_symbols_input,
+            outputs=local_output,
+        )
+
+        gr.Markdown("## Multiple Timeframes")
+        mtf_symbol_input = gr.Textbox(label="Stock Symbol* (e.g., AAPL, TCS.NS)")
+        mtf_screener_input = gr.Dropdown(
+            choices=[(name, key) for key, name in SCREENER.items() if key != "None"],
+            label="Country*",
+            value="america",
+        )
+        mtf_intervals_input = gr.Dropdown(
+            interval_options, label="Select Intervals:", multiselect=True
+        )
+        mtf_button = gr.Button("Compute Indicators", variant="primary")
+        mtf_output = gr.JSON(label="Output")
+
+        mtf_button.click(
+            fn=get_multi_timeframe_analysis,
+            inputs=[mtf_symbol_input, mtf_screener_input, mtf_intervals_input],
+            outputs=mtf_output,
+        )
+
     with gr.Tab("Performance Comparison"):
         with gr.Blocks():
             gr.Markdown("# Stock Performance Analyzer")
@@ -147,9 +622,13 @@ with gr.Blocks() as demo:
                     )
 
                     generate_button = gr.Button("Generate Report", variant="primary")
+                    snapshot_button = gr.Button("Generate Snapshot")
 
                     download_button = gr.File(label="Download Report")
 
+            with gr.Row():
+                snapshot_output = gr.Plot(label="Performance Snapshot")
+
             with gr.Row():
                 report_output = gr.HTML(label="Performance Report")
 
@@ -162,5 +641,117 @@ with gr.Blocks() as demo:
                 ],
             )
 
+            snapshot_button.click(
+                fn=get_performance_chart,
+                inputs=symbol_input,
+                outputs=snapshot_output,
+            )
+
+    with gr.Tab("Batch Comparison"):
+        gr.Markdown("# Multi Stock Performance Analyzer")
+        gr.Markdown(
+            "Enter several stock symbols and one benchmark to generate a single combined report."
+        )
+
+        with gr.Row():
+            with gr.Column():
+                batch_symbols_input = gr.Textbox(
+                    label="Stock Symbols (e.g., AAPL,MSFT,GOOGL,AMZN)",
+                    placeholder="Enter comma separated stock symbols",
+                )
+                batch_benchmark_input = gr.Textbox(
+                    label="Benchmark Symbol (e.g., ^DJI,^NSEI,^FTSE,SPY)",
+                    placeholder="Enter benchmark symbol",
+                )
+
+                batch_generate_button = gr.Button("Generate Report", variant="primary")
+
+                batch_download_button = gr.File(label="Download Report")
+
+        with gr.Row():
+            batch_report_output = gr.HTML(label="Performance Report")
+
+        batch_generate_button.click(
+            fn=get_comparison_report_batch,
+            inputs=[batch_symbols_input, batch_benchmark_input],
+            outputs=[
+                batch_report_output,
+                batch_download_button,
+            ],
+        )
+
+        batch_metrics_button = gr.Button("Get Metrics Only")
+        batch_metrics_output = gr.JSON(label="Metrics")
+
+        batch_metrics_button.click(
+            fn=get_comparison_metrics,
+            inputs=[batch_symbols_input, batch_benchmark_input],
+            outputs=batch_metrics_output,
+        )
+
+    with gr.Tab("Universe Analysis"):
+        gr.Markdown("# Correlations and Relative Strength")
+        gr.Markdown(
+            "Enter many symbols (e.g. an index's constituents) and a benchmark to rank them by relative strength and find the most and least correlated pairs."
+        )
+        universe_symbols_input = gr.Textbox(
+            label="Stock Symbols* (e.g., AAPL,MSFT,NVDA,AMZN)",
+            placeholder="Enter comma separated stock symbols",
+            lines=4,
+        )
+        universe_benchmark_input = gr.Textbox(
+            label="Benchmark Symbol* (e.g., ^GSPC,SPY)",
+            placeholder="Enter benchmark symbol",
+        )
+        with gr.Row():
+            universe_days_input = gr.Number(value=252, precision=0, label="Days")
+            universe_top_k_input = gr.Number(value=10, precision=0, label="Top Pairs")
+        universe_button = gr.Button("Analyze", variant="primary")
+        universe_output = gr.JSON(label="Output")
+
+        universe_button.click(
+            fn=get_universe_analysis,
+            inputs=[
+                universe_symbols_input,
+                universe_benchmark_input,
+                universe_days_input,
+                universe_top_k_input,
+            ],
+            outputs=universe_output,
+        )
+
+    with gr.Tab("Cache Stats"):
+        stats_button = gr.Button("Refresh")
+        stats_output = gr.JSON(label="Cache Stats")
+
+        stats_button.click(fn=get_cache_stats, outputs=stats_output)
+
+
+def warm_up():
+    """Load the heavy modules and start the render workers once the app is listening."""
+    with timed("import pandas"):
+        import pandas  # noqa: F401
+    with timed("import yfinance"):
+        import yfinance  # noqa: F401
+    with timed("import quantstats"):
+        import quantstats  # noqa: F401
+    with timed("import returns_store, reports, metrics, report_cache"):
+        import metrics  # noqa: F401
+        import report_cache  # noqa: F401
+        import reports  # noqa: F401
+        import returns_store  # noqa: F401
+    with timed("import indicators, resample, universe, charts"):
+        import charts  # noqa: F401
+        import indicators  # noqa: F401
+        import resample  # noqa: F401
+        import universe  # noqa: F401
+    with timed("render_pool.start"):
+        render_pool.start()
+    print(startup_report())
+
 
-demo.launch(mcp_server=True)
+if __name__ == "__main__":
+    with timed("demo.launch"):
+        demo.launch(mcp_server=True, prevent_thread_lock=True)
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    demo.block_thread()
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight call.
+
+    Calls are keyed by a tuple starting with the data source, e.g.
+    ``("tradingview", screener, exchange, symbol, interval)``. The first caller
+    for a key runs the function, callers arriving while it runs wait for the
+    same ``concurrent.futures.Future`` and share its result or exception.
+    Threads block on the future, asyncio callers await it with
+    ``asyncio.wrap_future``. Results are shared, so callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = Counter()
+        self.merged = Counter()
+
+    def _begin(self, key: tuple) -> tuple[Future, bool]:
+        """Get the in-flight future for the key, and whether this caller runs it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.merged[key[0]] += 1
+                return future, False
+            future = self._calls[key] = Future()
+            # A running future cannot be cancelled by one of the waiting callers
+            future.set_running_or_notify_cancel()
+            self.executed[key[0]] += 1
+            return future, True
+
+    def _run(self, key: tuple, future: Future, fn, args, kwargs):
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def do(self, key: tuple, fn, *args, **kwargs):
+        """Call ``fn(*args, **kwargs)`` unless the same key is in flight, then share its result."""
+        future, leader = self._begin(key)
+        if leader:
+            self._run(key, future, fn, args, kwargs)
+        return future.result()
+
+    async def do_async(self, key: tuple, fn, *args, **kwargs):
+        """Like ``do`` for asyncio callers, the blocking ``fn`` runs in the default executor.
+
+        The call completes for the waiting callers even when the task which
+        started it is cancelled.
+        """
+        future, leader = self._begin(key)
+        if leader:
+            asyncio.get_running_loop().run_in_executor(
+                None, self._run, key, future, fn, args, kwargs
+            )
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sources = set(self.executed) | set(self.merged)
+            return {
+                "in_flight": len(self._calls),
+                "executed": sum(self.executed.values()),
+                "merged": sum(self.merged.values()),
+                "sources": {
+                    source: {
+                        "executed": self.executed[source],
+                        "merged": self.merged[source],
+                    }
+                    for source in sorted(sources)
+                },
+            }
+
+
+singleflight = SingleFlight()
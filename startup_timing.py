@@ -0,0 +1,36 @@
+import threading
+import time
+from contextlib import contextmanager
+
+_timings = []
+_lock = threading.Lock()
+_process_start = time.perf_counter()
+
+
+@contextmanager
+def timed(name: str):
+    """Record how long the wrapped import or initialization step takes."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _timings.append((name, time.perf_counter() - start, threading.current_thread().name))
+
+
+def startup_report() -> str:
+    """Format the recorded steps as a table, slowest first.
+
+    Steps recorded on the main thread block serving, steps on other threads
+    (such as the warm-up thread) run while the app is already listening.
+    For a per-module breakdown of a single import, run with ``python -X importtime``.
+    """
+    with _lock:
+        timings = sorted(_timings, key=lambda timing: timing[1], reverse=True)
+
+    width = max([len(name) for name, _, _ in timings] + [4])
+    lines = [f"{'Step':<{width}}  {'Seconds':>8}  Thread", "-" * (width + 26)]
+    lines += [f"{name:<{width}}  {seconds:>8.3f}  {thread}" for name, seconds, thread in timings]
+    blocking = sum(seconds for _, seconds, thread in timings if thread == "MainThread")
+    lines.append(f"Blocking startup: {blocking:.3f}s, since process start: {time.perf_counter() - _process_start:.3f}s")
+    return "\n".join(lines)
@@ -0,0 +1,288 @@
+import bisect
+import csv
+import difflib
+import json
+import re
+import threading
+import time
+
+import requests
+
+from config import (
+    CACHE_DIR,
+    INDEX_ALIASES,
+    STOCK_ALIASES,
+    SYMBOL_DIRECTORY_URLS,
+    SYMBOL_INDEX_MAX_AGE,
+)
+
+# Words dropped from listed security names, e.g. "Apple Inc. - Common Stock" -> "apple"
+_NAME_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "corp",
+    "corporation",
+    "co",
+    "company",
+    "ltd",
+    "limited",
+    "plc",
+    "sa",
+    "ag",
+    "nv",
+    "se",
+    "holdings",
+    "holding",
+    "group",
+    "the",
+    "class",
+    "common",
+    "stock",
+    "shares",
+    "ordinary",
+    "a",
+    "b",
+    "c",
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase the name and drop punctuation and corporate suffixes."""
+    text = text.split(" - ")[0].lower().replace("&", " and ")
+    words = re.findall(r"[a-z0-9^]+", text)
+    kept = [word for word in words if word not in _NAME_SUFFIXES]
+    return " ".join(kept or words)
+
+
+class SymbolIndex:
+    """Local index answering symbol lookups without network access.
+
+    Names, aliases and symbols are kept in sorted key lists, so prefix
+    queries are a binary search over the keys. Lookups try exact aliases,
+    exact symbols, name prefixes, word prefixes and finally fuzzy name
+    matches. The ticker list is read from a CSV in the cache directory and
+    downloaded again in the background once older than ``max_age`` seconds.
+    Symbols found through the yfinance fallback are remembered as aliases.
+    ``resolve`` only answers exact matches, for callers which cannot check
+    the result.
+    """
+
+    def __init__(
+        self, path=CACHE_DIR / "symbols.csv", max_age: int = SYMBOL_INDEX_MAX_AGE
+    ):
+        self.path = path
+        self.aliases_path = path.with_name("symbol_aliases.json")
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._next_check = 0.0
+        self._learned = {}
+        if self.aliases_path.exists():
+            self._learned = json.loads(self.aliases_path.read_text(encoding="utf-8"))
+        self._build(self._read_rows())
+
+    def _read_rows(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        with open(self.path, newline="", encoding="utf-8") as file:
+            return list(csv.DictReader(file))
+
+    def _build(self, rows: list[dict]):
+        """Build the lookup tables and swap them in at once."""
+        aliases = {"stock": {}, "index": {}}
+        for alias, symbols in STOCK_ALIASES.items():
+            aliases["stock"][normalize(alias)] = list(symbols)
+        for symbol, names in INDEX_ALIASES.items():
+            for name in names:
+                aliases["index"].setdefault(normalize(name), []).append(symbol)
+        # Learned aliases come from yfinance search results and are not exact
+        configured = {kind: dict(aliases[kind]) for kind in aliases}
+        for key, symbols in self._learned.items():
+            kind, query = key.split(":", 1)
+            aliases[kind].setdefault(query, list(symbols))
+
+        tables = {}
+        for kind in ("stock", "index"):
+            names = {}
+            for row in rows:
+                if row["type"] == kind:
+                    names.setdefault(normalize(row["name"]), []).append(row["symbol"])
+            exact = {name: found[0] for name, found in names.items() if len(found) == 1}
+            exact.update(
+                {alias: symbols[0] for alias, symbols in configured[kind].items()}
+            )
+            for alias, symbols in aliases[kind].items():
+                names.setdefault(alias, []).extend(
+                    symbol for symbol in symbols if symbol not in names.get(alias, [])
+                )
+
+            words = {}
+            for name, symbols in names.items():
+                for word in name.split():
+                    words.setdefault(word, []).extend(symbols)
+
+            symbols = {row["symbol"].upper() for row in rows if row["type"] == kind}
+            symbols.update(
+                s.upper() for values in aliases[kind].values() for s in values
+            )
+            tables[kind] = {
+                "aliases": aliases[kind],
+                "symbols": symbols,
+                "exact": exact,
+                "names": names,
+                "name_keys": sorted(names),
+                "words": words,
+                "word_keys": sorted(words),
+            }
+        self._tables = tables
+
+    @staticmethod
+    def _prefixed(keys: list[str], prefix: str) -> list[str]:
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\uffff")
+        return keys[start:end]
+
+    def lookup(self, query: str, type: str = "stock", count: int = 10) -> list[str]:
+        """Find symbols for a company or index name without network access.
+
+        Args:
+            query(str): Company/Index search term or symbol
+            type(str): "stock" or "index"
+            count(int): Maximum number of symbols returned
+
+        Returns:
+            list[str]: Matching symbols, best match first. Empty when nothing matches.
+        """
+        self._refresh_if_stale()
+        tables = self._tables["index" if type == "index" else "stock"]
+        key = normalize(query)
+        if not key:
+            return []
+
+        results = []
+
+        def add(symbols):
+            for symbol in symbols:
+                if symbol not in results:
+                    results.append(symbol)
+
+        add(tables["aliases"].get(key, []))
+        if query.strip().upper() in tables["symbols"]:
+            add([query.strip().upper()])
+        add(tables["names"].get(key, []))
+        for name in self._prefixed(tables["name_keys"], key)[: count * 4]:
+            add(tables["names"][name])
+        if len(results) < count and " " not in key:
+            for word in self._prefixed(tables["word_keys"], key)[: count * 4]:
+                add(tables["words"][word])
+        if not results:
+            for name in difflib.get_close_matches(
+                key, tables["name_keys"], n=count, cutoff=0.8
+            ):
+                add(tables["names"][name])
+        return results[:count]
+
+    def resolve(self, query: str, type: str = "stock"):
+        """Get the symbol for a query only when it matches exactly, without network access.
+
+        Exact matches are a symbol written in upper case, a configured alias or
+        the name of a single listed security. Prefix, fuzzy and learned matches
+        are left out, as they can pick the wrong security.
+
+        Args:
+            query(str): Company/Index name or symbol
+            type(str): "stock" or "index"
+
+        Returns:
+            str | None: The symbol, or None when the query has no exact match.
+        """
+        self._refresh_if_stale()
+        tables = self._tables["index" if type == "index" else "stock"]
+        query = query.strip()
+        if query == query.upper() and query in tables["symbols"]:
+            return query
+        return tables["exact"].get(normalize(query))
+
+    def remember(self, query: str, type: str, symbols: list[str]):
+        """Store the symbols found elsewhere for the query so the next lookup is local."""
+        if not symbols:
+            return
+        kind = "index" if type == "index" else "stock"
+        with self._lock:
+            self._learned[f"{kind}:{normalize(query)}"] = list(symbols)
+            self.aliases_path.parent.mkdir(parents=True, exist_ok=True)
+            self.aliases_path.write_text(json.dumps(self._learned), encoding="utf-8")
+            self._build(self._read_rows())
+
+    def _refresh_if_stale(self):
+        now = time.time()
+        if now < self._next_check:
+            return
+        if self.path.exists() and now - self.path.stat().st_mtime < self.max_age:
+            self._next_check = self.path.stat().st_mtime + self.max_age
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            # Do not retry a failed download on every lookup
+            self._next_check = now + 5 * 60
+        threading.Thread(
+            target=self.refresh, name="symbol-index-refresh", daemon=True
+        ).start()
+
+    def refresh(self):
+        """Download the ticker lists, save them as CSV and rebuild the index."""
+        try:
+            rows = [
+                {"symbol": symbol, "name": symbol, "type": "index", "exchange": ""}
+                for symbol in INDEX_ALIASES
+            ]
+            for url in SYMBOL_DIRECTORY_URLS:
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+                rows += _parse_symbol_directory(response.text)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.DictWriter(
+                    file, fieldnames=["symbol", "name", "type", "exchange"]
+                )
+                writer.writeheader()
+                writer.writerows(rows)
+            tmp_path.replace(self.path)
+            with self._lock:
+                self._build(rows)
+        except Exception as e:
+            print(f"Symbol index refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+def _parse_symbol_directory(text: str) -> list[dict]:
+    """Parse a NASDAQ Trader symbol directory file into index rows."""
+    lines = [
+        line
+        for line in text.splitlines()
+        if line and not line.startswith("File Creation Time")
+    ]
+    rows = []
+    for record in csv.DictReader(lines, delimiter="|"):
+        symbol = record.get("Symbol") or record.get("ACT Symbol") or ""
+        if not symbol or record.get("Test Issue") == "Y" or "$" in symbol:
+            continue
+        rows.append(
+            {
+                # Yahoo uses a dash for share classes, e.g. BRK.B -> BRK-B
+                "symbol": symbol.replace(".", "-"),
+                "name": record.get("Security Name", ""),
+                "type": "stock",
+                "exchange": record.get("Exchange", "Q"),
+            }
+        )
+    return rows
+
+
+symbol_index = SymbolIndex()
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import TA_CACHE_DB, TA_CACHE_SIZE
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL.
+
+    When ``shared_path`` is set, entries are also written to a SQLite database
+    so several workers or processes can share results. The in-process LRU is
+    always consulted first.
+    """
+
+    def __init__(self, maxsize: int = TA_CACHE_SIZE, shared_path: str = None):
+        self.maxsize = maxsize
+        self.shared_path = shared_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if shared_path:
+            with self._connect() as db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.shared_path, timeout=5)
+
+    def get(self, key: str):
+        """Get the cached value for the key, or None when it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.shared_path:
+            with self._connect() as db:
+                row = db.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+            if row is not None:
+                value = json.loads(row[0])
+                with self._lock:
+                    self.shared_hits += 1
+                    self._store(key, value, row[1])
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value, ttl: float):
+        """Cache the value for ``ttl`` seconds."""
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+
+        if self.shared_path:
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                db.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (
+                    round((self.hits + self.shared_hits) / lookups, 4) if lookups else None
+                ),
+            }
+
+
+ta_cache = TTLCache(TA_CACHE_SIZE, TA_CACHE_DB)
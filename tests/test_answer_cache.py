@@ -0,0 +1,41 @@
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("HF_KEY", "test")
+try:
+    from gaia_agent import AnswerCache
+except Exception as e:  # The Gradio app needs the agent dependencies and a HF login
+    pytest.skip(f"gaia_agent cannot be imported: {e}", allow_module_level=True)
+
+
+def test_answers_survive_a_restart(tmp_path):
+    path = str(tmp_path / "answers.jsonl")
+    cache = AnswerCache(path)
+    cache.put("task-1", "What is 2 + 2?", "4")
+    cache.put("task-2", "Capital of France?", "Paris")
+
+    resumed = AnswerCache(path)
+    assert resumed.get("task-1", "What is 2 + 2?") == "4"
+    assert resumed.get("task-2", "Capital of France?") == "Paris"
+    assert resumed.get("task-3", "Unanswered?") is None
+
+
+def test_changed_question_is_answered_again(tmp_path):
+    path = str(tmp_path / "answers.jsonl")
+    AnswerCache(path).put("task-1", "What is 2 + 2?", "4")
+
+    assert AnswerCache(path).get("task-1", "What is 3 + 3?") is None
+
+
+def test_line_cut_short_by_a_crash_is_skipped(tmp_path):
+    path = tmp_path / "answers.jsonl"
+    AnswerCache(str(path)).put("task-1", "What is 2 + 2?", "4")
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps({"key": "task-2:abc", "answer": "Paris"})[:-5])
+
+    resumed = AnswerCache(str(path))
+    assert resumed.get("task-1", "What is 2 + 2?") == "4"
+    resumed.put("task-2", "Capital of France?", "Paris")
+    assert AnswerCache(str(path)).get("task-2", "Capital of France?") == "Paris"
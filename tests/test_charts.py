@@ -0,0 +1,31 @@
+import numpy as np
+
+from charts import downsample_minmax
+
+
+def test_short_series_are_kept_as_is():
+    x, y = np.arange(5), np.array([1.0, 3.0, 2.0, 5.0, 4.0])
+    assert downsample_minmax(x, y, 10) == (x, y)
+
+
+def test_extremes_survive_in_time_order():
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=10_001))
+    y[1234], y[8765] = 1e3, -1e3
+    x = np.arange(len(y)) * 10.0
+
+    x_kept, y_kept = downsample_minmax(x, y, 500)
+
+    assert len(y_kept) <= 500
+    assert np.all(np.diff(x_kept) > 0)
+    assert 1234 * 10.0 in x_kept and 8765 * 10.0 in x_kept
+    assert (y_kept.max(), y_kept.min()) == (1e3, -1e3)
+    np.testing.assert_array_equal(y[(x_kept / 10).astype(int)], y_kept)
+
+
+def test_flat_buckets_keep_one_point():
+    x, y = np.arange(100), np.zeros(100)
+    x_kept, y_kept = downsample_minmax(x, y, 10)
+
+    assert x_kept.tolist() == [0, 20, 40, 60, 80]
+    assert y_kept.tolist() == [0.0] * 5
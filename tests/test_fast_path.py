@@ -0,0 +1,85 @@
+import csv
+
+import pytest
+
+import agent
+import symbol_index
+from fast_path import PathStats, parse_comparison
+
+
+@pytest.mark.parametrize(
+    "prompt, expected",
+    [
+        (
+            "Compare Apple and Microsoft stocks",
+            [("Apple", "stock"), ("Microsoft", "stock")],
+        ),
+        (
+            "Analyze Google stock against ^DJI index",
+            [("Google", "stock"), ("^DJI", "index")],
+        ),
+        ("compare TSLA vs. the S&P 500?", None),
+        ("Benchmark NVDA with nasdaq", [("NVDA", "stock"), ("nasdaq", "index")]),
+    ],
+)
+def test_plain_comparisons_are_parsed(prompt, expected):
+    assert parse_comparison(prompt) == expected
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "Compare Apple, Microsoft, Google and Amazon",
+        "Compare Johnson and Johnson with Pfizer",
+        "Compare the volatility of Apple and Microsoft",
+        "What is the best stock to buy?",
+    ],
+)
+def test_other_prompts_are_left_to_the_llm(prompt):
+    assert parse_comparison(prompt) is None
+
+
+@pytest.fixture
+def routing(tmp_path, monkeypatch):
+    """Route prompts with a local symbol index and stand-ins for the tools and the agent."""
+    path = tmp_path / "symbols.csv"
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["symbol", "name", "type", "exchange"])
+        writer.writerow(["AAPL", "Apple Inc. - Common Stock", "stock", "Q"])
+        writer.writerow(["MSFT", "Microsoft Corporation - Common Stock", "stock", "Q"])
+        writer.writerow(["^GSPC", "^GSPC", "index", ""])
+    monkeypatch.setattr(
+        symbol_index, "symbol_index", symbol_index.SymbolIndex(path, max_age=10**9)
+    )
+
+    calls = []
+
+    def comparison(symbol, benchmark):
+        calls.append((symbol, benchmark))
+        return f"<html>{symbol} vs {benchmark}</html>"
+
+    monkeypatch.setattr(agent, "get_tools", lambda: {"comparison": comparison})
+    monkeypatch.setattr(
+        agent, "_agent_infer", lambda prompt: iter(["<html>llm</html>"])
+    )
+    monkeypatch.setattr(agent, "path_stats", PathStats())
+    return calls
+
+
+def test_exact_names_are_compared_without_the_llm(routing):
+    outputs = list(agent.infer("Compare Apple and Microsoft stocks"))
+
+    assert outputs[-1] == "<html>AAPL vs MSFT</html>"
+    assert routing == [("AAPL", "MSFT")]
+    assert agent.path_stats.summary()["fast"]["count"] == 1
+
+
+def test_names_without_an_exact_match_fall_back_to_the_llm(routing):
+    outputs = list(agent.infer("Compare Appl and the S&P 500"))
+    outputs += list(agent.infer("Compare Micro and S&P 500"))
+
+    assert outputs == ["<html>llm</html>", "<html>llm</html>"]
+    assert routing == []
+    summary = agent.path_stats.summary()
+    assert (summary["llm"]["count"], summary["fast_path_fallbacks"]) == (2, 1)
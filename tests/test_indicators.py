@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import IndicatorEngine
+
+
+def _bars(seed: int, count: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    spread = np.abs(rng.normal(0, 0.5, count))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": 1e6,
+        },
+        index=pd.bdate_range("2023-01-02", periods=count),
+    )
+
+
+def _indicators(result: dict, symbol: str) -> dict:
+    return result[symbol]["Indicators"]
+
+
+def test_incremental_updates_match_a_full_recompute():
+    frames = {"AAA": _bars(0, 400), "BBB": _bars(1, 320)}
+    engine = IndicatorEngine()
+    for end in (300, 301, 350):
+        engine.analyze_bars({s: frame.iloc[:end] for s, frame in frames.items()}, "1d")
+    incremental = engine.analyze_bars(frames, "1d")
+    full = IndicatorEngine().analyze_bars(frames, "1d")
+
+    assert engine.stats()["incremental_updates"] == 6
+    for symbol in frames:
+        assert _indicators(incremental, symbol) == pytest.approx(
+            _indicators(full, symbol), rel=1e-6, nan_ok=True
+        )
+        assert incremental[symbol]["Summary"] == full[symbol]["Summary"]
+
+
+def test_recursive_indicators_match_pandas():
+    frame = _bars(2, 400)
+    indicators = _indicators(
+        IndicatorEngine().analyze_bars({"AAA": frame}, "1d"), "AAA"
+    )
+    close = frame["Close"]
+
+    assert indicators["EMA20"] == pytest.approx(
+        close.ewm(span=20, adjust=False).mean().iloc[-1], rel=1e-6
+    )
+    macd = (
+        close.ewm(span=12, adjust=False).mean()
+        - close.ewm(span=26, adjust=False).mean()
+    )
+    assert indicators["MACD.macd"] == pytest.approx(macd.iloc[-1], rel=1e-6)
+    assert indicators["MACD.signal"] == pytest.approx(
+        macd.ewm(span=9, adjust=False).mean().iloc[-1], rel=1e-6
+    )
+    assert indicators["SMA50"] == pytest.approx(close.iloc[-50:].mean(), rel=1e-6)
+
+
+def test_rescaled_history_is_recomputed():
+    frame = _bars(3, 300)
+    engine = IndicatorEngine()
+    engine.analyze_bars({"AAA": frame.iloc[:-1]}, "1d")
+    split = frame.copy()
+    split[["Open", "High", "Low", "Close"]] /= 2
+    result = engine.analyze_bars({"AAA": split}, "1d")
+
+    assert engine.stats()["full_updates"] == 2
+    assert _indicators(result, "AAA") == pytest.approx(
+        _indicators(IndicatorEngine().analyze_bars({"AAA": split}, "1d"), "AAA"),
+        rel=1e-6,
+        nan_ok=True,
+    )
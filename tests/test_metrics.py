@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import metrics_table
+from returns_store import PRICE_COLUMNS, ReturnsStore
+
+
+def _bars(dates: list[str], closes: list[float]) -> pd.DataFrame:
+    columns = {column: closes for column in PRICE_COLUMNS + ["Volume"]}
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(dates), dtype="float64")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReturnsStore(tmp_path)
+    # A US listing closed on 2024-01-04 and a benchmark on another exchange,
+    # which has one more day of history and is closed on 2024-01-03
+    store._save(
+        "AAPL", _bars(["2024-01-02", "2024-01-03", "2024-01-05"], [100, 110, 121])
+    )
+    store._save(
+        "^N225",
+        _bars(
+            ["2024-01-01", "2024-01-02", "2024-01-04", "2024-01-05"], [50, 50, 55, 60]
+        ),
+    )
+    return store
+
+
+def test_aligned_returns_keep_every_trading_day(store):
+    returns = store.aligned_returns(["AAPL", "^N225"])
+
+    assert list(returns.index.strftime("%Y-%m-%d")) == [
+        "2024-01-02",
+        "2024-01-03",
+        "2024-01-04",
+        "2024-01-05",
+    ]
+    # A closed market is a zero return, the next trading day covers the gap
+    assert returns.at["2024-01-04", "AAPL"] == 0
+    assert returns.at["2024-01-05", "AAPL"] == pytest.approx(0.1)
+    assert returns.at["2024-01-03", "^N225"] == 0
+    assert returns.at["2024-01-04", "^N225"] == pytest.approx(0.1)
+
+
+def test_metrics_compound_to_the_price_change(store):
+    returns = store.aligned_returns(["AAPL", "^N225"])
+    table = metrics_table(returns[["AAPL"]], returns["^N225"], periods=len(returns))
+
+    # With one period per year the CAGR is the total return
+    assert table["AAPL"]["CAGR"] == pytest.approx(121 / 100 - 1)
+    assert table["^N225"]["CAGR"] == pytest.approx(60 / 50 - 1)
+    assert np.isfinite(table["AAPL"]["Beta"])
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+from render_pool import RenderPool, RenderPoolBusy
+
+
+@pytest.fixture
+def pool():
+    pool = RenderPool(size=1, timeout=0.5, max_queue=0)
+    pool.start()
+    yield pool
+    pool._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def test_jobs_run_in_the_worker(pool):
+    assert pool.run(pow, 2, 10) == 1024
+
+
+def test_slow_job_times_out_and_keeps_its_slot(pool):
+    with pytest.raises(TimeoutError):
+        pool.run(time.sleep, 2)
+
+    # The timed out job still occupies the only slot until it finishes
+    with pytest.raises(RenderPoolBusy):
+        pool.run(pow, 2, 10)
+    assert pool.stats() == {"size": 1, "max_queue": 0, "rejected": 1, "timed_out": 1}
+
+    time.sleep(2)
+    assert pool.run(pow, 2, 10) == 1024
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import report_cache
+from report_cache import ReportCache
+from returns_store import PRICE_COLUMNS, ReturnsStore
+
+
+def _bars(end: str, days: int = 5) -> pd.DataFrame:
+    index = pd.bdate_range(end=end, periods=days)
+    columns = {column: range(100, 100 + days) for column in PRICE_COLUMNS + ["Volume"]}
+    return pd.DataFrame(columns, index=index, dtype="float64")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ReturnsStore(tmp_path)
+    store._save("AAPL", _bars("2024-01-05"))
+    monkeypatch.setattr(report_cache, "store", store)
+    return store
+
+
+def _wait_for_refresh(cache: ReportCache):
+    cache._refresh_pool.shutdown(wait=True)
+
+
+def test_reports_are_reused_until_a_new_bar(store):
+    cache = ReportCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return f"report {len(renders)}".encode()
+
+    assert cache.get_or_render("snapshot", ["aapl"], render) == b"report 1"
+    assert cache.get_or_render("snapshot", ["AAPL"], render) == b"report 1"
+    assert cache.stats()["hits"] == 1
+    assert len(renders) == 1
+
+
+def test_stale_report_is_served_while_refreshing(store):
+    cache = ReportCache()
+    cache.get_or_render("snapshot", ["AAPL"], lambda: b"old")
+    store.max_age = 0
+
+    assert cache.cached("snapshot", ["AAPL"], lambda: b"new") == b"old"
+    _wait_for_refresh(cache)
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_report_older_than_a_refreshed_store_is_served_while_refreshing(store):
+    cache = ReportCache()
+    cache.get_or_render("snapshot", ["AAPL"], lambda: b"old")
+    # Another endpoint fetched a new bar, the store is fresh again
+    store._save("AAPL", _bars("2024-01-08"))
+
+    assert cache.cached("snapshot", ["AAPL"], lambda: b"new") == b"old"
+    _wait_for_refresh(cache)
+    assert cache.get_or_render("snapshot", ["AAPL"], lambda: b"unused") == b"new"
+
+
+def test_eviction_keeps_the_cache_within_its_size(store):
+    # Random bytes do not compress, so each report takes about 50 bytes
+    reports = np.random.default_rng(0).bytes(100)
+    cache = ReportCache(max_bytes=80)
+    store._save("MSFT", _bars("2024-01-05"))
+    cache.get_or_render("snapshot", ["AAPL"], lambda: reports[:50])
+    cache.get_or_render("snapshot", ["MSFT"], lambda: reports[50:])
+
+    stats = cache.stats()
+    assert stats["size_bytes"] <= 80
+    assert stats["evictions"] == 1
+    assert cache.cached("snapshot", ["AAPL"], lambda: b"") is None
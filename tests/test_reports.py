@@ -0,0 +1,55 @@
+import os
+import time
+from pathlib import Path
+
+import reports
+
+
+def _use_dir(monkeypatch, tmp_path, max_files=64, max_age=3600):
+    monkeypatch.setattr(reports, "REPORT_DIR", tmp_path)
+    monkeypatch.setattr(reports, "REPORT_FILES_MAX", max_files)
+    monkeypatch.setattr(reports, "REPORT_FILES_MAX_AGE", max_age)
+
+
+def _age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_identical_content_shares_one_file(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path)
+    first = Path(reports.report_file("<html>a</html>"))
+    second = Path(reports.report_file("<html>a</html>"))
+
+    assert first == second
+    assert first.read_text(encoding="utf-8") == "<html>a</html>"
+    assert len(list(tmp_path.glob("report-*.html"))) == 1
+
+
+def test_least_recently_used_files_are_evicted(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path, max_files=2)
+    oldest = Path(reports.report_file("a"))
+    _age(oldest, 30)
+    middle = Path(reports.report_file("b"))
+    _age(middle, 20)
+    newest = Path(reports.report_file("c"))
+
+    assert not oldest.exists()
+    assert middle.exists() and newest.exists()
+
+    # Serving a report again marks it as recently used
+    _age(newest, 10)
+    reports.report_file("b")
+    reports.report_file("d")
+    assert not newest.exists()
+    assert middle.exists()
+
+
+def test_old_files_are_evicted_but_the_new_file_is_kept(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path, max_age=60)
+    old = Path(reports.report_file("old"))
+    _age(old, 120)
+    new = Path(reports.report_file("new"))
+
+    assert not old.exists()
+    assert new.exists()
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from resample import base_minutes, resample_daily, resample_intraday
+
+
+def _bars(index: pd.DatetimeIndex) -> pd.DataFrame:
+    values = np.arange(len(index), dtype=float)
+    return pd.DataFrame(
+        {
+            "Open": values,
+            "High": values + 0.5,
+            "Low": values - 0.5,
+            "Close": values,
+            "Volume": 1.0,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def quarter_hours():
+    # 8:00 to 17:00 New York time, on both sides of the regular session
+    return _bars(
+        pd.date_range("2024-03-05 13:00", "2024-03-05 22:00", freq="15min", tz="UTC")
+    )
+
+
+def test_hourly_bins_start_at_the_session_open(quarter_hours):
+    hourly = resample_intraday(quarter_hours, "1h", "america")
+    session = quarter_hours.tz_convert("America/New_York").between_time(
+        "09:30", "15:45"
+    )
+
+    assert [t.strftime("%H:%M") for t in hourly.index] == [
+        "09:30",
+        "10:30",
+        "11:30",
+        "12:30",
+        "13:30",
+        "14:30",
+        "15:30",
+    ]
+    assert str(hourly.index.tz) == "America/New_York"
+    assert hourly["Open"].iloc[0] == session["Open"].iloc[0]
+    assert hourly["High"].iloc[0] == session["High"].iloc[3]
+    assert hourly["Volume"].tolist() == [4.0] * 6 + [2.0]
+    # The last bin is cut at the 16:00 close
+    assert hourly["Close"].iloc[-1] == session["Close"].iloc[-1]
+
+
+def test_four_hour_bins_and_the_base_interval(quarter_hours):
+    four_hours = resample_intraday(quarter_hours, "4h", "america")
+
+    assert [t.strftime("%H:%M") for t in four_hours.index] == ["09:30", "13:30"]
+    assert four_hours["Volume"].tolist() == [16.0, 10.0]
+    assert base_minutes(["1h", "4h"]) == 60
+    assert base_minutes(["15m", "1h"]) == 15
+    assert base_minutes(["1d"]) is None
+
+
+def test_weeks_start_on_monday_and_months_on_the_first():
+    daily = _bars(pd.bdate_range("2024-01-25", "2024-02-09"))
+
+    weekly = resample_daily(daily, "1W")
+    assert weekly.index.strftime("%Y-%m-%d").tolist() == [
+        "2024-01-22",
+        "2024-01-29",
+        "2024-02-05",
+    ]
+    assert weekly["Volume"].tolist() == [2.0, 5.0, 5.0]
+    assert weekly["Close"].tolist() == [1.0, 6.0, 11.0]
+
+    monthly = resample_daily(daily, "1M")
+    assert monthly.index.strftime("%Y-%m-%d").tolist() == ["2024-01-01", "2024-02-01"]
+    assert monthly["Open"].tolist() == [0.0, 5.0]
+    assert monthly["Low"].tolist() == [-0.5, 4.5]
+
+    with pytest.raises(ValueError):
+        resample_daily(daily, "1Y")
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import returns_store
+from returns_store import PRICE_COLUMNS, ReturnsStore, _splice
+
+
+def _bars(dates, closes) -> pd.DataFrame:
+    index = pd.DatetimeIndex(dates)
+    columns = {column: closes for column in PRICE_COLUMNS}
+    return pd.DataFrame({**columns, "Volume": 1000.0}, index=index, dtype="float64")
+
+
+def _grouped(frames: dict) -> pd.DataFrame:
+    """A yf.download(group_by="ticker") result for the frames."""
+    return pd.concat(frames, axis=1)
+
+
+def test_splice_appends_after_the_overlapping_bar():
+    cached = _bars(["2024-01-02", "2024-01-03"], [100, 101])
+    new = _bars(["2024-01-03", "2024-01-04"], [101, 102])
+
+    spliced = _splice(cached, new)
+
+    assert list(spliced["Close"]) == [100, 101, 102]
+    assert spliced.index.is_unique
+
+
+def test_splice_rescales_the_history_after_an_adjustment():
+    cached = _bars(["2024-01-02", "2024-01-03"], [100, 110])
+    # A 2:1 split, the adjusted overlapping close is now half the cached one
+    new = _bars(["2024-01-03", "2024-01-04"], [55, 60.5])
+
+    spliced = _splice(cached, new)
+
+    np.testing.assert_allclose(spliced["Close"], [50, 55, 60.5])
+    returns = spliced["Close"].pct_change().dropna()
+    np.testing.assert_allclose(returns, [0.1, 0.1])
+
+
+def test_splice_without_new_bars_keeps_the_cache():
+    cached = _bars(["2024-01-02"], [100])
+    assert _splice(cached, cached.iloc[0:0]) is cached
+
+
+def test_stale_symbols_download_only_the_new_bars(tmp_path, monkeypatch):
+    calls = []
+
+    def download(symbols, **params):
+        calls.append((list(symbols), params))
+        if "period" in params:
+            return _grouped(
+                {s: _bars(["2024-01-02", "2024-01-03"], [100, 101]) for s in symbols}
+            )
+        return _grouped(
+            {s: _bars(["2024-01-03", "2024-01-04"], [101, 103]) for s in symbols}
+        )
+
+    monkeypatch.setattr(returns_store, "_download", download)
+    store = ReturnsStore(tmp_path)
+
+    store.bars_many(["aapl", "MSFT"])
+    store.max_age = 0
+    bars = store.bars_many(["AAPL", "MSFT"])
+
+    assert calls == [
+        (["AAPL", "MSFT"], {"period": "max"}),
+        (["AAPL", "MSFT"], {"start": "2024-01-03"}),
+    ]
+    assert list(bars["AAPL"]["Close"]) == [100, 101, 103]
+    assert store.last_bar("msft") == "2024-01-04"
+    # Saved to disk, a new store over the same root reads it back
+    assert list(ReturnsStore(tmp_path).bars("AAPL")["Close"]) == [100, 101, 103]
+
+
+def test_symbols_without_data_are_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        returns_store,
+        "_download",
+        lambda symbols, **params: _grouped(
+            {"AAPL": _bars(["2024-01-02", "2024-01-03"], [100, 101])}
+        ),
+    )
+    store = ReturnsStore(tmp_path)
+
+    errors = {}
+    returns = store.returns_many(["AAPL", "NOPE"], errors)
+
+    assert list(returns) == ["AAPL"]
+    assert "NOPE" in errors["NOPE"]
+    with pytest.raises(ValueError):
+        store.bars("NOPE")
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch(symbol):
+        calls.append(symbol)
+        release.wait(5)
+        return {"symbol": symbol}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(flight.do, ("tradingview", "AAPL"), fetch, "AAPL")
+            for _ in range(4)
+        ]
+        while flight.stats()["merged"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == ["AAPL"]
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {
+        "in_flight": 0,
+        "executed": 1,
+        "merged": 3,
+        "sources": {"tradingview": {"executed": 1, "merged": 3}},
+    }
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("No price data")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(flight.do, ("yfinance", "XX"), fail) for _ in range(2)
+        ]
+        while flight.stats()["merged"] < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="No price data"):
+                future.result()
+
+    # The failed call is gone, the next one runs again
+    assert flight.do(("yfinance", "XX"), lambda: 42) == 42
+    assert flight.stats()["executed"] == 2
+
+
+def test_async_callers_share_the_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "done"
+
+    async def main():
+        tasks = [
+            asyncio.create_task(flight.do_async(("yfinance", "AAPL"), fetch))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == ["done"] * 3
+    assert calls == [1]
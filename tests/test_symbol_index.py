@@ -0,0 +1,56 @@
+import csv
+
+import pytest
+
+from symbol_index import SymbolIndex
+
+ROWS = [
+    ("AAPL", "Apple Inc. - Common Stock", "stock"),
+    ("APLE", "Apple Hospitality REIT, Inc. - Common Shares", "stock"),
+    ("MSFT", "Microsoft Corporation - Common Stock", "stock"),
+    ("NVDA", "NVIDIA Corporation - Common Stock", "stock"),
+    ("^GSPC", "^GSPC", "index"),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "symbols.csv"
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["symbol", "name", "type", "exchange"])
+        writer.writerows(row + ("Q",) for row in ROWS)
+    return SymbolIndex(path, max_age=10**9)
+
+
+def test_aliases_and_symbols_match_first(index):
+    assert index.lookup("Google") == ["GOOGL", "GOOG"]
+    assert index.lookup("msft")[0] == "MSFT"
+    assert index.lookup("S&P 500", type="index") == ["^GSPC"]
+
+
+def test_name_and_word_prefixes(index):
+    assert index.lookup("Apple") == ["AAPL", "APLE"]
+    assert index.lookup("micro") == ["MSFT"]
+    assert index.lookup("hospitality") == ["APLE"]
+
+
+def test_fuzzy_names_only_when_nothing_else_matches(index):
+    assert index.lookup("Mircosoft") == ["MSFT"]
+    assert index.lookup("zzzz") == []
+
+
+def test_resolve_only_answers_exact_matches(index):
+    assert index.resolve("Microsoft") == "MSFT"
+    assert index.resolve("NVDA") == "NVDA"
+    assert index.resolve("google") == "GOOGL"
+    assert index.resolve("Micro") is None
+    assert index.resolve("Mircosoft") is None
+
+
+def test_remembered_aliases_are_used_by_lookup_only(index):
+    index.remember("Tesla Motors", "stock", ["TSLA"])
+
+    assert index.lookup("tesla motors") == ["TSLA"]
+    assert index.resolve("tesla motors") is None
+    assert SymbolIndex(index.path, max_age=10**9).lookup("Tesla Motors") == ["TSLA"]
@@ -0,0 +1,37 @@
+import ta_cache
+from ta_cache import TTLCache
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ta_cache.time, "time", lambda: now[0])
+    cache = TTLCache(maxsize=10)
+    cache.set("1m", {"Summary": "BUY"}, ttl=60)
+
+    now[0] += 59
+    assert cache.get("1m") == {"Summary": "BUY"}
+    now[0] += 2
+    assert cache.get("1m") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_entries_are_visible_to_other_caches(tmp_path):
+    path = str(tmp_path / "ta_cache.sqlite")
+    TTLCache(maxsize=2, shared_path=path).set("key", {"RSI": 55.0}, ttl=60)
+
+    other = TTLCache(maxsize=2, shared_path=path)
+
+    assert other.get("key") == {"RSI": 55.0}
+    assert other.stats()["shared_hits"] == 1
@@ -0,0 +1,46 @@
+import sys
+
+import pytest
+
+import tool_backend
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    tools = {"technical_analysis": "remote", "comparison": "remote"}
+    monkeypatch.setattr(tool_backend, "remote_tools", lambda: tools)
+    return tools
+
+
+def test_local_and_auto_use_the_server_in_process(remote):
+    for backend in ("local", "auto"):
+        tools = tool_backend.load_tools(backend)
+        assert isinstance(tools["comparison"], tool_backend.LocalComparisonTool)
+        assert isinstance(
+            tools["technical_analysis"], tool_backend.LocalTechnicalAnalysisTool
+        )
+
+
+def test_remote_uses_the_space(remote):
+    assert tool_backend.load_tools("remote") is remote
+
+
+def test_auto_falls_back_to_the_space_without_the_server(remote, monkeypatch):
+    # A None entry makes "import server" raise ImportError
+    monkeypatch.setitem(sys.modules, "server", None)
+
+    assert tool_backend.load_tools("auto") is remote
+    with pytest.raises(ImportError):
+        tool_backend.load_tools("local")
+
+
+def test_local_technical_analysis_takes_the_country_name(monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "get_technical_analysis", lambda *args: args)
+    tool = tool_backend.LocalTechnicalAnalysisTool()
+
+    assert tool.forward("RELIANCE", "NSE", "India", "1d")[2] == list(
+        tool_backend.SCREENER
+    ).index("india")
+    assert "Error" in tool.forward("AAPL", "NASDAQ", "Atlantis", "1d")
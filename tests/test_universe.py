@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from universe import correlation_summary, rolling_betas
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    market = rng.normal(0, 0.01, 300)
+    noise = rng.normal(0, 0.01, (300, 7))
+    # Columns with different exposure to the market, so correlations differ
+    return (market[:, None] * np.linspace(0.2, 1.5, 7) + noise).astype(np.float32)
+
+
+def test_blocked_correlations_match_corrcoef(panel):
+    expected = np.corrcoef(panel, rowvar=False)
+    n = panel.shape[1]
+    pairs = n * (n - 1) // 2
+
+    # Blocks smaller than the panel, so several tiles are combined
+    top, bottom, mean_correlation = correlation_summary(panel, k=pairs, block=3)
+
+    rows, cols, values = top
+    assert len(values) == pairs
+    np.testing.assert_allclose(values, expected[rows, cols], atol=1e-5)
+    off_diagonal = (expected.sum(axis=1) - 1) / (n - 1)
+    np.testing.assert_allclose(mean_correlation, off_diagonal, atol=1e-5)
+
+    upper = expected[np.triu_indices(n, 1)]
+    top, bottom, _ = correlation_summary(panel, k=2, block=3)
+    np.testing.assert_allclose(np.sort(top[2]), np.sort(upper)[-2:], atol=1e-5)
+    np.testing.assert_allclose(np.sort(bottom[2]), np.sort(upper)[:2], atol=1e-5)
+
+
+def test_rolling_betas_match_cov(panel):
+    benchmark = panel.mean(axis=1)
+    window = 60
+
+    betas = rolling_betas(panel, benchmark, window, block=4)
+
+    assert betas.shape == (len(panel) - window + 1, panel.shape[1])
+    for start in (0, 120, len(panel) - window):
+        x = panel[start : start + window].astype(np.float64)
+        b = benchmark[start : start + window].astype(np.float64)
+        expected = [np.cov(x[:, i], b)[0, 1] / np.var(b, ddof=1) for i in range(7)]
+        np.testing.assert_allclose(betas[start], expected, rtol=1e-6)
+
+
+def test_correlation_summary_rejects_non_positive_k(panel):
+    with pytest.raises(ValueError):
+        correlation_summary(panel, k=0)
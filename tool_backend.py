@@ -0,0 +1,111 @@
+import inspect
+
+from smolagents import Tool
+
+from config import SCREENER, TOOL_BACKEND
+
+STOCK_LENS_SPACE = "Agents-MCP-Hackathon/stock-lens"
+
+TECHNICAL_ANALYSIS_DESCRIPTION = "Get technical analysis for the given symbol for the given period. Country and exchange details are required"
+COMPARISON_DESCRIPTION = "Compare the provided stocks and generate html report"
+
+
+def _final(result):
+    """Exhaust a streaming endpoint and return its last output."""
+    if inspect.isgenerator(result):
+        final = None
+        for final in result:
+            pass
+        return final
+    return result
+
+
+class LocalTechnicalAnalysisTool(Tool):
+    name = "stock_analyzer"
+    description = TECHNICAL_ANALYSIS_DESCRIPTION
+    inputs = {
+        "symbol": {"type": "string", "description": "Ticker symbol (e.g., AAPL)"},
+        "exchange": {"type": "string", "description": "Exchange (e.g., NASDAQ, NSE)"},
+        "country": {
+            "type": "string",
+            "description": "Exchange country (e.g., United States, India)",
+        },
+        "interval": {"type": "string", "description": "Interval (e.g., 1d, 1h)"},
+    }
+    output_type = "object"
+
+    def forward(self, symbol, exchange, country, interval):
+        from server import get_technical_analysis
+
+        # The endpoint takes the index of the country dropdown, like the Space does
+        screeners = list(SCREENER)
+        labels = [label.lower() for label in SCREENER.values()]
+        country = str(country).strip().lower()
+        if country in screeners:
+            country = screeners.index(country)
+        elif country in labels:
+            country = labels.index(country)
+        else:
+            return {"Error": f"Unknown country {country}"}
+        return get_technical_analysis(symbol, exchange, country, interval)
+
+
+class LocalComparisonTool(Tool):
+    name = "compare_stocks_and_generate_report"
+    description = COMPARISON_DESCRIPTION
+    inputs = {
+        "symbol": {"type": "string", "description": "Ticker symbol (e.g., AAPL)"},
+        "benchmark": {"type": "string", "description": "Benchmark symbol (e.g., ^DJI)"},
+    }
+    output_type = "any"
+
+    def forward(self, symbol, benchmark):
+        from server import get_comparison_report
+
+        return _final(get_comparison_report(symbol, benchmark))
+
+
+def local_tools() -> dict:
+    """Tools calling the functions in server.py in process."""
+    import server  # noqa: F401  fail here when the server dependencies are missing
+
+    return {
+        "technical_analysis": LocalTechnicalAnalysisTool(),
+        "comparison": LocalComparisonTool(),
+    }
+
+
+def remote_tools() -> dict:
+    """Tools calling the stock-lens Space over HTTP."""
+    return {
+        "technical_analysis": Tool.from_space(
+            STOCK_LENS_SPACE,
+            name="stock_analyzer",
+            api_name="/get_technical_analysis",
+            description=TECHNICAL_ANALYSIS_DESCRIPTION,
+        ),
+        "comparison": Tool.from_space(
+            STOCK_LENS_SPACE,
+            name="compare_stocks_and_generate_report",
+            api_name="/get_comparison_report",
+            description=COMPARISON_DESCRIPTION,
+        ),
+    }
+
+
+def load_tools(backend: str = TOOL_BACKEND) -> dict:
+    """Load the stock-lens tools for the configured backend.
+
+    Args:
+        backend(str): "local" to call server.py in process, "remote" for the
+            Space, or "auto" to use local tools when server.py can be imported
+            and fall back to the Space otherwise.
+    """
+    if backend in ("auto", "local"):
+        try:
+            return local_tools()
+        except ImportError as e:
+            if backend == "local":
+                raise
+            print(f"Local stock-lens tools unavailable ({e}), using the Space.")
+    return remote_tools()
@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+
+from config import PANEL_BLOCK_SIZE, PANEL_MIN_COVERAGE
+from returns_store import store
+
+# Trading days of the relative strength horizons (1, 3, 6 and 12 months)
+RS_HORIZONS = [21, 63, 126, 252]
+
+
+def fetch_returns(symbols: list[str]) -> tuple[dict, dict]:
+    """Get the daily returns of many symbols, keeping the ones with price data.
+
+    Returns:
+        tuple: Symbol to returns Series, and symbol to error for the failures.
+    """
+    errors = {}
+    returns = store.returns_many(symbols, errors)
+    return returns, errors
+
+
+def build_panel(
+    returns: dict, benchmark: pd.Series, days: int, min_coverage=PANEL_MIN_COVERAGE
+):
+    """Align returns on the benchmark's last ``days`` trading days as a float32 panel.
+
+    Symbols trading on fewer than ``min_coverage`` of those days are dropped,
+    the remaining missing days count as a zero return.
+
+    Returns:
+        tuple: (dates, symbols, (days, symbols) float32 panel, benchmark returns,
+        symbol to reason for the dropped symbols)
+    """
+    dates = benchmark.index[-days:]
+    frame = pd.concat(returns, axis=1).reindex(dates)
+    coverage = frame.notna().mean()
+    kept = coverage[coverage >= min_coverage].index
+    dropped = {
+        symbol: f"Traded on {value:.0%} of the days"
+        for symbol, value in coverage.items()
+        if value < min_coverage
+    }
+    panel = frame[kept].fillna(0).to_numpy(np.float32)
+    return dates, list(kept), panel, benchmark.iloc[-days:].to_numpy(), dropped
+
+
+def _standardize(panel: np.ndarray) -> np.ndarray:
+    """Scale the columns so the dot product of two columns is their correlation."""
+    centered = panel - panel.mean(axis=0)
+    norm = np.sqrt((centered * centered).sum(axis=0))
+    # Constant series (e.g. suspended) correlate with nothing
+    return centered / np.where(norm == 0, np.inf, norm)
+
+
+def _keep(candidates, rows, cols, values, k, largest):
+    """Merge block candidates into the running top k."""
+    rows = np.concatenate([candidates[0], rows])
+    cols = np.concatenate([candidates[1], cols])
+    values = np.concatenate([candidates[2], values])
+    if len(values) > k:
+        order = -values if largest else values
+        best = np.argpartition(order, k - 1)[:k]
+        rows, cols, values = rows[best], cols[best], values[best]
+    return rows, cols, values
+
+
+def correlation_summary(panel: np.ndarray, k: int, block: int = PANEL_BLOCK_SIZE):
+    """Top and bottom k correlated pairs and each symbol's mean correlation.
+
+    The correlation matrix is computed in ``block`` x ``block`` tiles of the
+    upper triangle with float32 matrix products, so only one tile of the
+    N x N matrix is in memory at a time.
+
+    Returns:
+        tuple: (rows, cols, correlations) of the top pairs, the same for the
+        bottom pairs, and the mean correlation of each symbol with the others.
+    """
+    if k < 1:
+        raise ValueError("At least one pair must be requested (top_k >= 1)")
+    z = _standardize(panel)
+    n = z.shape[1]
+    empty = (np.empty(0, int), np.empty(0, int), np.empty(0, np.float32))
+    top, bottom = empty, empty
+    row_sums = np.zeros(n)
+
+    for i in range(0, n, block):
+        for j in range(i, n, block):
+            tile = z[:, i : i + block].T @ z[:, j : j + block]
+            rows, cols = np.indices(tile.shape)
+            upper = rows + i < cols + j
+            # Tiles below the diagonal are the mirror of these and never computed
+            masked = np.where(upper, tile, 0) if i == j else tile
+            row_sums[i : i + block] += masked.sum(axis=1)
+            row_sums[j : j + block] += masked.sum(axis=0)
+            rows, cols, values = rows[upper] + i, cols[upper] + j, tile[upper]
+            top = _keep(top, rows, cols, values, k, largest=True)
+            bottom = _keep(bottom, rows, cols, values, k, largest=False)
+
+    mean_correlation = row_sums / max(n - 1, 1)
+    return top, bottom, mean_correlation
+
+
+def rolling_betas(panel: np.ndarray, benchmark: np.ndarray, window: int, block: int):
+    """Betas against the benchmark over every ``window`` day window.
+
+    Window sums come from cumulative sums, so each beta costs O(1) and the
+    columns are processed ``block`` at a time.
+
+    Returns:
+        np.ndarray: (days - window + 1, symbols) betas.
+    """
+    b = benchmark.astype(np.float64)
+
+    def window_sums(values):
+        sums = np.cumsum(values, axis=0)
+        sums = np.concatenate([np.zeros((1,) + sums.shape[1:]), sums])
+        return sums[window:] - sums[:-window]
+
+    sum_b, sum_bb = window_sums(b), window_sums(b * b)
+    variance = sum_bb - sum_b * sum_b / window
+    betas = np.empty((len(b) - window + 1, panel.shape[1]))
+    for i in range(0, panel.shape[1], block):
+        x = panel[:, i : i + block].astype(np.float64)
+        covariance = window_sums(x * b[:, None]) - (
+            window_sums(x) * sum_b[:, None] / window
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            betas[:, i : i + block] = covariance / variance[:, None]
+    return betas
+
+
+def relative_strength(panel: np.ndarray, benchmark: np.ndarray) -> dict:
+    """Excess log returns over the benchmark across ``RS_HORIZONS`` and a 1-99 rating.
+
+    The score is the mean excess return of the horizons covered by the panel,
+    the rating its percentile rank among the symbols.
+    """
+    # Cumulative log returns from a leading zero, so a horizon can span all days
+    log_panel = np.cumsum(np.log1p(panel.astype(np.float64)), axis=0)
+    log_panel = np.vstack([np.zeros(panel.shape[1]), log_panel])
+    log_benchmark = np.r_[0.0, np.cumsum(np.log1p(benchmark.astype(np.float64)))]
+    days = len(benchmark)
+    excess = {}
+    for horizon in [h for h in RS_HORIZONS if h <= days] or [days]:
+        symbol_return = log_panel[-1] - log_panel[-1 - horizon]
+        benchmark_return = log_benchmark[-1] - log_benchmark[-1 - horizon]
+        excess[horizon] = symbol_return - benchmark_return
+    score = np.mean(list(excess.values()), axis=0)
+    ranks = score.argsort().argsort()
+    rating = 1 + np.round(98 * ranks / max(len(score) - 1, 1))
+    return {"score": score, "rating": rating, "excess": excess}
+
+
+def analyze_universe(
+    symbols: list[str],
+    benchmark: str,
+    days: int = 252,
+    top_k: int = 10,
+    window: int = 63,
+    block: int = PANEL_BLOCK_SIZE,
+) -> dict:
+    """Correlations, rolling betas and relative strength of many symbols.
+
+    Args:
+        symbols (list[str]): Ticker symbols, e.g. the constituents of an index.
+        benchmark (str): Benchmark symbol the betas and relative strength are measured against.
+        days (int): Trading days of history used.
+        top_k (int): Number of most and least correlated pairs returned.
+        window (int): Trading days of each rolling beta window.
+        block (int): Symbols per tile of the correlation matrix.
+
+    Returns:
+        dict: The date range, the top and bottom pairs and one ranked row per symbol.
+    """
+    if top_k < 1:
+        return {"Error": "top_k must be at least 1!"}
+    symbols = [symbol for symbol in symbols if symbol != benchmark]
+    returns, errors = fetch_returns(symbols + [benchmark])
+    if benchmark not in returns:
+        return {"Error": errors.get(benchmark, f"No price data for {benchmark}")}
+    dates, names, panel, bench, dropped = build_panel(
+        {s: returns[s] for s in symbols if s in returns}, returns[benchmark], days
+    )
+    if len(names) < 2:
+        return {"Error": "At least two symbols with price data are required!"}
+    window = min(window, len(dates))
+
+    top, bottom, mean_correlation = correlation_summary(panel, top_k, block)
+    betas = rolling_betas(panel, bench, window, block)
+    strength = relative_strength(panel, bench)
+    volatility = panel.std(axis=0, ddof=1) * np.sqrt(252)
+    benchmark_correlation = _standardize(panel).T @ _standardize(bench[:, None])[:, 0]
+
+    def pairs(rows, cols, values, descending):
+        order = np.argsort(-values if descending else values)
+        return [
+            {
+                "Symbols": [names[rows[i]], names[cols[i]]],
+                "Correlation": round(float(values[i]), 4),
+                # Annualized covariance from the correlation and volatilities
+                "Covariance": round(
+                    float(values[i] * volatility[rows[i]] * volatility[cols[i]]), 6
+                ),
+            }
+            for i in order
+        ]
+
+    def number(value, digits=4):
+        return None if not np.isfinite(value) else round(float(value), digits)
+
+    ranking = []
+    for position, i in enumerate(np.argsort(-strength["score"]), start=1):
+        ranking.append(
+            {
+                "Rank": position,
+                "Symbol": names[i],
+                "RS Rating": int(strength["rating"][i]),
+                "RS Score": number(strength["score"][i]),
+                "Excess Returns": {
+                    f"{horizon}d": number(excess[i])
+                    for horizon, excess in strength["excess"].items()
+                },
+                "Beta": number(betas[-1, i]),
+                "Beta Mean": number(np.nanmean(betas[:, i])),
+                "Correlation To Benchmark": number(benchmark_correlation[i]),
+                "Mean Correlation": number(mean_correlation[i]),
+                "Volatility": number(volatility[i]),
+            }
+        )
+
+    return {
+        "Benchmark": benchmark,
+        "Start": dates[0].strftime("%Y-%m-%d"),
+        "End": dates[-1].strftime("%Y-%m-%d"),
+        "Days": len(dates),
+        "Symbols": len(names),
+        "Beta Window": window,
+        "Most Correlated": pairs(*top, descending=True),
+        "Least Correlated": pairs(*bottom, descending=False),
+        "Relative Strength": ranking,
+        "Errors": {**errors, **dropped},
+    }